@@ -83,6 +83,9 @@ DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE = DATASET_INPUT + "type/metlonggenmir/mir
 DATASET_INPUT_MIR_METLONG_GEN_MIR_SURVIVAL = DATASET_INPUT + "survival/metlonggenmir/mir/"
 DATASET_INPUT_MIR_METLONG_GEN_MIR_DRUGS = DATASET_INPUT + "drugs/metlonggenmir/mir/"
 
+# Parsed raw files shared by all the inputs above (methylation_store, gene_store and mirna_store in preprocess_packaging)
+DATASET_STORE = DATASET_INPUT + "store/"
+
 
 
 ######################################
@@ -6,7 +6,11 @@ import json
 import yaml
 import numpy as np
 import timeit
+import difflib
+import hashlib
+import inspect
 import xml.etree.ElementTree as ET
+import multiprocessing
 from datetime import datetime
 
 
@@ -27,6 +31,106 @@ ns = {'brca': 'http://tcga.nci/bcr/xml/clinical/brca/2.7',
 
 
 
+# Number of processes used to extract the records of the clinical XML files
+CLINICAL_WORKERS = multiprocessing.cpu_count()
+
+# Records of every clinical XML file, keyed by file id, see clinical_records()
+CLINICAL_RECORDS = {}
+
+# Synonym table of the drug names, as {canonical name: [names found in the clinical XML files]}
+# New spellings are added to the file, no code change is needed
+DRUG_SYNONYMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "drug_synonyms.json")
+
+# Similarity (0 to 1, see difflib) above which an unknown drug name is matched to its closest synonym, None to only take exact names
+DRUG_FUZZY_CUTOFF = None
+
+# Case-folded drug name to canonical name, loaded once from DRUG_SYNONYMS_FILE, see drug_synonyms()
+DRUG_SYNONYMS = {}
+
+
+
+# Extract the records of every table (uuid, form_completion, general, pathology_*, surgery, drugs, radiations) from one clinical XML file
+# The file is parsed once with iterparse, the patient element is cleared as soon as its records are taken,
+# so only one patient is held in memory
+def extract_clinical_records(path):
+    records = None
+    for event, element in ET.iterparse(path):
+        if element.tag == "{" + ns['brca'] + "}patient":
+            records = dict((name, record(element)) for name, record in CLINICAL_TABLES)
+            element.clear()
+        elif element.tag == "{" + ns['admin'] + "}admin":
+            element.clear()
+
+    if records is None:
+        raise ValueError(path + " has no brca:patient element, it is not a clinical XML file of TCGA-BRCA.")
+
+    return records
+
+
+
+# Version of the records cached by clinical_records(): the hash of the table names and of the code of their record functions
+# The cached records are extracted again whenever a record function or CLINICAL_TABLES changes
+def clinical_records_version():
+    sha1 = hashlib.sha1(inspect.getsource(extract_clinical_records).encode("utf-8"))
+    for name, record in CLINICAL_TABLES:
+        sha1.update(name.encode("utf-8"))
+        sha1.update(inspect.getsource(record).encode("utf-8"))
+
+    return sha1.hexdigest()
+
+
+
+# Records of every clinical XML file of clinical_supplement.csv, as {file_id: {table: record}}
+# The files are parsed by CLINICAL_WORKERS processes, in a single pass for all tables
+# The records are cached in clinical_records.json with the modification time of their file and the version of the record functions,
+# a file is only parsed again when it changed, all files are parsed again when the version changed
+def clinical_records():
+    meta_clinicals = np.genfromtxt(TARGET_META_CSV + "clinical_supplement.csv", dtype=str, delimiter=',', skip_header=0)
+    file_id_column, = np.where(meta_clinicals[0]=='file_id')[0]
+    file_name_column, = np.where(meta_clinicals[0]=='file_name')[0]
+    meta_clinicals = meta_clinicals[1:]
+
+    if not os.path.isdir(TARGET_CLINICAL):
+        os.makedirs(TARGET_CLINICAL)
+
+    version = clinical_records_version()
+    if (len(CLINICAL_RECORDS) == 0) and os.path.isfile(TARGET_CLINICAL + "clinical_records.json"):
+        with open(TARGET_CLINICAL + "clinical_records.json") as f:
+            cache = json.load(f)
+        if cache.get("version") == version:
+            CLINICAL_RECORDS.update(cache["files"])
+
+    # files which are new or changed since their records were cached
+    files = []
+    for meta_clinical in meta_clinicals:
+        file_id = meta_clinical[file_id_column]
+        path = DATASET_CLINICAL + file_id + "/" + meta_clinical[file_name_column]
+        mtime = os.path.getmtime(path)
+        if (file_id not in CLINICAL_RECORDS) or (CLINICAL_RECORDS[file_id]["mtime"] != mtime):
+            files.append((file_id, path, mtime))
+
+    if len(files) > 0:
+        if CLINICAL_WORKERS <= 1:
+            results = [extract_clinical_records(path) for file_id, path, mtime in files]
+        else:
+            pool = multiprocessing.Pool(CLINICAL_WORKERS)
+            try:
+                results = pool.map(extract_clinical_records, [path for file_id, path, mtime in files])
+            finally:
+                pool.terminate()
+                pool.join()
+
+        for (file_id, path, mtime), records in zip(files, results):
+            CLINICAL_RECORDS[file_id] = {"mtime": mtime, "records": records}
+            print(path)
+
+        with open(TARGET_CLINICAL + "clinical_records.json", "w") as f:
+            json.dump({"version": version, "files": CLINICAL_RECORDS}, f)
+
+    return dict((meta_clinical[file_id_column], CLINICAL_RECORDS[meta_clinical[file_id_column]]["records"]) for meta_clinical in meta_clinicals)
+
+
+
 # List all prefix in patients' clinical XML files
 def all_prefix():
     # Load meta for clinical data
@@ -186,6 +290,35 @@ def compare_elmt_len():
 
 
 
+# Record of one patient for uuid(), computed from the patient element of its clinical XML file
+def uuid_record(patient):
+    # Empty dict per case id
+    record = {'drugs':[], 'radiations':[], 'follow_ups_15':[], 'follow_ups_21':[], 'follow_ups_40':[]}
+
+    # Drugs
+    for child in patient.find('rx:drugs', ns):
+        record['drugs'].append(child.find('rx:bcr_drug_uuid', ns).text)
+
+    # Radiations
+    for child in patient.find('rad:radiations', ns):
+        record['radiations'].append(child.find('rad:bcr_radiation_uuid', ns).text)
+
+    # Follow-up 1.5
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v1.5:follow_up', ns):
+        record['follow_ups_15'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
+
+    # Follow-up 2.1
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v2.1:follow_up', ns):
+        record['follow_ups_21'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
+
+    # Follow-up 4.0
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v4.0:follow_up', ns):
+        record['follow_ups_40'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
+
+    return record
+
+
+
 # Create a file of each patient's whole ids (drug id, radiation id, follow-up id)
 def uuid():
     # Load meta for clinical data
@@ -201,38 +334,12 @@ def uuid():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        # Empty dict per case id
-        new_dict[meta_clinical[case_id_column]] = {'drugs':[], 'radiations':[], 'follow_ups_15':[], 'follow_ups_21':[], 'follow_ups_40':[]}
-
-        # Drugs
-        for child in root[1].find('rx:drugs', ns):
-            new_dict[meta_clinical[case_id_column]]['drugs'].append(child.find('rx:bcr_drug_uuid', ns).text)
-
-        # Radiations
-        for child in root[1].find('rad:radiations', ns):
-            new_dict[meta_clinical[case_id_column]]['radiations'].append(child.find('rad:bcr_radiation_uuid', ns).text)
-
-        # Follow-up 1.5
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v1.5:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_15'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
-
-        # Follow-up 2.1
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v2.1:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_21'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
-
-        # Follow-up 4.0
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v4.0:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_40'].append(child.find('clin_shared:bcr_followup_uuid', ns).text)
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["uuid"]
 
     
     # Create folder for clinical processed data
@@ -248,6 +355,60 @@ def uuid():
 
 
 
+# Record of one patient for form_completion(), computed from the patient element of its clinical XML file
+def form_completion_record(patient):
+    # Empty dict per case id
+    record = {'general':{}, 'drugs':{}, 'radiations':{}, 'follow_ups_15':{}, 'follow_ups_21':{}, 'follow_ups_40':{}}
+
+    # General
+    record['general']['day'] = patient.find('clin_shared:day_of_form_completion', ns).text
+    record['general']['month'] = patient.find('clin_shared:month_of_form_completion', ns).text
+    record['general']['year'] = patient.find('clin_shared:year_of_form_completion', ns).text
+
+    # Drugs
+    for child in patient.find('rx:drugs', ns):
+        record['drugs'][child.find('rx:bcr_drug_uuid', ns).text] = {
+        'day':child.find('clin_shared:day_of_form_completion', ns).text,
+        'month':child.find('clin_shared:month_of_form_completion', ns).text,
+        'year':child.find('clin_shared:year_of_form_completion', ns).text
+        }
+
+    # Radiations
+    for child in patient.find('rad:radiations', ns):
+        record['radiations'][child.find('rad:bcr_radiation_uuid', ns).text] = {
+        'day':child.find('clin_shared:day_of_form_completion', ns).text,
+        'month':child.find('clin_shared:month_of_form_completion', ns).text,
+        'year':child.find('clin_shared:year_of_form_completion', ns).text
+        }
+
+    # Follow-up 1.5
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v1.5:follow_up', ns):
+        record['follow_ups_15'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
+        'day':child.find('clin_shared:day_of_form_completion', ns).text,
+        'month':child.find('clin_shared:month_of_form_completion', ns).text,
+        'year':child.find('clin_shared:year_of_form_completion', ns).text
+        }
+
+    # Follow-up 2.1
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v2.1:follow_up', ns):
+        record['follow_ups_21'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
+        'day':child.find('clin_shared:day_of_form_completion', ns).text,
+        'month':child.find('clin_shared:month_of_form_completion', ns).text,
+        'year':child.find('clin_shared:year_of_form_completion', ns).text
+        }
+
+    # Follow-up 4.0
+    for child in patient.find('brca:follow_ups', ns).findall('follow_up_v4.0:follow_up', ns):
+        record['follow_ups_40'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
+        'day':child.find('clin_shared:day_of_form_completion', ns).text,
+        'month':child.find('clin_shared:month_of_form_completion', ns).text,
+        'year':child.find('clin_shared:year_of_form_completion', ns).text
+        }
+
+    return record
+
+
+
 # In TCGA, each events (first occurence, radiations, drugs, follow-ups) are treated separately at different time
 # The time when these events finish are called form completion date
 # So there are general completion date, radiation date, and etc
@@ -269,63 +430,12 @@ def form_completion():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        # Empty dict per case id
-        new_dict[meta_clinical[case_id_column]] = {'general':{}, 'drugs':{}, 'radiations':{}, 'follow_ups_15':{}, 'follow_ups_21':{}, 'follow_ups_40':{}}
-
-        # General
-        new_dict[meta_clinical[case_id_column]]['general']['day'] = root[1].find('clin_shared:day_of_form_completion', ns).text
-        new_dict[meta_clinical[case_id_column]]['general']['month'] = root[1].find('clin_shared:month_of_form_completion', ns).text
-        new_dict[meta_clinical[case_id_column]]['general']['year'] = root[1].find('clin_shared:year_of_form_completion', ns).text
-
-        # Drugs
-        for child in root[1].find('rx:drugs', ns):
-            new_dict[meta_clinical[case_id_column]]['drugs'][child.find('rx:bcr_drug_uuid', ns).text] = {
-            'day':child.find('clin_shared:day_of_form_completion', ns).text,
-            'month':child.find('clin_shared:month_of_form_completion', ns).text,
-            'year':child.find('clin_shared:year_of_form_completion', ns).text
-            }
-
-        # Radiations
-        for child in root[1].find('rad:radiations', ns):
-            new_dict[meta_clinical[case_id_column]]['radiations'][child.find('rad:bcr_radiation_uuid', ns).text] = {
-            'day':child.find('clin_shared:day_of_form_completion', ns).text,
-            'month':child.find('clin_shared:month_of_form_completion', ns).text,
-            'year':child.find('clin_shared:year_of_form_completion', ns).text
-            }
-
-        # Follow-up 1.5
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v1.5:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_15'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
-            'day':child.find('clin_shared:day_of_form_completion', ns).text,
-            'month':child.find('clin_shared:month_of_form_completion', ns).text,
-            'year':child.find('clin_shared:year_of_form_completion', ns).text
-            }
-
-        # Follow-up 2.1
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v2.1:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_21'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
-            'day':child.find('clin_shared:day_of_form_completion', ns).text,
-            'month':child.find('clin_shared:month_of_form_completion', ns).text,
-            'year':child.find('clin_shared:year_of_form_completion', ns).text
-            }
-
-        # Follow-up 4.0
-        for child in root[1].find('brca:follow_ups', ns).findall('follow_up_v4.0:follow_up', ns):
-            new_dict[meta_clinical[case_id_column]]['follow_ups_40'][child.find('clin_shared:bcr_followup_uuid', ns).text] = {
-            'day':child.find('clin_shared:day_of_form_completion', ns).text,
-            'month':child.find('clin_shared:month_of_form_completion', ns).text,
-            'year':child.find('clin_shared:year_of_form_completion', ns).text
-            }
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["form_completion"]
 
     # Save as json
     new_dict_j = json.dumps(new_dict, indent=2)
@@ -473,6 +583,21 @@ def form_completion():
 
 
 
+# Record of one patient for general(), computed from the patient element of its clinical XML file
+def general_record(patient):
+    record = {'vital_status':{}, 'gender':{}, 'race':{}, 'ethnicity':{}, 'menopause_status':{}, 'neoadjuvant_treatment':{}, 'result':{}}
+    record['vital_status'] = patient.find('clin_shared:vital_status', ns).text
+    record['gender'] = patient.find('shared:gender', ns).text
+    record['race'] = patient.find('clin_shared:race_list', ns).find('clin_shared:race', ns).text
+    record['ethnicity'] = patient.find('clin_shared:ethnicity', ns).text
+    record['menopause_status'] = patient.find('clin_shared:menopause_status', ns).text
+    record['neoadjuvant_treatment'] = patient.find('shared:history_of_neoadjuvant_treatment', ns).text
+    record['result'] = patient.find('clin_shared:person_neoplasm_cancer_status', ns).text
+
+    return record
+
+
+
 # Create a file for every patient's general status (gender, race, ethniticity, and etc)
 def general():
     # Load meta for clinical data
@@ -491,24 +616,12 @@ def general():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {'vital_status':{}, 'gender':{}, 'race':{}, 'ethnicity':{}, 'menopause_status':{}, 'neoadjuvant_treatment':{}, 'result':{}}
-        new_dict[meta_clinical[case_id_column]]['vital_status'] = root[1].find('clin_shared:vital_status', ns).text
-        new_dict[meta_clinical[case_id_column]]['gender'] = root[1].find('shared:gender', ns).text
-        new_dict[meta_clinical[case_id_column]]['race'] = root[1].find('clin_shared:race_list', ns).find('clin_shared:race', ns).text
-        new_dict[meta_clinical[case_id_column]]['ethnicity'] = root[1].find('clin_shared:ethnicity', ns).text
-        new_dict[meta_clinical[case_id_column]]['menopause_status'] = root[1].find('clin_shared:menopause_status', ns).text
-        new_dict[meta_clinical[case_id_column]]['neoadjuvant_treatment'] = root[1].find('shared:history_of_neoadjuvant_treatment', ns).text
-        new_dict[meta_clinical[case_id_column]]['result'] = root[1].find('clin_shared:person_neoplasm_cancer_status', ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["general"]
 
 
     # Save as json
@@ -549,134 +662,135 @@ def general():
 
 
 
-# Create a file for every patient's general pathological status (cancer site, histology, and etc)
-def pathology_general():
-    # Load meta for clinical data
-    meta_clinicals = np.genfromtxt(TARGET_META_CSV + "clinical_supplement.csv", dtype=str, delimiter=',', skip_header=0)
-    
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(meta_clinicals[0]=='file_id')[0]
-    file_name_column, = np.where(meta_clinicals[0]=='file_name')[0]
-    case_id_column, = np.where(meta_clinicals[0]=='cases.0.case_id')[0]
+# Record of one patient for pathology_general(), computed from the patient element of its clinical XML file
+def pathology_general_record(patient):
+    # Initialization for each case
+    record = {'method':{}, 'prospective_collection':{}, 'retrospective_collection':{}, 'site':{}, 'specific_site':[], 'histological_type':{}, 'histological_type_icd_o_3':{}}
 
-    meta_clinicals = meta_clinicals[1:]
 
-    #############################
-    ##### 1. CREATE AS JSON #####
-    #############################
-    # Empty dictionary for the final data
-    new_dict = {}
+    # Surgical method
+    method = patient.find('clin_shared:initial_pathologic_diagnosis_method', ns).text
+    other_method = patient.find('clin_shared:init_pathology_dx_method_other', ns).text
+    if method == "Other method, specify:":
+        if other_method == "Wide local incision":
+            record['method'] = "Excisional Biopsy"
+        elif other_method == "Biopsy, NOS" or other_method == "biopsy, NOS" or other_method == "Biopsy not specified" or other_method == "Ultrasound-guided biopsy":
+            record['method'] = "Biopsy, NOS"
+        elif other_method == "stereotactic biopsy":
+            record['method'] = "Stereotactic biopsy"
+        elif other_method == "Skin biopsy" or other_method == "SKIN BIOPSY":
+            record['method'] = "Skin biopsy"
+        elif other_method == "Lumpectomy":
+            record['method'] = "Lumpectomy"
+        elif other_method == "Modified Radical Masectomy" or other_method == "Patey's Suregery" or other_method == "Patey's Surgery":
+            record['method'] = "Mastectomy"
+        elif other_method == "intraoperative examination":
+            record['method'] = "Intraoperative examination"
+        elif other_method == "Ultrasound-guided mammotome biopsy":
+            record['method'] = "Mammotome biopsy"
+        elif other_method == None:
+            record['method'] = None
+    else:
+        record['method'] = method
 
-    # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
-    for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
 
+    # Prospective collection
+    record['prospective_collection'] = patient.find('clin_shared:tissue_prospective_collection_indicator', ns).text
+    record['retrospective_collection'] = patient.find('clin_shared:tissue_retrospective_collection_indicator', ns).text
 
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
 
+    # Cancer site
+    if (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Upper Inner Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Upper Outer Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Lower Inner Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Lower Outer Quadrant"):
+        record['site'] = "Right"
+    if (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Upper Inner Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Upper Outer Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Lower Inner Quadrant") or (patient.find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Lower Outer Quadrant"):
+        record['site'] = "Left"
 
-        # Initialization for each case
-        new_dict[meta_clinical[case_id_column]] = {'method':{}, 'prospective_collection':{}, 'retrospective_collection':{}, 'site':{}, 'specific_site':[], 'histological_type':{}, 'histological_type_icd_o_3':{}}
-
-
-        # Surgical method
-        method = root[1].find('clin_shared:initial_pathologic_diagnosis_method', ns).text
-        other_method = root[1].find('clin_shared:init_pathology_dx_method_other', ns).text
-        if method == "Other method, specify:":
-            if other_method == "Wide local incision":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Excisional Biopsy"
-            elif other_method == "Biopsy, NOS" or other_method == "biopsy, NOS" or other_method == "Biopsy not specified" or other_method == "Ultrasound-guided biopsy":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Biopsy, NOS"
-            elif other_method == "stereotactic biopsy":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Stereotactic biopsy"
-            elif other_method == "Skin biopsy" or other_method == "SKIN BIOPSY":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Skin biopsy"
-            elif other_method == "Lumpectomy":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Lumpectomy"
-            elif other_method == "Modified Radical Masectomy" or other_method == "Patey's Suregery" or other_method == "Patey's Surgery":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Mastectomy"
-            elif other_method == "intraoperative examination":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Intraoperative examination"
-            elif other_method == "Ultrasound-guided mammotome biopsy":
-                new_dict[meta_clinical[case_id_column]]['method'] = "Mammotome biopsy"
-            elif other_method == None:
-                new_dict[meta_clinical[case_id_column]]['method'] = None
-        else:
-            new_dict[meta_clinical[case_id_column]]['method'] = method
 
+    # Specific site
+    for child in patient.find('brca:anatomic_neoplasm_subdivisions', ns):
+        record['specific_site'].append(child.text)
 
-        # Prospective collection
-        new_dict[meta_clinical[case_id_column]]['prospective_collection'] = root[1].find('clin_shared:tissue_prospective_collection_indicator', ns).text
-        new_dict[meta_clinical[case_id_column]]['retrospective_collection'] = root[1].find('clin_shared:tissue_retrospective_collection_indicator', ns).text
+    if "Left" in record['specific_site']:
+        record['specific_site'].remove("Left")
 
+    if "Left Lower Inner Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Left Lower Inner Quadrant")
+        record['specific_site'].append("Lower Inner Quadrant")
 
-        # Cancer site
-        if (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Upper Inner Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Upper Outer Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Lower Inner Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Right Lower Outer Quadrant"):
-            new_dict[meta_clinical[case_id_column]]['site'] = "Right"
-        if (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Upper Inner Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Upper Outer Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Lower Inner Quadrant") or (root[1].find('brca:anatomic_neoplasm_subdivisions', ns)[0].text == "Left Lower Outer Quadrant"):
-            new_dict[meta_clinical[case_id_column]]['site'] = "Left"
+    if "Left Lower Outer Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Left Lower Outer Quadrant")
+        record['specific_site'].append("Lower Outer Quadrant")
 
+    if "Left Upper Inner Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Left Upper Inner Quadrant")
+        record['specific_site'].append("Upper Inner Quadrant")
 
-        # Specific site
-        for child in root[1].find('brca:anatomic_neoplasm_subdivisions', ns):
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append(child.text)
+    if "Left Upper Outer Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Left Upper Outer Quadrant")
+        record['specific_site'].append("Upper Outer Quadrant")
 
-        if "Left" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Left")
+    if "Right" in record['specific_site']:
+        record['specific_site'].remove("Right")
 
-        if "Left Lower Inner Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Left Lower Inner Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Lower Inner Quadrant")
+    if "Right Lower Inner Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Right Lower Inner Quadrant")
+        record['specific_site'].append("Lower Inner Quadrant")
 
-        if "Left Lower Outer Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Left Lower Outer Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Lower Outer Quadrant")
+    if "Right Lower Outer Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Right Lower Outer Quadrant")
+        record['specific_site'].append("Lower Outer Quadrant")
 
-        if "Left Upper Inner Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Left Upper Inner Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Upper Inner Quadrant")
+    if "Right Upper Inner Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Right Upper Inner Quadrant")
+        record['specific_site'].append("Upper Inner Quadrant")
 
-        if "Left Upper Outer Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Left Upper Outer Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Upper Outer Quadrant")
+    if "Right Upper Outer Quadrant" in record['specific_site']:
+        record['specific_site'].remove("Right Upper Outer Quadrant")
+        record['specific_site'].append("Upper Outer Quadrant")
 
-        if "Right" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Right")
 
-        if "Right Lower Inner Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Right Lower Inner Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Lower Inner Quadrant")
+    # Histology
+    histology = patient.find('shared:histological_type', ns).text
+    other_histology = patient.find('shared:histological_type_other', ns).text
+    if histology == "Mixed Histology (please specify)":
+        record['histological_type'] = "Infiltrating Ductal and Lobular Carcinoma"
+    elif histology == "Other, specify":
+        record['histological_type'] = None
+    else:
+        record['histological_type'] = histology
 
-        if "Right Lower Outer Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Right Lower Outer Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Lower Outer Quadrant")
 
-        if "Right Upper Inner Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Right Upper Inner Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Upper Inner Quadrant")
+    # Histology (ICD-O-3)
+    record['histological_type_icd_o_3'] = patient.find('clin_shared:icd_o_3_histology', ns).text
 
-        if "Right Upper Outer Quadrant" in new_dict[meta_clinical[case_id_column]]['specific_site']:
-            new_dict[meta_clinical[case_id_column]]['specific_site'].remove("Right Upper Outer Quadrant")
-            new_dict[meta_clinical[case_id_column]]['specific_site'].append("Upper Outer Quadrant")
+    return record
 
 
-        # Histology
-        histology = root[1].find('shared:histological_type', ns).text
-        other_histology = root[1].find('shared:histological_type_other', ns).text
-        if histology == "Mixed Histology (please specify)":
-            new_dict[meta_clinical[case_id_column]]['histological_type'] = "Infiltrating Ductal and Lobular Carcinoma"
-        elif histology == "Other, specify":
-            new_dict[meta_clinical[case_id_column]]['histological_type'] = None
-        else:
-            new_dict[meta_clinical[case_id_column]]['histological_type'] = histology
 
+# Create a file for every patient's general pathological status (cancer site, histology, and etc)
+def pathology_general():
+    # Load meta for clinical data
+    meta_clinicals = np.genfromtxt(TARGET_META_CSV + "clinical_supplement.csv", dtype=str, delimiter=',', skip_header=0)
+    
+    # find where the case id column is located in your meta_clinicals.csv
+    file_id_column, = np.where(meta_clinicals[0]=='file_id')[0]
+    file_name_column, = np.where(meta_clinicals[0]=='file_name')[0]
+    case_id_column, = np.where(meta_clinicals[0]=='cases.0.case_id')[0]
+
+    meta_clinicals = meta_clinicals[1:]
 
-        # Histology (ICD-O-3)
-        new_dict[meta_clinical[case_id_column]]['histological_type_icd_o_3'] = root[1].find('clin_shared:icd_o_3_histology', ns).text
+    #############################
+    ##### 1. CREATE AS JSON #####
+    #############################
+    # Empty dictionary for the final data
+    new_dict = {}
+
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
+    # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
+    for meta_clinical in meta_clinicals:
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["pathology_general"]
 
 
     # Save as json
@@ -724,6 +838,28 @@ def pathology_general():
 
 
 
+# Record of one patient for pathology_receptor(), computed from the patient element of its clinical XML file
+def pathology_receptor_record(patient):
+    record = {'er_percentage':{}, 'er_status':{}, 'pgr_percentage':{}, 'pgr_status':{}, 'her2_total_cell_count':{}, 'her2_percentage':{}, 'her2_ihc_status':{}, 'her2_fish_status':{}}
+
+    # ER
+    record['er_percentage'] = patient.find('brca_shared:er_level_cell_percentage_category', ns).text
+    record['er_status'] = patient.find('brca_shared:breast_carcinoma_estrogen_receptor_status', ns).text
+
+    # PGR
+    record['pgr_percentage'] = patient.find('brca_shared:progesterone_receptor_level_cell_percent_category', ns).text
+    record['pgr_status'] = patient.find('brca_shared:breast_carcinoma_progesterone_receptor_status', ns).text
+
+    # HER2/neu
+    record['her2_total_cell_count'] = patient.find('brca_shared:her2_neu_and_centromere_17_copy_number_analysis_input_total_number_count', ns).text
+    record['her2_percentage'] = patient.find('brca_shared:her2_erbb_pos_finding_cell_percent_category', ns).text
+    record['her2_ihc_status'] = patient.find('brca_shared:lab_proc_her2_neu_immunohistochemistry_receptor_status', ns).text
+    record['her2_fish_status'] = patient.find('brca_shared:lab_procedure_her2_neu_in_situ_hybrid_outcome_type', ns).text
+
+    return record
+
+
+
 # Create a file for every patient's pathological receptor status (ER, PGR, and HER2/neu)
 def pathology_receptor():
     # Load meta for clinical data
@@ -742,31 +878,12 @@ def pathology_receptor():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {'er_percentage':{}, 'er_status':{}, 'pgr_percentage':{}, 'pgr_status':{}, 'her2_total_cell_count':{}, 'her2_percentage':{}, 'her2_ihc_status':{}, 'her2_fish_status':{}}
-
-        # ER
-        new_dict[meta_clinical[case_id_column]]['er_percentage'] = root[1].find('brca_shared:er_level_cell_percentage_category', ns).text
-        new_dict[meta_clinical[case_id_column]]['er_status'] = root[1].find('brca_shared:breast_carcinoma_estrogen_receptor_status', ns).text
-
-        # PGR
-        new_dict[meta_clinical[case_id_column]]['pgr_percentage'] = root[1].find('brca_shared:progesterone_receptor_level_cell_percent_category', ns).text
-        new_dict[meta_clinical[case_id_column]]['pgr_status'] = root[1].find('brca_shared:breast_carcinoma_progesterone_receptor_status', ns).text
-
-        # HER2/neu
-        new_dict[meta_clinical[case_id_column]]['her2_total_cell_count'] = root[1].find('brca_shared:her2_neu_and_centromere_17_copy_number_analysis_input_total_number_count', ns).text
-        new_dict[meta_clinical[case_id_column]]['her2_percentage'] = root[1].find('brca_shared:her2_erbb_pos_finding_cell_percent_category', ns).text
-        new_dict[meta_clinical[case_id_column]]['her2_ihc_status'] = root[1].find('brca_shared:lab_proc_her2_neu_immunohistochemistry_receptor_status', ns).text
-        new_dict[meta_clinical[case_id_column]]['her2_fish_status'] = root[1].find('brca_shared:lab_procedure_her2_neu_in_situ_hybrid_outcome_type', ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["pathology_receptor"]
 
 
     # Save as json
@@ -808,6 +925,18 @@ def pathology_receptor():
 
 
 
+# Record of one patient for pathology_lymph(), computed from the patient element of its clinical XML file
+def pathology_lymph_record(patient):
+    record = {'amount_nodes_examined':{}, 'amount_nodes_positive_by_ihc':{}, 'amount_nodes_positive_by_he':{}}
+
+    record['amount_nodes_examined'] = patient.find('clin_shared:lymph_node_examined_count', ns).text
+    record['amount_nodes_positive_by_ihc'] = patient.find('clin_shared:number_of_lymphnodes_positive_by_ihc', ns).text
+    record['amount_nodes_positive_by_he'] = patient.find('clin_shared:number_of_lymphnodes_positive_by_he', ns).text
+
+    return record
+
+
+
 # Create a file for every patient's pathological lymph status (amount of nodes examined, amount of positive nodes)
 def pathology_lymph():
     # Load meta for clinical data
@@ -826,21 +955,12 @@ def pathology_lymph():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {'amount_nodes_examined':{}, 'amount_nodes_positive_by_ihc':{}, 'amount_nodes_positive_by_he':{}}
-
-        new_dict[meta_clinical[case_id_column]]['amount_nodes_examined'] = root[1].find('clin_shared:lymph_node_examined_count', ns).text
-        new_dict[meta_clinical[case_id_column]]['amount_nodes_positive_by_ihc'] = root[1].find('clin_shared:number_of_lymphnodes_positive_by_ihc', ns).text
-        new_dict[meta_clinical[case_id_column]]['amount_nodes_positive_by_he'] = root[1].find('clin_shared:number_of_lymphnodes_positive_by_he', ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["pathology_lymph"]
 
 
     # Save to json
@@ -877,6 +997,20 @@ def pathology_lymph():
 
 
 
+# Record of one patient for pathology_stage(), computed from the patient element of its clinical XML file
+def pathology_stage_record(patient):
+    record = {'ajcc_stage_version':{}, 'ajcc_stage':{}, 'tnm_stage_t':{}, 'tnm_stage_n':{}, 'tnm_stage_m':{}}
+
+    record['ajcc_stage_version'] = patient.find('shared_stage:stage_event', ns).find('shared_stage:system_version', ns).text
+    record['ajcc_stage'] = patient.find('shared_stage:stage_event', ns).find('shared_stage:pathologic_stage', ns).text
+    record['tnm_stage_t'] = patient.find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_T', ns).text
+    record['tnm_stage_n'] = patient.find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_N', ns).text
+    record['tnm_stage_m'] = patient.find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_M', ns).text
+
+    return record
+
+
+
 # Create a file for every patient's cancer stage (ajcc-based and tnm-based stage)
 def pathology_stage():
     # Load meta for clinical data
@@ -895,23 +1029,12 @@ def pathology_stage():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {'ajcc_stage_version':{}, 'ajcc_stage':{}, 'tnm_stage_t':{}, 'tnm_stage_n':{}, 'tnm_stage_m':{}}
-
-        new_dict[meta_clinical[case_id_column]]['ajcc_stage_version'] = root[1].find('shared_stage:stage_event', ns).find('shared_stage:system_version', ns).text
-        new_dict[meta_clinical[case_id_column]]['ajcc_stage'] = root[1].find('shared_stage:stage_event', ns).find('shared_stage:pathologic_stage', ns).text
-        new_dict[meta_clinical[case_id_column]]['tnm_stage_t'] = root[1].find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_T', ns).text
-        new_dict[meta_clinical[case_id_column]]['tnm_stage_n'] = root[1].find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_N', ns).text
-        new_dict[meta_clinical[case_id_column]]['tnm_stage_m'] = root[1].find('shared_stage:stage_event', ns).find('shared_stage:tnm_categories', ns).find('shared_stage:pathologic_categories', ns).find('shared_stage:pathologic_M', ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["pathology_stage"]
 
 
     # Save as json
@@ -950,6 +1073,131 @@ def pathology_stage():
 
 
 
+# Record of one patient for surgery(), computed from the patient element of its clinical XML file
+def surgery_record(patient):
+    record = {'surgery':{}, 'reexcision_surgery':{}, 'margin_status':{}, 'reexcision_margin_status':{}}
+
+    # Surgery
+    if (patient.find("brca:breast_carcinoma_surgical_procedure_name", ns).text == "Other") or (patient.find("brca:breast_carcinoma_surgical_procedure_name", ns).text == None):
+        if patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide Excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide local excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide Local Excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "wide local excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "breast conserving therapy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "partial left mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Partial mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Partial Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "partial mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "needle localized segmental mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Right segmental mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "right segmental mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "left segmental mastectomy with axillary sentinel lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "left segmental mastectomy with sentinel node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with right sentinel lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel axillary lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node biopsy and wire localization" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node excision and biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel node biopsy":
+            record['surgery'] = "Lumpectomy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "needle directed right breast biopsy with left segmental mastectomy with axillary lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with axillary lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with left axillary lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "localized segmental mastectomy with axillary node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Right segmental mastectomy with sentinel lymph node and axillary lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "right segmental mastectomy witrh axillary node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with axillary dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with axillary lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with excision of mass on chest wall and axillary node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with left axillary lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with level 1 and level 2 axillary dissection":
+            record['surgery'] = "Lumpectomy with Axillary Lymph Node Dissection"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "TOTAL MASTECTOMY" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Bilateral Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "L Total Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Nipple Sparing Total Mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Bilateral skin sparing Mastectomy and Bilateral breast reconstruction with tissue expanders." or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide local excision and simple mastectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "bilateral total mastectomies with right sentinel node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Right Total Mastectomy and Sentinel Node Biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "right total mastectomy with sentinel lymph node dissection right reconstruction with TRAMP" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy and sentinel node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with left sentinel lymph node biospy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with sentinel lymoh node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with sentinel lymph node biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy with sentinel lymph node biopsy with tissue reconstruction" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with retromammary lymph node excision":
+            record['surgery'] = "Simple Mastectomy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Modified Radical Masectomy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Modified radical mastectomy with left breast biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Right total mastectomy with lymph node left axillary lymph node excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy with rigth axillary lymph node and sentinel lymph node dissection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Patey's Surgery" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Pateys surgery":
+            record['surgery'] = "Modified Radical Mastectomy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "SKIN SPARING RADICAL MASTECTOMY":
+            record['surgery'] = "Radical Mastectomy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Surgical resection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Surgical Resection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "surgical resection" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Excision" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "EXCISION WITH NEEDLE WIRE LOCALIZATION" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Reexc of biopsy site for gross/micro residual disease":
+            record['surgery'] = "Surgery NOS"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Fine Needle aspiration biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Fine needle aspiration biopsy":
+            record['surgery'] = "Fine Needle Aspiration Biopsy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Excisional biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "excisional biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Excisional biospy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide re-excisional biopsy" or \
+            patient.find("brca:surgical_procedure_purpose_other_text", ns).text == "biopsy":
+            record['surgery'] = "Excisional Biopsy"
+        elif patient.find("brca:surgical_procedure_purpose_other_text", ns).text == None:
+            record['surgery'] = None
+    else:
+        record['surgery'] = patient.find("brca:breast_carcinoma_surgical_procedure_name", ns).text
+
+
+    # Reexcision surgery
+    if patient.find("brca:breast_carcinoma_primary_surgical_procedure_name", ns).text == "Other":
+        if patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Right Breast reexcision" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Right Breast Reexcision" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Left breast reexcision" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Reexcision" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-Excision of Superior Margin" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "inner-upper margin re-excision" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-excision of the inferior margin" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Margin resection" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Additional resection/ margins (taken after first margin positive)" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "surgical resection" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Reexcision of segmental mastectomy" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-excision of original lumpectomy site" or \
+            patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Skin excision":
+            record['reexcision_surgery'] = "Reexcision NOS"
+        elif patient.find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Mastectomy":
+            record['reexcision_surgery'] = "Mastectomy NOS"
+    else:
+        record['reexcision_surgery'] = patient.find("brca:breast_carcinoma_primary_surgical_procedure_name", ns).text
+
+
+    # Margin status
+    record['margin_status'] = patient.find('clin_shared:margin_status', ns).text
+    record['reexcision_margin_status'] = patient.find('brca:breast_cancer_surgery_margin_status', ns).text
+
+    return record
+
+
+
 # Create a file for every patient's surgery status (surgery type, margin status, and etc)
 def surgery():
     # Load meta for clinical data
@@ -968,134 +1216,12 @@ def surgery():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {'surgery':{}, 'reexcision_surgery':{}, 'margin_status':{}, 'reexcision_margin_status':{}}
-
-        # Surgery
-        if (root[1].find("brca:breast_carcinoma_surgical_procedure_name", ns).text == "Other") or (root[1].find("brca:breast_carcinoma_surgical_procedure_name", ns).text == None):
-            if root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide Excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide local excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide Local Excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "wide local excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "breast conserving therapy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "partial left mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Partial mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Partial Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "partial mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "needle localized segmental mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Right segmental mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "right segmental mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "left segmental mastectomy with axillary sentinel lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "left segmental mastectomy with sentinel node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with right sentinel lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel axillary lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node biopsy and wire localization" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with sentinel lymph node excision and biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with sentinel node biopsy":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Lumpectomy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "needle directed right breast biopsy with left segmental mastectomy with axillary lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with axillary lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with left axillary lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "localized segmental mastectomy with axillary node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Right segmental mastectomy with sentinel lymph node and axillary lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "right segmental mastectomy witrh axillary node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with axillary dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with axillary lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "segmental mastectomy with excision of mass on chest wall and axillary node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Segmental mastectomy with left axillary lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Left segmental mastectomy with level 1 and level 2 axillary dissection":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Lumpectomy with Axillary Lymph Node Dissection"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "TOTAL MASTECTOMY" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Bilateral Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "L Total Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Nipple Sparing Total Mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Bilateral skin sparing Mastectomy and Bilateral breast reconstruction with tissue expanders." or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide local excision and simple mastectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "bilateral total mastectomies with right sentinel node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Right Total Mastectomy and Sentinel Node Biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "right total mastectomy with sentinel lymph node dissection right reconstruction with TRAMP" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy and sentinel node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with left sentinel lymph node biospy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with sentinel lymoh node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with sentinel lymph node biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy with sentinel lymph node biopsy with tissue reconstruction" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Total mastectomy with retromammary lymph node excision":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Simple Mastectomy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Modified Radical Masectomy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Modified radical mastectomy with left breast biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Right total mastectomy with lymph node left axillary lymph node excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "total mastectomy with rigth axillary lymph node and sentinel lymph node dissection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Patey's Surgery" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Pateys surgery":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Modified Radical Mastectomy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "SKIN SPARING RADICAL MASTECTOMY":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Radical Mastectomy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Surgical resection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Surgical Resection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "surgical resection" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Excision" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "EXCISION WITH NEEDLE WIRE LOCALIZATION" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Reexc of biopsy site for gross/micro residual disease":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Surgery NOS"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Fine Needle aspiration biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Fine needle aspiration biopsy":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Fine Needle Aspiration Biopsy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Excisional biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "excisional biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Excisional biospy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "Wide re-excisional biopsy" or \
-                root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == "biopsy":
-                new_dict[meta_clinical[case_id_column]]['surgery'] = "Excisional Biopsy"
-            elif root[1].find("brca:surgical_procedure_purpose_other_text", ns).text == None:
-                new_dict[meta_clinical[case_id_column]]['surgery'] = None
-        else:
-            new_dict[meta_clinical[case_id_column]]['surgery'] = root[1].find("brca:breast_carcinoma_surgical_procedure_name", ns).text
-
-
-        # Reexcision surgery
-        if root[1].find("brca:breast_carcinoma_primary_surgical_procedure_name", ns).text == "Other":
-            if root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Right Breast reexcision" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Right Breast Reexcision" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Left breast reexcision" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Reexcision" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-Excision of Superior Margin" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "inner-upper margin re-excision" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-excision of the inferior margin" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Margin resection" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Additional resection/ margins (taken after first margin positive)" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "surgical resection" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Reexcision of segmental mastectomy" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Re-excision of original lumpectomy site" or \
-                root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Skin excision":
-                new_dict[meta_clinical[case_id_column]]['reexcision_surgery'] = "Reexcision NOS"
-            elif root[1].find("brca:breast_neoplasm_other_surgical_procedure_descriptive_text", ns).text == "Mastectomy":
-                new_dict[meta_clinical[case_id_column]]['reexcision_surgery'] = "Mastectomy NOS"
-        else:
-            new_dict[meta_clinical[case_id_column]]['reexcision_surgery'] = root[1].find("brca:breast_carcinoma_primary_surgical_procedure_name", ns).text
-
-
-        # Margin status
-        new_dict[meta_clinical[case_id_column]]['margin_status'] = root[1].find('clin_shared:margin_status', ns).text
-        new_dict[meta_clinical[case_id_column]]['reexcision_margin_status'] = root[1].find('brca:breast_cancer_surgery_margin_status', ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["surgery"]
 
 
     # Save as json
@@ -1133,6 +1259,89 @@ def surgery():
 
 
 
+# Case-folded drug name to canonical name, built from DRUG_SYNONYMS_FILE on the first call
+# A canonical name is also its own synonym, so normalising a name twice gives the same name
+def drug_synonyms():
+    if len(DRUG_SYNONYMS) == 0:
+        with open(DRUG_SYNONYMS_FILE) as f:
+            table = json.load(f)
+
+        for canonical, names in table.items():
+            for name in [canonical] + names:
+                key = name.strip().lower()
+                if DRUG_SYNONYMS.get(key, canonical) != canonical:
+                    raise ValueError("Drug name %s is a synonym of both %s and %s" % (name, DRUG_SYNONYMS[key], canonical))
+                DRUG_SYNONYMS[key] = canonical
+
+    return DRUG_SYNONYMS
+
+
+
+# Canonical name of a drug name of the clinical XML files, default if the name is not in the synonym table
+# With DRUG_FUZZY_CUTOFF, an unknown name takes the canonical name of its closest synonym, and the match is kept for the next calls
+def normalize_drug_name(name, default=None):
+    if name is None:
+        return None
+
+    synonyms = drug_synonyms()
+    key = name.strip().lower()
+    if (key not in synonyms) and (DRUG_FUZZY_CUTOFF is not None):
+        matches = difflib.get_close_matches(key, list(synonyms), n=1, cutoff=DRUG_FUZZY_CUTOFF)
+        if len(matches) > 0:
+            synonyms[key] = synonyms[matches[0]]
+
+    return synonyms.get(key, default)
+
+
+
+# Record of one patient for drugs(), computed from the patient element of its clinical XML file
+def drugs_record(patient):
+    record = {}
+
+    for drug in patient.find("rx:drugs", ns):
+        record[drug.find("rx:bcr_drug_uuid", ns).text] = {'name':{}, 'therapy_type':{}, 'regimen_indication':{}, 'response':{}}
+
+        # Drugs name, as written in the XML file, it is normalised by drugs() with the synonym table
+        record[drug.find("rx:bcr_drug_uuid", ns).text]['name'] = drug.find("rx:drug_name", ns).text
+
+
+        # Therapy type
+        t1 = drug.find("rx:therapy_types", ns).find("rx:therapy_type", ns).text
+        t2 = drug.find("rx:therapy_types", ns).find("rx:therapy_type_notes", ns).text
+        if t1 == "Other, specify in notes":
+            if t2=="ancillary" or t2=="Bisphosphonate" or t2=="biphosphonate" or t2=="BISPHOSPHONATE" or t2=="Bisphosphonate therapy" or t2=="clinical trial - bisphosphonates as adjuvant therapy" or t2=="Bone metastases" or t2=="Given to induce menopause":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = "Ancillary"
+            elif t2=="Aromatase Inhibitor":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = "Hormone Therapy"
+            elif t2==None or t2=="Phase III Clinical Trial" or t2=="Phase III clinical trial":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = None
+        else:
+            record[drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = t1
+
+
+        # Regimen Indication
+        r1 = drug.find("clin_shared:regimen_indication", ns).text
+        r2 = drug.find("clin_shared:regimen_indication_notes", ns).text
+        if r1 == "OTHER, SPECIFY IN NOTES":
+            if r2=="Patient has oesteoporosis (Prevention of further bone loss" or r2=="Maintenance (for osteopenia)" or r2=="Maintenance therapy":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "PALLIATIVE"
+            elif r2==None or r2=="Given to induce menopause" or r2=="Estrogen receptor antagonist in metastatic breast cancer":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = None
+            elif r2=="Neo-Adjuvant" or r2=="Neo-adjuvant" or r2=="neoadjuvant":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "NEO-ADJUVANT"
+            elif r2=="Cancer Vaccine Trial" or r2=="Preventative":
+                record[drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "PREVENTIVE"
+        else:
+            record[drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = r1
+
+
+        # Response
+        record[drug.find("rx:bcr_drug_uuid", ns).text]['response'] = drug.find("clin_shared:measure_of_response", ns).text
+
+    return record
+
+
+
 # Create a file for every patient's drugs information (drugs name, therapy type, and etc)
 def drugs():
     # Load meta for clinical data
@@ -1151,187 +1360,15 @@ def drugs():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
+    # The drug names are normalised here rather than in drugs_record(), so the cached records stay valid when the synonym table changes
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
         new_dict[meta_clinical[case_id_column]] = {}
-
-        for drug in root[1].find("rx:drugs", ns):
-            new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text] = {'name':{}, 'therapy_type':{}, 'regimen_indication':{}, 'response':{}}
-
-            # Drugs name
-            name = drug.find("rx:drug_name", ns).text
-            if name=="abraxane" or name=="Abraxane" or name=="Albumin-Bound Paclitaxel" or name=="Paclitaxel (Protein-Bound)":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Abraxane/Albumin-bound-Paclitaxel/Protein-bound-Paclitaxel"
-            elif name=="AE-37":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "AE-37"
-            elif name=="Aloxi":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Aloxi"
-            elif name=="Anastrazole" or name=="Anastrozole" or name=="ANASTROZOLE" or name=="ANASTROZOLE (ARIMIDEX)" or name=="anastrozolum" or name=="arimidex" or name=="Arimidex" or name=="ARIMIDEX" or name=="ARIMIDEX (ANASTROZOLE)" or name=="Arimidex (Anastrozole)":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Anastrozole/Arimidex"
-            elif name=="Avastin" or name=="avastin" or name=="Bevacizumab" or name=="BEVACIZUMAB" or name=="BEVACIZUMAB (AVASTIN)/PLACEBO PROVIDED BY STUDY" or name=="Bevacizumab or Placebo":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Bevacizumab/Avastin"
-            elif name=="Capecetabine" or name=="CAPECITABINE" or name=="Xeloda" or name=="XELODA" or name=="Xeloda (Capecitabine)":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Capecitabine/Xeloda"
-            elif name=="CARBOPLATIN" or name=="Carboplatin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Carboplatin"
-            elif name=="Chemo, NOS":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Chemo, NOS"
-            elif name=="Cisplatin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Cisplatin"
-            elif name=="clodronate" or name=="Clodronate" or name=="clodronic acid":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Clodronic acid"
-            elif name=="Cyclophasphamide" or name=="Cyclophospamide" or name=="cyclophosphamid" or name=="cyclophosphamide" or name=="Cyclophosphamide" or name=="CYCLOPHOSPHAMIDE" or name=="cyclophosphamidum" or name=="Cyclophosphane" or name=="Cyotxan" or name=="Cytoxan" or name=="cytoxan" or name=="CYTOXAN" or name=="Cytoxen":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Cyclophosphamide/Cytoxan"
-            elif name=="Denosumab" or name=="Xgeva":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Denosumab/Xgeva"
-            elif name=="Docetaxel" or name=="docetaxel" or name=="DOCETAXEL" or name=="Doxetaxel" or name=="TAXOTERE" or name=="Taxotere" or name=="taxotere":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Docetaxel/Taxotere"
-            elif name=="adriamicin" or name=="ADRIAMYCIN" or name=="adriamycin" or name=="Adriamycin" or name=="Adriamyicin" or name=="Adrimycin" or name=="Doxorubicin" or name=="doxorubicin" or name=="DOXORUBICIN" or name=="doxorubicin HCL" or name=="doxorubicine" or name=="Doxorubicinum":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin/Adriamycin"
-            elif name=="Doxil" or name=="Doxorubicin Liposome":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin-Liposome/Doxil"
-            elif name=="Epirubicin" or name=="Epirubicoin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Epirubicin"
-            elif name=="Everolimus":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Everolimus"
-            elif name=="aromasin" or name=="Aromasin" or name=="Aromasin (Exemestane)" or name=="AROMASIN (EXEMESTANE)" or name=="aromatase exemestane" or name=="EXEMESTANE" or name=="Exemestane" or name=="EXEMESTANE (AROMASIN)":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Exemestane/Aromasin"
-            elif name=="5 fluorouracil" or name=="5-Flourouracil" or name=="5-Fluorouracil" or name=="5-FU" or name=="FLOUROURACIL" or name=="fluorouracil" or name=="Fluorouracil" or name=="FLUOROURACIL":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Fluorouracil"
-            elif name=="Faslodex" or name=="faslodex" or name=="Fulvestrant" or name=="FULVESTRANT" or name=="Fulvestrant (Faslodex)":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Fulvestrant/Faslodex"
-            elif name=="gemcitabine" or name=="Gemcitabine" or name=="GEMZAR" or name=="Gemzar":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Gemcitabine/Gemzar"
-            elif name=="Goserelin" or name=="Zoladex":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Goserelin/Zoladex"
-            elif name=="Hormone, NOS":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Hormone, NOS"
-            elif name=="Ibandronate":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Ibandronate"
-            elif name=="Ifosfamide":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Ifosfamide"
-            elif name=="Ixabepilone":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Ixabepilone"
-            elif name=="Lapatinib" or name=="lapatinib":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Lapatinib/Tykerb"
-            elif name=="FEMARA" or name=="femara" or name=="Femara" or name=="Femara (Letrozole)" or name=="Letrozol" or name=="letrozole" or name=="LETROZOLE" or name=="Letrozole" or name=="LETROZOLE (FEMARA)" or name=="Letrozole (Femara)" or name=="letrozolum":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Letrozole/Femara"
-            elif name=="Leuprolide" or name=="LEUPROLIDE ACETATE (LUPRON)" or name=="Leuprorelin" or name=="Lupron" or name=="LUPRON":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Leuprorelin/Lupron"
-            elif name=="Megace":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Megace"
-            elif name=="MESNA-1" or name=="MESNA-2":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Mesna"
-            elif name=="Metformin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Metformin"
-            elif name=="METHOTREXATE" or name=="Methotrexate" or name=="metotreksat":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Methotrexate"
-            elif name=="Mitomycin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Mitomycin C"
-            elif name=="Mitoxantrone":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Mitoxantrone"
-            elif name=="NEULASTA" or name=="Neulasta":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Neulasta"
-            elif name=="E-75":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Neuvax/E-75"
-            elif name=="Not otherwise specified":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "NOS"
-            elif name=="paclitaxel" or name=="PACLITAXEL" or name=="Paclitaxel" or name=="paclitaxelum" or name=="Taxane" or name=="TAXOL" or name=="Taxol" or name=="taxol":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Paclitaxel/Taxol"
-            elif name=="Pamidronate" or name=="Pamidronic acid":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Pamidronate"
-            elif name=="Pemetrexed":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Pemetrexed"
-            elif name=="Poly E":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Poly E"
-            elif name=="Prednisone":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Prednisone"
-            elif name=="Rituximab":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Rituximab"
-            elif name=="Nolvadex" or name=="nolvadex" or name=="tamoxifen" or name=="TAMOXIFEN" or name=="Tamoxifen" or name=="TAMOXIFEN (NOVADEX)" or name=="tamoxifen citrate" or name=="tamoxiphene":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Tamoxifen/Nolvadex"
-            elif name=="Tesetaxel":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Tesetaxel"
-            elif name=="Fareston":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Toremifene/Fareston"
-            elif name=="herceptin" or name=="HERCEPTIN" or name=="Herceptin" or name=="trastuzumab" or name=="Trastuzumab" or name=="TRASTUZUMAB" or name=="Trustuzumab":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Trastuzumab/Herceptin"
-            elif name=="Triptorelin" or name=="triptorelin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Triptorelin"
-            elif name=="Vinblastine":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Vinblastine"
-            elif name=="Vincristine":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Vincristine"
-            elif name=="NAVELBINE" or name=="Navelbine" or name=="Vinorelbine":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Vinorelbine/Navelbine"
-            elif name=="VP-16":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "VP-16"
-            elif name=="Yondelis":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Trabectedin/Yondelis"
-            elif name=="ZOLEDRONIC ACID" or name=="Zoledronic Acid" or name=="Zoledronic acid" or name=="zoledronic acid" or name=="Zometa":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Zoledronic-acid/Zometa"
-            elif name=="ac" or name=="adriamycin+cuclophosphamide" or name=="adriamycin+cyclophosphamid" or name=="adriamycin+cyclophosphamide" or name=="adrimicin+cyclophosphamide" or name=="adrimycin+cyclophosphamide" or name=="doxorubicin+ cyclophosphamide" or name=="doxorubicin+cyclophosphamid" or name=="doxorubicine+cyclophosphamide":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin/Adriamycin + Cyclophosphamide/Cytoxan (AC)"
-            elif name=="Adriamycin, cytoxan, avastin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin/Adriamycin + Cyclophosphamide/Cytoxan (AC) + Bevacizumab/Avastin"
-            elif name=="doxorubicine cyclophosphamide tamoxifen" or name=="doxorubicine+cyclophosphamide+tamoxifen":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin/Adriamycin + Cyclophosphamide/Cytoxan (AC) + Tamoxifen/Nolvadex"
-            elif name=="taxol+adriamycin+cyclophosphamide+herceptin":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Doxorubicin/Adriamycin + Cyclophosphamide/Cytoxan (AC) + Paclitaxel/Taxol + Trastuzumab/Herceptin"
-            elif name=="cyclophosphamide+methotrexatum+fluorouracillum" or name=="methotrexate+5 fluorouracil+cyclophosphamide":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Cyclophosphamide/Cytoxan + Methotrexate + Fluorouracil (CMF)"
-            elif name=="tamoxiphen+anastrazolum" or name=="tamoxiphene+anastrozolum":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Tamoxifen/Nolvadex + Anastrozole/Arimidex"
-            elif name=="tamoxiphene+leuporeline+gosereline":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Tamoxifen/Nolvadex + Leuprorelin/Lupron + Goserelin/Zoladex"
-            elif name=="TCH":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Docetaxel/Taxotere + Carboplatin + Trastuzumab/Herceptin (TCH)"
-            elif name=="Cytoxan and Taxotere" or name=="Taxotere/Cytoxan" or name=="tc" or name=="TC":
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = "Docetaxel/Taxotere + Cyclophosphamide/Cytoxan (TC)"
-            elif name==None:
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['name'] = None
-
-
-            # Therapy type
-            t1 = drug.find("rx:therapy_types", ns).find("rx:therapy_type", ns).text
-            t2 = drug.find("rx:therapy_types", ns).find("rx:therapy_type_notes", ns).text
-            if t1 == "Other, specify in notes":
-                if t2=="ancillary" or t2=="Bisphosphonate" or t2=="biphosphonate" or t2=="BISPHOSPHONATE" or t2=="Bisphosphonate therapy" or t2=="clinical trial - bisphosphonates as adjuvant therapy" or t2=="Bone metastases" or t2=="Given to induce menopause":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = "Ancillary"
-                elif t2=="Aromatase Inhibitor":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = "Hormone Therapy"
-                elif t2==None or t2=="Phase III Clinical Trial" or t2=="Phase III clinical trial":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = None
-            else:
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['therapy_type'] = t1
-
-
-            # Regimen Indication
-            r1 = drug.find("clin_shared:regimen_indication", ns).text
-            r2 = drug.find("clin_shared:regimen_indication_notes", ns).text
-            if r1 == "OTHER, SPECIFY IN NOTES":
-                if r2=="Patient has oesteoporosis (Prevention of further bone loss" or r2=="Maintenance (for osteopenia)" or r2=="Maintenance therapy":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "PALLIATIVE"
-                elif r2==None or r2=="Given to induce menopause" or r2=="Estrogen receptor antagonist in metastatic breast cancer":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = None
-                elif r2=="Neo-Adjuvant" or r2=="Neo-adjuvant" or r2=="neoadjuvant":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "NEO-ADJUVANT"
-                elif r2=="Cancer Vaccine Trial" or r2=="Preventative":
-                    new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = "PREVENTIVE"
-            else:
-                new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['regimen_indication'] = r1
-
-
-            # Response
-            new_dict[meta_clinical[case_id_column]][drug.find("rx:bcr_drug_uuid", ns).text]['response'] = drug.find("clin_shared:measure_of_response", ns).text
+        for drug_uuid, drug in records[meta_clinical[file_id_column]]["drugs"].items():
+            new_dict[meta_clinical[case_id_column]][drug_uuid] = dict(drug, name=normalize_drug_name(drug['name'], {}))
 
 
     # Save as json
@@ -1376,6 +1413,22 @@ def drugs():
 
 
 
+# Record of one patient for radiations(), computed from the patient element of its clinical XML file
+def radiations_record(patient):
+    record = {}
+
+    for radiation in patient.find("rad:radiations", ns):
+        record[radiation.find("rad:bcr_radiation_uuid", ns).text] = {'type':{}, 'treatment_site':{}, 'regimen_indication':{}, 'response':{}}
+
+        record[radiation.find("rad:bcr_radiation_uuid", ns).text]['type'] = radiation.find("rad:radiation_type", ns).text
+        record[radiation.find("rad:bcr_radiation_uuid", ns).text]['treatment_site'] = radiation.find("rad:anatomic_treatment_site", ns).text
+        record[radiation.find("rad:bcr_radiation_uuid", ns).text]['regimen_indication'] = radiation.find("clin_shared:regimen_indication", ns).text
+        record[radiation.find("rad:bcr_radiation_uuid", ns).text]['response'] = radiation.find("clin_shared:measure_of_response", ns).text
+
+    return record
+
+
+
 # Create a file for every patient's radiations information (type, treatment site, response, and etc)
 def radiations():
     # Load meta for clinical data
@@ -1394,25 +1447,12 @@ def radiations():
     # Empty dictionary for the final data
     new_dict = {}
 
+    # Records of every patient, extracted in a single pass over the clinical XML files
+    records = clinical_records()
+
     # Iterate for each patient's clinical data and take the drugs', radiations', and follow-ups' id
     for meta_clinical in meta_clinicals:
-        # find the file id and file name column in your clinical_supplement.csv
-        file_id = meta_clinical[file_id_column]
-        file_name = meta_clinical[file_name_column] 
-
-        # parse the XML file and take the root
-        tree = ET.parse(DATASET_CLINICAL + file_id + "/" + file_name)
-        root = tree.getroot()
-
-        new_dict[meta_clinical[case_id_column]] = {}
-
-        for radiation in root[1].find("rad:radiations", ns):
-            new_dict[meta_clinical[case_id_column]][radiation.find("rad:bcr_radiation_uuid", ns).text] = {'type':{}, 'treatment_site':{}, 'regimen_indication':{}, 'response':{}}
-
-            new_dict[meta_clinical[case_id_column]][radiation.find("rad:bcr_radiation_uuid", ns).text]['type'] = radiation.find("rad:radiation_type", ns).text
-            new_dict[meta_clinical[case_id_column]][radiation.find("rad:bcr_radiation_uuid", ns).text]['treatment_site'] = radiation.find("rad:anatomic_treatment_site", ns).text
-            new_dict[meta_clinical[case_id_column]][radiation.find("rad:bcr_radiation_uuid", ns).text]['regimen_indication'] = radiation.find("clin_shared:regimen_indication", ns).text
-            new_dict[meta_clinical[case_id_column]][radiation.find("rad:bcr_radiation_uuid", ns).text]['response'] = radiation.find("clin_shared:measure_of_response", ns).text
+        new_dict[meta_clinical[case_id_column]] = records[meta_clinical[file_id_column]]["radiations"]
 
 
     # Save as json
@@ -1457,6 +1497,20 @@ def radiations():
 
 
 
+# Record function of every table, all applied by extract_clinical_records() to the patient element of a clinical XML file
+CLINICAL_TABLES = [("uuid", uuid_record),
+                   ("form_completion", form_completion_record),
+                   ("general", general_record),
+                   ("pathology_general", pathology_general_record),
+                   ("pathology_receptor", pathology_receptor_record),
+                   ("pathology_lymph", pathology_lymph_record),
+                   ("pathology_stage", pathology_stage_record),
+                   ("surgery", surgery_record),
+                   ("drugs", drugs_record),
+                   ("radiations", radiations_record)]
+
+
+
 if __name__ == '__main__':
     all_prefix()
     #compare_elmt()
@@ -0,0 +1,16 @@
+import numpy as np
+
+
+
+# Boolean mask of the rows of a table whose key (e.g. case id in column) is one of keys
+# Same result, and so the same row order, as np.logical_or.reduce([column == i for i in keys]),
+# but the keys are sorted once and each row is found by binary search instead of being compared to every key
+def rows_in(column, keys):
+    keys = np.unique(keys)
+    if len(keys) == 0:
+        return np.zeros(len(column), dtype=bool)
+
+    idx = np.searchsorted(keys, column)
+    idx[idx == len(keys)] = 0
+
+    return keys[idx] == column
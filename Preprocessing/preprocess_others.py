@@ -9,38 +9,115 @@ import timeit
 import gzip
 import numpy as np
 import requests
+import mmap
+import hashlib
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from preprocess_join import rows_in
 
 
 
-# Find the row size (nr of cpg sites) for each methylation files
-def meta_methylation_file_size():
-	# 1234 methylation files
-	# from 1095 cases (963 have 1 files, 125 have 2 files,  7 have 3 files)
+# Number of threads used to scan the methylation files, the scan is bound by the disk
+SCAN_THREADS = 8
 
-	# load meta of methylation
+# Number of CPG sites (rows without the header) of the two methylation platforms
+PLATFORM_ROWS = {"GPL8490": 27578, "GPL16304": 485577}
+
+# Number of processes used to validate the cpg sites of the methylation files
+CHECK_WORKERS = multiprocessing.cpu_count()
+
+
+
+# Count the rows of a file without its header
+# The file is mapped in memory and only its newlines are counted, rows are never decoded nor split
+def count_rows(path):
+	chunk = 16 * 1024 ** 2
+
+	with open(path, "rb") as f:
+		size = os.fstat(f.fileno()).st_size
+		if size == 0:
+			return 0
+
+		m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		try:
+			lines = sum(m[start:start + chunk].count(b"\n") for start in range(0, size, chunk))
+			if m[size - 1:size] != b"\n":
+				lines = lines + 1
+		finally:
+			m.close()
+
+	return lines - 1
+
+
+
+# Find the platform and the row count of a methylation file
+# The rows are counted exactly by count_rows(), a truncated file matches no platform and its platform is None
+def methylation_file_platform(path):
+	n_rows = count_rows(path)
+	for platform, platform_rows in PLATFORM_ROWS.items():
+		if n_rows == platform_rows:
+			return platform, n_rows
+
+	return None, n_rows
+
+
+
+# Platform and exact row count of every methylation file, in the order of methylation_beta_value.csv
+# Return a list of (file_id, {"file_name", "size", "mtime", "platform", "rows", "counted"})
+# The files are scanned by SCAN_THREADS threads and the result is cached in files_platform.json,
+# a file is only scanned again when its size or modification time changed
+def methylation_manifest():
 	data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-	
-	# find where the case id column is located in your meta_clinicals.csv
 	file_id_column, = np.where(data_met[0]=='file_id')[0]
 	file_name_column, = np.where(data_met[0]=='file_name')[0]
-	
 	data_met = data_met[1:]
 
-	temp_list = []
-	
-	# iterate for methylation file
-	for i in range(len(data_met)):
-		file_id = data_met[i,file_id_column]
-		file_name = data_met[i,file_name_column]
+	if not(os.path.isdir(TARGET_METHYLATION)):
+		os.makedirs(TARGET_METHYLATION)
+
+	manifest = {}
+	if os.path.isfile(TARGET_METHYLATION + "files_platform.json"):
+		with open(TARGET_METHYLATION + "files_platform.json") as f:
+			manifest = json.load(f)
+
+	def scan(file):
+		file_id, file_name = file
+		path = DATASET_METHYLATION + file_id + "/" + file_name
+		stat = os.stat(path)
+
+		entry = manifest.get(file_id)
+		# entries without "counted" come from an older manifest whose row counts were estimated from the file size
+		if (entry is not None) and entry.get("counted") and ([entry["file_name"], entry["size"], entry["mtime"]] == [file_name, stat.st_size, stat.st_mtime]):
+			return file_id, entry
+
+		platform, n_rows = methylation_file_platform(path)
+		return file_id, {"file_name": file_name, "size": stat.st_size, "mtime": stat.st_mtime, "platform": platform, "rows": n_rows, "counted": True}
+
+	pool = ThreadPool(SCAN_THREADS)
+	try:
+		entries = pool.map(scan, [(row[file_id_column], row[file_name_column]) for row in data_met])
+	finally:
+		pool.close()
+		pool.join()
+
+	with open(TARGET_METHYLATION + "files_platform.json", "w") as f:
+		json.dump(dict(entries), f, indent=2, sort_keys=True)
 
-		with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-			file = f.read().splitlines()
+	return entries
 
-		# file without header
-		rows = file[1:]
 
-		temp_list.append(len(rows))
-		print(len(rows))
+
+# Find the row size (nr of cpg sites) for each methylation files
+def meta_methylation_file_size():
+	# 1234 methylation files
+	# from 1095 cases (963 have 1 files, 125 have 2 files,  7 have 3 files)
+
+	temp_list = []
+	
+	# iterate for methylation file, the row counts come from the manifest (without header)
+	for file_id, entry in methylation_manifest():
+		temp_list.append(entry["rows"])
+		print(entry["rows"])
 
 	# remove duplicate rows
 	print(list(set(temp_list)))
@@ -55,33 +132,17 @@ def meta_methylation_file_size():
 
 # Create list of file id who uses NCBI Platform GPL8490 (short CPG sites) and NCBI Platform GPL16304 (long CPG sites)
 def meta_methylation_list_files():
-	# load meta of methylation
-	data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-	
-	# find where the case id column is located in your meta_clinicals.csv
-	file_id_column, = np.where(data_met[0]=='file_id')[0]
-	file_name_column, = np.where(data_met[0]=='file_name')[0]
-	
-	data_met = data_met[1:]
-
 	files_short = []	# list of file id with 27578 rows
 	files_long = []		# list of file id with 485577 rows
 
-	# iterate for methylation file
-	for i in range(len(data_met)):
-		file_id = data_met[i,file_id_column]
-		file_name = data_met[i,file_name_column]
-
-		with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-			temp = f.read().splitlines()
-
-		# file without header
-		rows = temp[1:]
-
-		if len(rows) == 27578:
+	# iterate for methylation file, the platforms come from the manifest
+	for file_id, entry in methylation_manifest():
+		if entry["platform"] == "GPL8490":
 			files_short.append(file_id)
-		elif len(rows) == 485577:
+		elif entry["platform"] == "GPL16304":
 			files_long.append(file_id)
+		else:
+			print(file_id + " has " + str(entry["rows"]) + " rows, it matches no platform and is skipped")
 
 	# save as json
 	if not(os.path.isdir(TARGET_METHYLATION)):
@@ -226,7 +287,7 @@ def meta_long_methylation():
 	kept_file_id = np.asarray(kept_file_id_j)
 
 	# methylation_long_beta_value is the original methylation_beta_value with only files_long
-	data_met_long = data_met[np.logical_or.reduce([data_met[:,file_id_column] == i for i in kept_file_id])]
+	data_met_long = data_met[rows_in(data_met[:,file_id_column], kept_file_id)]
 	with open(TARGET_META_CSV + 'methylation_long_beta_value.csv', 'w') as f:
 		writer = csv.writer(f)
 		writer.writerow(headers)
@@ -422,12 +483,80 @@ def meta_methylation_used_case():
 	
 
 
+# Fingerprint of a list of cpg sites: SHA-1 of the sorted site ids
+# Two files share a fingerprint exactly when they contain the same cpg sites, whatever their row order
+def cpg_fingerprint(cpg):
+	return hashlib.sha1(b"\n".join(sorted(cpg))).hexdigest()
+
+
+
+# Fingerprint of each platform, from cpg_short.json and cpg_long.json, cached in cpg_fingerprints.json
+# The fingerprints are computed again when the cpg lists are newer than the cache
+def platform_fingerprints():
+	cpg_files = {"GPL8490": TARGET_METHYLATION + "cpg_short.json", "GPL16304": TARGET_METHYLATION + "cpg_long.json"}
+	cache_path = TARGET_METHYLATION + "cpg_fingerprints.json"
+
+	if os.path.isfile(cache_path) and all(os.path.getmtime(cache_path) >= os.path.getmtime(path) for path in cpg_files.values()):
+		with open(cache_path) as f:
+			return json.load(f)
+
+	fingerprints = {}
+	for platform, path in cpg_files.items():
+		with open(path) as f:
+			fingerprints[platform] = cpg_fingerprint([site.encode("utf-8") for site in json.load(f)])
+
+	with open(cache_path, "w") as f:
+		json.dump(fingerprints, f, indent=2)
+
+	return fingerprints
+
+
+
+# cpg.json and the platform fingerprints, loaded once in every process of the validation pool
+CHECK_CPG = {}
+
+def init_check_cpg(cpg, fingerprints):
+	CHECK_CPG["cpg"] = cpg
+	CHECK_CPG["fingerprints"] = fingerprints
+
+
+
+# Validate the cpg sites of one methylation file against its platform and against cpg.json
+# The cpg id column is read and hashed once, the file is only compared site by site when its fingerprint matches no platform
+def check_cpg_file(file):
+	file_id, file_name, path = file
+
+	with open(path, "rb") as f:
+		next(f)
+		sites = [row.split(b"\t", 1)[0] for row in f]
+
+	fingerprint = cpg_fingerprint(sites)
+	result = {"file_id": file_id, "file_name": file_name, "rows": len(sites), "platform": None, "missing_cpg": []}
+
+	for platform, platform_fingerprint in CHECK_CPG["fingerprints"].items():
+		if fingerprint == platform_fingerprint:
+			result["platform"] = platform
+			return result
+
+	# full diff, only for the files that differ from both platforms
+	present = set(site.decode("utf-8") for site in sites)
+	result["missing_cpg"] = [site for site in CHECK_CPG["cpg"] if site not in present]
+
+	return result
+
+
+
 # Check if the main cpg list (cpg.json) actually overlap with all files
+# The files are validated by CHECK_WORKERS processes, see check_cpg_file()
+# Return a report, also saved as check_cpg.json:
+#	files       : number of files checked
+#	comply      : number of files which contain every cpg site of cpg.json
+#	platforms   : number of files whose cpg sites are exactly the ones of each platform
+#	mismatched  : files matching no platform, with their row count and the cpg.json sites they miss
 def meta_methylation_check_cpg():
 	# load cpg.json as the base file
 	with open(TARGET_METHYLATION + "cpg.json") as file:
-		cpg = yaml.safe_load(file)
-	np_cpg = np.asarray(cpg)			# list of used_cpg
+		cpg = json.load(file)			# list of used_cpg
 
 	# load methylation_beta_value
 	data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
@@ -436,73 +565,64 @@ def meta_methylation_check_cpg():
 	file_name_column, = np.where(data_met[0]=='file_name')[0]	
 	data_met = data_met[1:]
 
-	overlap_count = 0
+	fingerprints = platform_fingerprints()
+	files = [(row[file_id_column], row[file_name_column], DATASET_METHYLATION + row[file_id_column] + "/" + row[file_name_column]) for row in data_met]
 
 	# iterate for the whole 1234 methylation files
-	for file in data_met:
-		file_id = file[file_id_column]
-		file_name = file[file_name_column]
-		
-		with open(DATASET_METHYLATION + file_id + "/" +  file_name) as f:
-			rows = f.read().splitlines()
-
-		new_cpg = []
-
-		comment_line = 1
-		for row in range(comment_line, len(rows)):
-			line = rows[row].split("\t")
-			new_cpg.append(line[0])
-
-		np_new_cpg = np.asarray(new_cpg)
-		# find the overlapping cpg
-		np_overlap = np.intersect1d(np_cpg,np_new_cpg)
-
-		# if the cpgs in this file are all in the base file cpg.json
-		if np.array_equal(np_overlap,np_cpg):
-			overlap_count = overlap_count + 1
+	if CHECK_WORKERS <= 1:
+		init_check_cpg(cpg, fingerprints)
+		results = [check_cpg_file(file) for file in files]
+	else:
+		pool = multiprocessing.Pool(CHECK_WORKERS, init_check_cpg, (cpg, fingerprints))
+		try:
+			results = pool.map(check_cpg_file, files)
+		finally:
+			pool.terminate()
+			pool.join()
+
+	report = {"files": len(results),
+			  "comply": sum(1 for result in results if (result["platform"] is not None) or (len(result["missing_cpg"]) == 0)),
+			  "platforms": dict((platform, sum(1 for result in results if result["platform"] == platform)) for platform in fingerprints),
+			  "mismatched": [result for result in results if result["platform"] is None]}
+
+	with open(TARGET_METHYLATION + "check_cpg.json", "w") as f:
+		json.dump(report, f, indent=2, sort_keys=True)
 
 	# number of files comply to cpg.json out of all files
-	print(str(overlap_count) + " out of " + str(len(data_met)) + " comply with the base file cpg.json")
+	print(str(report["comply"]) + " out of " + str(report["files"]) + " comply with the base file cpg.json")
+	for result in report["mismatched"]:
+		print(result["file_id"] + ": " + str(result["rows"]) + " rows, " + str(len(result["missing_cpg"])) + " cpg.json sites missing")
+
+	return report
 
 
 
 # Index list of each cpg.json elements inside cpg_short.json and cpg_long.json 
+# The indexes are saved as int32 .npy arrays, which the packaging memory-maps
 def meta_methylation_cpg_index():
+	# the cpg lists are plain JSON, json.load reads them much faster than yaml
 	with open(TARGET_METHYLATION + "cpg.json") as f:
-		cpg = yaml.safe_load(f)
+		cpg = set(json.load(f))		# hashed lookup instead of a scan of the 25978 sites for every site
 
 	with open(TARGET_METHYLATION + "cpg_long.json") as f:
-		cpg_long = yaml.safe_load(f)
+		cpg_long = json.load(f)
 
 	with open(TARGET_METHYLATION + "cpg_short.json") as f:
-		cpg_short = yaml.safe_load(f)
-
-	cpg_in_cpg_short_idx = []
-	cpg_in_cpg_long_idx = []
+		cpg_short = json.load(f)
 
 	
 	# 1. cpg_in_cpg_short_idx
-	for i in range(len(cpg_short)):
-		if cpg_short[i] in cpg:
-			cpg_in_cpg_short_idx.append(i)
+	cpg_in_cpg_short_idx = [i for i, site in enumerate(cpg_short) if site in cpg]
+	np.save(TARGET_METHYLATION + "cpg_in_cpg_short_idx.npy", np.asarray(cpg_in_cpg_short_idx, dtype=np.int32))
 
-	cpg_in_cpg_short_idx_j = json.dumps(cpg_in_cpg_short_idx, indent=2)
-	with open(TARGET_METHYLATION + "cpg_in_cpg_short_idx.json", "w") as f:
-		f.write(cpg_in_cpg_short_idx_j)
-
-	print("cpg_in_cpg_short_idx.json is created")
+	print("cpg_in_cpg_short_idx.npy is created")
 
 
 	# 2. cpg_in_cpg_long_idx
-	for i in range(len(cpg_long)):
-		if cpg_long[i] in cpg:
-			cpg_in_cpg_long_idx.append(i)
-
-	cpg_in_cpg_long_idx_j = json.dumps(cpg_in_cpg_long_idx, indent=2)
-	with open(TARGET_METHYLATION + "cpg_in_cpg_long_idx.json", "w") as f:
-		f.write(cpg_in_cpg_long_idx_j)
+	cpg_in_cpg_long_idx = [i for i, site in enumerate(cpg_long) if site in cpg]
+	np.save(TARGET_METHYLATION + "cpg_in_cpg_long_idx.npy", np.asarray(cpg_in_cpg_long_idx, dtype=np.int32))
 
-	print("cpg_in_cpg_long_idx.json is created")
+	print("cpg_in_cpg_long_idx.npy is created")
 
 
 
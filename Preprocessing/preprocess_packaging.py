@@ -8,6 +8,505 @@ import numpy as np
 import timeit
 import gzip
 import numpy as np
+from scipy import sparse
+from preprocess_join import rows_in
+from preprocess_stats import feature_stats, update_feature_stats, save_feature_stats, load_feature_stats, select_features
+import multiprocessing
+
+# Write every input matrix through np.lib.format.open_memmap instead of building it in memory
+INPUT_MEMMAP = False
+
+# Number of processes used to parse the raw methylation, gene and miRNA files
+WORKERS = 1
+
+# Continue the matrices left unfinished by an interrupted run and keep the ones that are already complete
+RESUME = False
+
+# Beta value used for the "NA" CPG sites of the methylation files
+METHYLATION_NA = 0.
+
+# Data type of the methylation stores and of the methylation input matrices created from them
+# Beta values lie in [0, 1], so float32 (or even float16) halves the size of the GPL16304 matrices
+METHYLATION_DTYPE = float
+
+# Feature filter of the input matrices, based on the statistics saved with every store (store_<name>_stats.npz)
+# Features missing in more than MAX_NA_RATE of the cases are dropped, then only the TOP_FEATURES most variable ones are kept
+# The index of the kept features is saved as store_<name>_features.npy, the defaults keep every feature
+TOP_FEATURES = None
+MAX_NA_RATE = 1.
+
+# Save the input matrices created from the SPARSE_STORES in CSR format (.npz next to the .npy path) instead of dense .npy
+# HTSeq counts are zero for a large part of the genes, the CSR matrices only keep the nonzero counts
+INPUT_SPARSE = False
+SPARSE_STORES = ["gen_count"]
+
+
+
+# Parse a methylation beta value file
+# Return the beta value of every CPG site in the file, "NA" is replaced by fill_value
+def read_methylation(path, fill_value=METHYLATION_NA):
+    with open(path) as f:
+        next(f)
+        beta = [row.split("\t", 2)[1] for row in f]
+
+    return np.asarray([fill_value if value == "NA" else float(value) for value in beta])
+
+
+
+# Parse a methylation beta value file, keeping "NA" as NaN
+def read_methylation_na(path):
+    return read_methylation(path, fill_value=np.nan)
+
+
+
+# Parse a gene expression quantification file
+# Return the expression value of the 60483 genes (HTSeq count files end with 5 more rows of counting statistics)
+def read_gene(path):
+    with gzip.open(path) as f:
+        file = np.genfromtxt(f, dtype=str, delimiter='\t')
+
+    return file[:60483,1].astype(float)
+
+
+
+# Parse a miRNA expression quantification file
+# Return the read count of the 1881 miRNAs
+def read_mirna(path):
+    file = np.genfromtxt(path, dtype=str, delimiter='\t', skip_header=1)
+
+    return file[:,1].astype(float)
+
+
+
+# Index of a GDC meta file (file_id, file_name, case, sample type and workflow of each file)
+# (case_id, sample_type, workflow)  -> (file_id, file_name) of the first matching file
+# (case_id, sample_type, file_name) -> (file_id, file_name)
+# (case_id, sample_type, None)      -> (file_id, file_name) of the first file of the case, whatever its workflow
+# Each meta file is indexed once per run and the index is shared by all input_* functions
+META_INDEX = {}
+
+def meta_index(meta_file):
+    if meta_file in META_INDEX:
+        return META_INDEX[meta_file]
+
+    data = np.genfromtxt(meta_file, dtype=str, delimiter=',', skip_header=0)
+
+    # find where the case id column is located in your meta_clinicals.csv
+    file_id_column, = np.where(data[0]=='file_id')[0]
+    file_name_column, = np.where(data[0]=='file_name')[0]
+    case_id_column, = np.where(data[0]=='cases.0.case_id')[0]
+    sample_type_column, = np.where(data[0]=='cases.0.samples.0.sample_type')[0]
+    workflow_column = np.where(data[0]=='analysis.workflow_type')[0]
+
+    data = data[1:]
+
+    index = {}
+    for row in data:
+        case = row[case_id_column]
+        sample_type = row[sample_type_column]
+        files = (row[file_id_column], row[file_name_column])
+
+        index.setdefault((case, sample_type, None), files)
+        index.setdefault((case, sample_type, row[file_name_column]), files)
+        if len(workflow_column) > 0:
+            index.setdefault((case, sample_type, row[workflow_column[0]]), files)
+
+    META_INDEX[meta_file] = index
+    return index
+
+
+
+# Create the methylation store, so that every raw methylation file is parsed only once
+# 1. store_met.npy     : beta value of the CPG sites shared by both platforms (cpg.json) for every case in cases_met_cli
+# 2. store_metlong.npy : beta value of all CPG sites of NCBI Platform GPL16304 for every case in cases_metlong_cli
+# The mean, variance and "NA" rate of every CPG site are computed while the files are parsed (store_<name>_stats.npz)
+# All input_met_* and input_metlong_* functions build their matrix by selecting rows from these stores
+def methylation_store():
+    ######################################
+    ### AVAILABLE CASES BASED ON INPUT ###
+    ######################################
+    cases = np.genfromtxt(TARGET_META_CSV + "file_amount.csv", dtype=str, delimiter=',', skip_header=1)
+    cases_met = cases[cases[:,8]!="0",0]    # [1095,]
+    with open(TARGET_METHYLATION + "cases_met_long.json") as f:
+        temp = yaml.safe_load(f)
+    cases_metlong = np.asarray(temp)  # [782,]
+    cases_cli = cases[cases[:,12]!="0",0]   # [1097,]
+    cases_met_cli = np.intersect1d(cases_met,cases_cli) # [1095,]
+    cases_metlong_cli = np.intersect1d(cases_metlong,cases_cli) # [782,]
+
+
+    ######################################
+    ######### METHYLATION STORE ##########
+    ######################################
+    if not(os.path.isdir(DATASET_STORE)):
+        os.makedirs(DATASET_STORE)
+
+    met_index = meta_index(TARGET_META_CSV + "methylation_beta_value.csv")
+    metlong_index = meta_index(TARGET_META_CSV + "methylation_long_beta_value.csv")
+
+    # position of the cpg.json sites in the files of each platform, keyed by the number of CPG sites of the platform
+    # the int32 indexes created by meta_methylation_cpg_index() are sorted and memory-mapped
+    cpg_idx = {27578: np.load(TARGET_METHYLATION + "cpg_in_cpg_short_idx.npy", mmap_mode="r"),
+               485577: np.load(TARGET_METHYLATION + "cpg_in_cpg_long_idx.npy", mmap_mode="r")}
+
+    met_row = dict((case, i) for i, case in enumerate(cases_met_cli))
+    metlong_row = dict((case, i) for i, case in enumerate(cases_metlong_cli))
+
+    # one job per raw file: (file, row in store_met, row in store_metlong)
+    # the long meta file normally points to the same file as the main one, which is then parsed only once
+    jobs = []
+    for case in np.union1d(cases_met_cli,cases_metlong_cli):
+        met_file = DATASET_METHYLATION + "/".join(met_index[(case, "Primary Tumor", None)]) if case in met_row else None
+        metlong_file = DATASET_METHYLATION + "/".join(metlong_index[(case, "Primary Tumor", None)]) if case in metlong_row else None
+
+        if met_file == metlong_file:
+            jobs.append((met_file, met_row[case], metlong_row[case]))
+        else:
+            if met_file is not None:
+                jobs.append((met_file, met_row[case], None))
+            if metlong_file is not None:
+                jobs.append((metlong_file, None, metlong_row[case]))
+
+    # the long store does not fit comfortably in memory, so both stores are written directly to disk
+    # the progress of both stores is kept in store_met.npy.progress
+    store_met_path = DATASET_STORE + "store_met.npy"
+    store_metlong_path = DATASET_STORE + "store_metlong.npy"
+
+    if RESUME and os.path.isfile(store_met_path + ".progress"):
+        store_met = np.load(store_met_path, mmap_mode="r+")
+        store_metlong = np.load(store_metlong_path, mmap_mode="r+")
+        met_stats = load_feature_stats(DATASET_STORE + "store_met_stats.npz")
+        metlong_stats = load_feature_stats(DATASET_STORE + "store_metlong_stats.npz")
+        start = read_progress(store_met_path)
+
+    elif RESUME and os.path.isfile(DATASET_STORE + "store_metlong_cases.json"):
+        print("methylation store is already created")
+        return
+
+    else:
+        store_met = np.lib.format.open_memmap(store_met_path, mode="w+", dtype=METHYLATION_DTYPE, shape=(len(cases_met_cli),25978))
+        store_metlong = np.lib.format.open_memmap(store_metlong_path, mode="w+", dtype=METHYLATION_DTYPE, shape=(len(cases_metlong_cli),485577))
+        met_stats = feature_stats(25978)
+        metlong_stats = feature_stats(485577)
+        start = 0
+        save_feature_stats(DATASET_STORE + "store_met_stats.npz", met_stats)
+        save_feature_stats(DATASET_STORE + "store_metlong_stats.npz", metlong_stats)
+        write_progress(store_met_path, start)
+
+    paths = [job[0] for job in jobs]
+    for j, beta in enumerate(parse_files(read_methylation_na, paths[start:]), start):
+        path, met_i, metlong_i = jobs[j]
+
+        # the statistics count the "NA" sites as missing, the stores keep METHYLATION_NA for them
+        if met_i is not None:
+            beta_met = beta[cpg_idx[len(beta)]]
+            update_feature_stats(met_stats, beta_met)
+            store_met[met_i] = np.where(np.isnan(beta_met), METHYLATION_NA, beta_met)
+
+        if metlong_i is not None:
+            update_feature_stats(metlong_stats, beta)
+            store_metlong[metlong_i] = np.where(np.isnan(beta), METHYLATION_NA, beta)
+
+        print(str(j + 1) + ". " + path)
+
+        if (j + 1) % 10 == 0:
+            store_met.flush()
+            store_metlong.flush()
+            save_feature_stats(DATASET_STORE + "store_met_stats.npz", met_stats)
+            save_feature_stats(DATASET_STORE + "store_metlong_stats.npz", metlong_stats)
+            write_progress(store_met_path, j + 1)
+
+    store_met.flush()
+    store_metlong.flush()
+    del store_met, store_metlong
+    save_feature_stats(DATASET_STORE + "store_met_stats.npz", met_stats)
+    save_feature_stats(DATASET_STORE + "store_metlong_stats.npz", metlong_stats)
+
+    for name, store_cases in [("met", cases_met_cli), ("metlong", cases_metlong_cli)]:
+        store_cases_j = json.dumps(store_cases.tolist(), indent=2)
+        with open(DATASET_STORE + "store_" + name + "_cases.json", "w") as text_file:
+            text_file.write(store_cases_j)
+        print("store_" + name + ".npy is created")
+
+    os.remove(store_met_path + ".progress")
+
+
+
+# Create the store of one data type in DATASET_STORE: the parsed raw file of every case, one row per case
+# store_<name>_cases.json keeps the (sorted) case of each row, store_<name>_stats.npz the mean and variance of each feature
+# The statistics are updated while the files are parsed and saved with the progress of the store
+def build_store(name, cases, paths, read_function, n_features):
+    path = DATASET_STORE + "store_" + name + ".npy"
+    stats_path = DATASET_STORE + "store_" + name + "_stats.npz"
+
+    if RESUME and os.path.isfile(path + ".progress"):
+        store = np.load(path, mmap_mode="r+")
+        stats = load_feature_stats(stats_path)
+
+    elif RESUME and os.path.isfile(DATASET_STORE + "store_" + name + "_cases.json"):
+        print("store_" + name + ".npy is already created")
+        return
+
+    else:
+        store = np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(len(cases),n_features))
+        stats = feature_stats(n_features)
+        save_feature_stats(stats_path, stats)
+        write_progress(path, 0)
+
+    fill_rows(path, store, read_function, paths, stats, stats_path)
+    save_feature_stats(stats_path, stats)
+
+    store_cases_j = json.dumps(cases.tolist(), indent=2)
+    with open(DATASET_STORE + "store_" + name + "_cases.json", "w") as text_file:
+        text_file.write(store_cases_j)
+
+    save_input_matrix(path, store)
+    print("store_" + name + ".npy is created")
+
+
+
+# Create the gene expression stores, one per workflow analysis (HTSEC count, HTSEC FPKM, HTSEC FPKM-UQ)
+# Every gene expression file is parsed only once, all input_gen_* functions select their rows from these stores
+def gene_store():
+    ######################################
+    ### AVAILABLE CASES BASED ON INPUT ###
+    ######################################
+    cases = np.genfromtxt(TARGET_META_CSV + "file_amount.csv", dtype=str, delimiter=',', skip_header=1)
+    cases_gen = cases[cases[:,9]!="0",0]    # [1092,]
+    # remove cases in cases_gen where there are no tumor sample
+    cases_gen = np.delete(cases_gen, np.argwhere(cases_gen=="2b22db1d-54a1-4b9e-a86e-a174cf51d95c"))    # [1091,]
+    cases_cli = cases[cases[:,12]!="0",0]   # [1097,]
+    cases_gen_cli = np.intersect1d(cases_gen,cases_cli) # [1090,]
+
+
+    ######################################
+    ######## GENE EXPRESSION STORE #######
+    ######################################
+    if not(os.path.isdir(DATASET_STORE)):
+        os.makedirs(DATASET_STORE)
+
+    gene_index = meta_index(TARGET_META_CSV + "gene_expression_quantification.csv")
+
+    # the FPKM and FPKM-UQ files are the ones computed from the same aliquot as the HTSeq count file
+    paths = {"count": [], "fpkm": [], "fpkmuq": []}
+    for case in cases_gen_cli:
+        file_id, file_name = gene_index[(case, "Primary Tumor", "HTSeq - Counts")]
+        paths["count"].append(DATASET_GENE + file_id + "/" + file_name)
+
+        for workflow, extension in [("fpkm", ".FPKM.txt.gz"), ("fpkmuq", ".FPKM-UQ.txt.gz")]:
+            workflow_file_name = file_name.split(".")[0] + extension
+            workflow_file_id = gene_index[(case, "Primary Tumor", workflow_file_name)][0]
+            paths[workflow].append(DATASET_GENE + workflow_file_id + "/" + workflow_file_name)
+
+    for workflow in ["count", "fpkm", "fpkmuq"]:
+        build_store("gen_" + workflow, cases_gen_cli, paths[workflow], read_gene, 60483)
+
+
+
+# Create the miRNA expression store
+# Every miRNA expression file is parsed only once, all input_mir_* functions select their rows from this store
+def mirna_store():
+    ######################################
+    ### AVAILABLE CASES BASED ON INPUT ###
+    ######################################
+    cases = np.genfromtxt(TARGET_META_CSV + "file_amount.csv", dtype=str, delimiter=',', skip_header=1)
+    cases_mir = cases[cases[:,10]!="0",0]   # [1078,]
+    # remove cases in cases_mir where there are no tumor sample
+    cases_mir = np.delete(cases_mir, np.argwhere(cases_mir=="3c8b5af9-c34d-43c2-b8c9-39ea11e44fa6"))    # [1078,]
+    cases_cli = cases[cases[:,12]!="0",0]   # [1097,]
+    cases_mir_cli = np.intersect1d(cases_mir,cases_cli) # [1077,]
+
+
+    ######################################
+    ######## MIRNA EXPRESSION STORE ######
+    ######################################
+    if not(os.path.isdir(DATASET_STORE)):
+        os.makedirs(DATASET_STORE)
+
+    mir_index = meta_index(TARGET_META_CSV + "mirna_expression_quantification.csv")
+
+    paths = []
+    for case in cases_mir_cli:
+        file_id, file_name = mir_index[(case, "Primary Tumor", None)]
+        paths.append(DATASET_MIRNA + file_id + "/" + file_name)
+
+    build_store("mir", cases_mir_cli, paths, read_mirna, 1881)
+
+
+
+# Features kept from each store by the feature filter (TOP_FEATURES, MAX_NA_RATE), keyed by the file of the store
+STORE_FEATURES = {}
+
+# Files of the stores whose input matrices are saved in CSR format (INPUT_SPARSE)
+SPARSE_STORE_FILES = set()
+
+
+
+# Load a store created by methylation_store(), gene_store() or mirna_store()
+# The matrix is memory-mapped, rows are only read when they are selected
+def load_store(name):
+    with open(DATASET_STORE + "store_" + name + "_cases.json") as f:
+        store_cases = np.asarray(yaml.safe_load(f))
+
+    store = np.load(DATASET_STORE + "store_" + name + ".npy", mmap_mode="r")
+
+    if (TOP_FEATURES is not None) or (MAX_NA_RATE < 1.):
+        features = select_features(load_feature_stats(DATASET_STORE + "store_" + name + "_stats.npz"), TOP_FEATURES, MAX_NA_RATE)
+        np.save(DATASET_STORE + "store_" + name + "_features.npy", features)
+        STORE_FEATURES[store.filename] = features
+
+    if INPUT_SPARSE and (name in SPARSE_STORES):
+        SPARSE_STORE_FILES.add(store.filename)
+
+    return store_cases, store
+
+
+
+# Row index of each case inside a store
+# both store_cases and cases are sorted (they come from np.intersect1d)
+def store_rows(store_cases, cases):
+    rows = np.searchsorted(store_cases, cases)
+
+    if (len(rows) > 0) and ((rows.max() >= len(store_cases)) or np.any(store_cases[rows] != cases)):
+        raise ValueError("Some cases are not in the store, create the stores again.")
+
+    return rows
+
+
+
+# Number of rows of a matrix already written on disk, kept in path + ".progress"
+def read_progress(path):
+    with open(path + ".progress") as f:
+        return int(f.read())
+
+
+
+def write_progress(path, n_rows):
+    with open(path + ".progress", "w") as text_file:
+        text_file.write(str(n_rows))
+
+
+
+# Parse raw files with read_function, in a pool of WORKERS processes
+# The parsed files are returned in the same order as paths
+def parse_files(read_function, paths):
+    if WORKERS <= 1:
+        for path in paths:
+            yield read_function(path)
+        return
+
+    pool = multiprocessing.Pool(WORKERS)
+    try:
+        for result in pool.imap(read_function, paths):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+
+# Allocate the input matrix of a dataset, one row per case
+# If INPUT_MEMMAP is True, the matrix is written directly into its .npy file instead of being kept in memory
+# If RESUME is True, the matrix left on disk by a previous run is reused
+def input_matrix(path, n_cases, n_features, dtype=float):
+    if RESUME and os.path.isfile(path):
+        matrix = np.load(path, mmap_mode="r+")
+        if (matrix.shape == (n_cases,n_features)) and (matrix.dtype == dtype):
+            return matrix
+
+    if INPUT_MEMMAP:
+        write_progress(path, 0)
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n_cases,n_features))
+
+    return np.empty((n_cases,n_features), dtype)
+
+
+
+# Number of rows of an input matrix already filled by a previous run
+def filled_rows(path, matrix):
+    if not isinstance(matrix, np.memmap):
+        return 0
+
+    if os.path.isfile(path + ".progress"):
+        return read_progress(path)
+
+    return len(matrix)
+
+
+
+# Fill the rows of an input matrix with the raw files in paths, parsed by read_function
+# Matrices written on disk save their progress every 10 rows, so an interrupted run can be resumed
+# If stats is given, the feature statistics are updated with every row and saved in stats_path with the progress
+def fill_rows(path, matrix, read_function, paths, stats=None, stats_path=None):
+    start = filled_rows(path, matrix)
+
+    for i, row in enumerate(parse_files(read_function, paths[start:]), start):
+        matrix[i] = row
+        if stats is not None:
+            update_feature_stats(stats, matrix[i])
+        print(str(i + 1) + ". " + paths[i])
+
+        if isinstance(matrix, np.memmap) and ((i + 1) % 10 == 0):
+            matrix.flush()
+            if stats is not None:
+                save_feature_stats(stats_path, stats)
+            write_progress(path, i + 1)
+
+
+
+# Save an input matrix created by input_matrix()
+def save_input_matrix(path, matrix):
+    if isinstance(matrix, np.memmap):
+        matrix.flush()
+        if os.path.isfile(path + ".progress"):
+            os.remove(path + ".progress")
+    else:
+        np.save(path, matrix)
+
+
+
+# Save the input matrix of a sparse store in CSR format, as path with the .npz extension
+# The rows are converted 100 at a time, so the dense matrix is never built in memory
+def sparse_input_matrix(path, store, rows, features):
+    sparse_path = os.path.splitext(path)[0] + ".npz"
+    if RESUME and os.path.isfile(sparse_path):
+        return
+
+    blocks = [sparse.csr_matrix((0,len(features)), dtype=store.dtype)]
+    for start in range(0, len(rows), 100):
+        blocks.append(sparse.csr_matrix(store[rows[start:start + 100]][:,features]))
+    sparse.save_npz(sparse_path, sparse.vstack(blocks, format="csr"))
+
+    # the models load the .npy matrix first when both exist
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+
+# Save which store, rows and features an input matrix was copied from, as path with the _store.npz suffix
+# The models fit their PCA once on the whole store and take the rows of every input from it (see transform_cache.py)
+def save_input_store(path, store, rows, features):
+    store_path = os.path.relpath(store.filename, os.path.dirname(os.path.abspath(path)))
+    np.savez(os.path.splitext(path)[0] + "_store.npz", store=store_path, rows=rows, features=features)
+
+
+
+# Create an input matrix by copying the given rows of a store, the matrix keeps the data type of the store
+# Only the features kept by the feature filter are copied
+def store_input_matrix(path, store, rows):
+    features = STORE_FEATURES.get(getattr(store, "filename", None), np.arange(store.shape[1]))
+
+    if getattr(store, "filename", None) in SPARSE_STORE_FILES:
+        sparse_input_matrix(path, store, rows, features)
+    else:
+        matrix = input_matrix(path, len(rows), len(features), store.dtype)
+        for i in range(filled_rows(path, matrix), len(rows)):
+            matrix[i] = store[rows[i]][features]
+
+        save_input_matrix(path, matrix)
+
+    if getattr(store, "filename", None) is not None:
+        save_input_store(path, store, rows, features)
 
 
 
@@ -110,21 +609,21 @@ def label_cancer_type(dataset=3):
     ######################################
     if (dataset==1) or (dataset==5):
         # 1. Methylation
-        label_er_met_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_er_null]),2]
+        label_er_met_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_er_null),2]
         label_er_met_no_er_null = label_er_met_no_er_null.tolist()
         label_er_met_no_er_null = [0 if x=='Positive' else x for x in label_er_met_no_er_null]
         label_er_met_no_er_null = [1 if x=='Negative' else x for x in label_er_met_no_er_null]
         label_er_met_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_met_no_er_null]
         label_er_met_no_er_null = np.asarray(label_er_met_no_er_null)
         
-        label_pgr_met_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_pgr_null]),4]
+        label_pgr_met_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_pgr_null),4]
         label_pgr_met_no_pgr_null = label_pgr_met_no_pgr_null.tolist()
         label_pgr_met_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_met_no_pgr_null]
         label_pgr_met_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_met_no_pgr_null]
         label_pgr_met_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_met_no_pgr_null]
         label_pgr_met_no_pgr_null = np.asarray(label_pgr_met_no_pgr_null)
         
-        label_her2_met_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_her2_null]),7]
+        label_her2_met_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_her2_null),7]
         label_her2_met_no_her2_null = label_her2_met_no_her2_null.tolist()
         label_her2_met_no_her2_null = [0 if x=='Positive' else x for x in label_her2_met_no_her2_null]
         label_her2_met_no_her2_null = [1 if x=='Negative' else x for x in label_her2_met_no_her2_null]
@@ -132,21 +631,21 @@ def label_cancer_type(dataset=3):
         label_her2_met_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_met_no_her2_null]
         label_her2_met_no_her2_null = np.asarray(label_her2_met_no_her2_null)
         
-        label_er_met_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_null]),2]
+        label_er_met_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_null),2]
         label_er_met_no_null = label_er_met_no_null.tolist()
         label_er_met_no_null = [0 if x=='Positive' else x for x in label_er_met_no_null]
         label_er_met_no_null = [1 if x=='Negative' else x for x in label_er_met_no_null]
         label_er_met_no_null = [2 if x=='Indeterminate' else x for x in label_er_met_no_null]
         label_er_met_no_null = np.asarray(label_er_met_no_null)
         
-        label_pgr_met_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_null]),4]
+        label_pgr_met_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_null),4]
         label_pgr_met_no_null = label_pgr_met_no_null.tolist()
         label_pgr_met_no_null = [0 if x=='Positive' else x for x in label_pgr_met_no_null]
         label_pgr_met_no_null = [1 if x=='Negative' else x for x in label_pgr_met_no_null]
         label_pgr_met_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_met_no_null]
         label_pgr_met_no_null = np.asarray(label_pgr_met_no_null)
         
-        label_her2_met_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_no_null]),7]
+        label_her2_met_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_no_null),7]
         label_her2_met_no_null = label_her2_met_no_null.tolist()
         label_her2_met_no_null = [0 if x=='Positive' else x for x in label_her2_met_no_null]
         label_her2_met_no_null = [1 if x=='Negative' else x for x in label_her2_met_no_null]
@@ -156,21 +655,21 @@ def label_cancer_type(dataset=3):
 
 
         # 2. Methylation Long
-        label_er_metlong_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_er_null]),2]
+        label_er_metlong_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_er_null),2]
         label_er_metlong_no_er_null = label_er_metlong_no_er_null.tolist()
         label_er_metlong_no_er_null = [0 if x=='Positive' else x for x in label_er_metlong_no_er_null]
         label_er_metlong_no_er_null = [1 if x=='Negative' else x for x in label_er_metlong_no_er_null]
         label_er_metlong_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_metlong_no_er_null]
         label_er_metlong_no_er_null = np.asarray(label_er_metlong_no_er_null)
         
-        label_pgr_metlong_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_pgr_null]),4]
+        label_pgr_metlong_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_pgr_null),4]
         label_pgr_metlong_no_pgr_null = label_pgr_metlong_no_pgr_null.tolist()
         label_pgr_metlong_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_metlong_no_pgr_null]
         label_pgr_metlong_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_metlong_no_pgr_null]
         label_pgr_metlong_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_metlong_no_pgr_null]
         label_pgr_metlong_no_pgr_null = np.asarray(label_pgr_metlong_no_pgr_null)
         
-        label_her2_metlong_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_her2_null]),7]
+        label_her2_metlong_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_her2_null),7]
         label_her2_metlong_no_her2_null = label_her2_metlong_no_her2_null.tolist()
         label_her2_metlong_no_her2_null = [0 if x=='Positive' else x for x in label_her2_metlong_no_her2_null]
         label_her2_metlong_no_her2_null = [1 if x=='Negative' else x for x in label_her2_metlong_no_her2_null]
@@ -178,21 +677,21 @@ def label_cancer_type(dataset=3):
         label_her2_metlong_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_metlong_no_her2_null]
         label_her2_metlong_no_her2_null = np.asarray(label_her2_metlong_no_her2_null)
         
-        label_er_metlong_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_null]),2]
+        label_er_metlong_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_null),2]
         label_er_metlong_no_null = label_er_metlong_no_null.tolist()
         label_er_metlong_no_null = [0 if x=='Positive' else x for x in label_er_metlong_no_null]
         label_er_metlong_no_null = [1 if x=='Negative' else x for x in label_er_metlong_no_null]
         label_er_metlong_no_null = [2 if x=='Indeterminate' else x for x in label_er_metlong_no_null]
         label_er_metlong_no_null = np.asarray(label_er_metlong_no_null)
         
-        label_pgr_metlong_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_null]),4]
+        label_pgr_metlong_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_null),4]
         label_pgr_metlong_no_null = label_pgr_metlong_no_null.tolist()
         label_pgr_metlong_no_null = [0 if x=='Positive' else x for x in label_pgr_metlong_no_null]
         label_pgr_metlong_no_null = [1 if x=='Negative' else x for x in label_pgr_metlong_no_null]
         label_pgr_metlong_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_metlong_no_null]
         label_pgr_metlong_no_null = np.asarray(label_pgr_metlong_no_null)
         
-        label_her2_metlong_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_no_null]),7]
+        label_her2_metlong_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_no_null),7]
         label_her2_metlong_no_null = label_her2_metlong_no_null.tolist()
         label_her2_metlong_no_null = [0 if x=='Positive' else x for x in label_her2_metlong_no_null]
         label_her2_metlong_no_null = [1 if x=='Negative' else x for x in label_her2_metlong_no_null]
@@ -203,21 +702,21 @@ def label_cancer_type(dataset=3):
 
     if (dataset==2) or (dataset==4) or (dataset==5):
         # 3. Gene
-        label_er_gen_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_er_null]),2]
+        label_er_gen_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_er_null),2]
         label_er_gen_no_er_null = label_er_gen_no_er_null.tolist()
         label_er_gen_no_er_null = [0 if x=='Positive' else x for x in label_er_gen_no_er_null]
         label_er_gen_no_er_null = [1 if x=='Negative' else x for x in label_er_gen_no_er_null]
         label_er_gen_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_gen_no_er_null]
         label_er_gen_no_er_null = np.asarray(label_er_gen_no_er_null)
         
-        label_pgr_gen_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_pgr_null]),4]
+        label_pgr_gen_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_pgr_null),4]
         label_pgr_gen_no_pgr_null = label_pgr_gen_no_pgr_null.tolist()
         label_pgr_gen_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_gen_no_pgr_null]
         label_pgr_gen_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_gen_no_pgr_null]
         label_pgr_gen_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_gen_no_pgr_null]
         label_pgr_gen_no_pgr_null = np.asarray(label_pgr_gen_no_pgr_null)
         
-        label_her2_gen_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_her2_null]),7]
+        label_her2_gen_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_her2_null),7]
         label_her2_gen_no_her2_null = label_her2_gen_no_her2_null.tolist()
         label_her2_gen_no_her2_null = [0 if x=='Positive' else x for x in label_her2_gen_no_her2_null]
         label_her2_gen_no_her2_null = [1 if x=='Negative' else x for x in label_her2_gen_no_her2_null]
@@ -225,21 +724,21 @@ def label_cancer_type(dataset=3):
         label_her2_gen_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_gen_no_her2_null]
         label_her2_gen_no_her2_null = np.asarray(label_her2_gen_no_her2_null)
         
-        label_er_gen_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_null]),2]
+        label_er_gen_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_null),2]
         label_er_gen_no_null = label_er_gen_no_null.tolist()
         label_er_gen_no_null = [0 if x=='Positive' else x for x in label_er_gen_no_null]
         label_er_gen_no_null = [1 if x=='Negative' else x for x in label_er_gen_no_null]
         label_er_gen_no_null = [2 if x=='Indeterminate' else x for x in label_er_gen_no_null]
         label_er_gen_no_null = np.asarray(label_er_gen_no_null)
         
-        label_pgr_gen_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_null]),4]
+        label_pgr_gen_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_null),4]
         label_pgr_gen_no_null = label_pgr_gen_no_null.tolist()
         label_pgr_gen_no_null = [0 if x=='Positive' else x for x in label_pgr_gen_no_null]
         label_pgr_gen_no_null = [1 if x=='Negative' else x for x in label_pgr_gen_no_null]
         label_pgr_gen_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_gen_no_null]
         label_pgr_gen_no_null = np.asarray(label_pgr_gen_no_null)
         
-        label_her2_gen_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_no_null]),7]
+        label_her2_gen_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_no_null),7]
         label_her2_gen_no_null = label_her2_gen_no_null.tolist()
         label_her2_gen_no_null = [0 if x=='Positive' else x for x in label_her2_gen_no_null]
         label_her2_gen_no_null = [1 if x=='Negative' else x for x in label_her2_gen_no_null]
@@ -250,21 +749,21 @@ def label_cancer_type(dataset=3):
     
     if (dataset==3) or (dataset==4) or (dataset==5):
         # 4. miRNA
-        label_er_mir_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_er_null]),2]
+        label_er_mir_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_er_null),2]
         label_er_mir_no_er_null = label_er_mir_no_er_null.tolist()
         label_er_mir_no_er_null = [0 if x=='Positive' else x for x in label_er_mir_no_er_null]
         label_er_mir_no_er_null = [1 if x=='Negative' else x for x in label_er_mir_no_er_null]
         label_er_mir_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_mir_no_er_null]
         label_er_mir_no_er_null = np.asarray(label_er_mir_no_er_null)
         
-        label_pgr_mir_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_pgr_null]),4]
+        label_pgr_mir_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_pgr_null),4]
         label_pgr_mir_no_pgr_null = label_pgr_mir_no_pgr_null.tolist()
         label_pgr_mir_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_mir_no_pgr_null]
         label_pgr_mir_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_mir_no_pgr_null]
         label_pgr_mir_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_mir_no_pgr_null]
         label_pgr_mir_no_pgr_null = np.asarray(label_pgr_mir_no_pgr_null)
         
-        label_her2_mir_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_her2_null]),7]
+        label_her2_mir_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_her2_null),7]
         label_her2_mir_no_her2_null = label_her2_mir_no_her2_null.tolist()
         label_her2_mir_no_her2_null = [0 if x=='Positive' else x for x in label_her2_mir_no_her2_null]
         label_her2_mir_no_her2_null = [1 if x=='Negative' else x for x in label_her2_mir_no_her2_null]
@@ -272,21 +771,21 @@ def label_cancer_type(dataset=3):
         label_her2_mir_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_mir_no_her2_null]
         label_her2_mir_no_her2_null = np.asarray(label_her2_mir_no_her2_null)
         
-        label_er_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_null]),2]
+        label_er_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_null),2]
         label_er_mir_no_null = label_er_mir_no_null.tolist()
         label_er_mir_no_null = [0 if x=='Positive' else x for x in label_er_mir_no_null]
         label_er_mir_no_null = [1 if x=='Negative' else x for x in label_er_mir_no_null]
         label_er_mir_no_null = [2 if x=='Indeterminate' else x for x in label_er_mir_no_null]
         label_er_mir_no_null = np.asarray(label_er_mir_no_null)
         
-        label_pgr_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_null]),4]
+        label_pgr_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_null),4]
         label_pgr_mir_no_null = label_pgr_mir_no_null.tolist()
         label_pgr_mir_no_null = [0 if x=='Positive' else x for x in label_pgr_mir_no_null]
         label_pgr_mir_no_null = [1 if x=='Negative' else x for x in label_pgr_mir_no_null]
         label_pgr_mir_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_mir_no_null]
         label_pgr_mir_no_null = np.asarray(label_pgr_mir_no_null)
         
-        label_her2_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_mir_no_null]),7]
+        label_her2_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_mir_no_null),7]
         label_her2_mir_no_null = label_her2_mir_no_null.tolist()
         label_her2_mir_no_null = [0 if x=='Positive' else x for x in label_her2_mir_no_null]
         label_her2_mir_no_null = [1 if x=='Negative' else x for x in label_her2_mir_no_null]
@@ -297,21 +796,21 @@ def label_cancer_type(dataset=3):
     
     if (dataset==4) or (dataset==5):
         # 5. Gene + miRNA
-        label_er_gen_mir_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_er_null]),2]
+        label_er_gen_mir_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_er_null),2]
         label_er_gen_mir_no_er_null = label_er_gen_mir_no_er_null.tolist()
         label_er_gen_mir_no_er_null = [0 if x=='Positive' else x for x in label_er_gen_mir_no_er_null]
         label_er_gen_mir_no_er_null = [1 if x=='Negative' else x for x in label_er_gen_mir_no_er_null]
         label_er_gen_mir_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_gen_mir_no_er_null]
         label_er_gen_mir_no_er_null = np.asarray(label_er_gen_mir_no_er_null)
         
-        label_pgr_gen_mir_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_pgr_null]),4]
+        label_pgr_gen_mir_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_pgr_null),4]
         label_pgr_gen_mir_no_pgr_null = label_pgr_gen_mir_no_pgr_null.tolist()
         label_pgr_gen_mir_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_gen_mir_no_pgr_null]
         label_pgr_gen_mir_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_gen_mir_no_pgr_null]
         label_pgr_gen_mir_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_gen_mir_no_pgr_null]
         label_pgr_gen_mir_no_pgr_null = np.asarray(label_pgr_gen_mir_no_pgr_null)
         
-        label_her2_gen_mir_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_her2_null]),7]
+        label_her2_gen_mir_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_her2_null),7]
         label_her2_gen_mir_no_her2_null = label_her2_gen_mir_no_her2_null.tolist()
         label_her2_gen_mir_no_her2_null = [0 if x=='Positive' else x for x in label_her2_gen_mir_no_her2_null]
         label_her2_gen_mir_no_her2_null = [1 if x=='Negative' else x for x in label_her2_gen_mir_no_her2_null]
@@ -319,21 +818,21 @@ def label_cancer_type(dataset=3):
         label_her2_gen_mir_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_gen_mir_no_her2_null]
         label_her2_gen_mir_no_her2_null = np.asarray(label_her2_gen_mir_no_her2_null)
         
-        label_er_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_null]),2]
+        label_er_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_null),2]
         label_er_gen_mir_no_null = label_er_gen_mir_no_null.tolist()
         label_er_gen_mir_no_null = [0 if x=='Positive' else x for x in label_er_gen_mir_no_null]
         label_er_gen_mir_no_null = [1 if x=='Negative' else x for x in label_er_gen_mir_no_null]
         label_er_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_er_gen_mir_no_null]
         label_er_gen_mir_no_null = np.asarray(label_er_gen_mir_no_null)
         
-        label_pgr_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_null]),4]
+        label_pgr_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_null),4]
         label_pgr_gen_mir_no_null = label_pgr_gen_mir_no_null.tolist()
         label_pgr_gen_mir_no_null = [0 if x=='Positive' else x for x in label_pgr_gen_mir_no_null]
         label_pgr_gen_mir_no_null = [1 if x=='Negative' else x for x in label_pgr_gen_mir_no_null]
         label_pgr_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_gen_mir_no_null]
         label_pgr_gen_mir_no_null = np.asarray(label_pgr_gen_mir_no_null)
         
-        label_her2_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_gen_mir_no_null]),7]
+        label_her2_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_gen_mir_no_null),7]
         label_her2_gen_mir_no_null = label_her2_gen_mir_no_null.tolist()
         label_her2_gen_mir_no_null = [0 if x=='Positive' else x for x in label_her2_gen_mir_no_null]
         label_her2_gen_mir_no_null = [1 if x=='Negative' else x for x in label_her2_gen_mir_no_null]
@@ -344,21 +843,21 @@ def label_cancer_type(dataset=3):
     
     if (dataset==5):
         # 6. Methylation + Gene + miRNA
-        label_er_met_gen_mir_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_er_null]),2]
+        label_er_met_gen_mir_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_er_null),2]
         label_er_met_gen_mir_no_er_null = label_er_met_gen_mir_no_er_null.tolist()
         label_er_met_gen_mir_no_er_null = [0 if x=='Positive' else x for x in label_er_met_gen_mir_no_er_null]
         label_er_met_gen_mir_no_er_null = [1 if x=='Negative' else x for x in label_er_met_gen_mir_no_er_null]
         label_er_met_gen_mir_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_met_gen_mir_no_er_null]
         label_er_met_gen_mir_no_er_null = np.asarray(label_er_met_gen_mir_no_er_null)
         
-        label_pgr_met_gen_mir_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_pgr_null]),4]
+        label_pgr_met_gen_mir_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_pgr_null),4]
         label_pgr_met_gen_mir_no_pgr_null = label_pgr_met_gen_mir_no_pgr_null.tolist()
         label_pgr_met_gen_mir_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_met_gen_mir_no_pgr_null]
         label_pgr_met_gen_mir_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_met_gen_mir_no_pgr_null]
         label_pgr_met_gen_mir_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_met_gen_mir_no_pgr_null]
         label_pgr_met_gen_mir_no_pgr_null = np.asarray(label_pgr_met_gen_mir_no_pgr_null)
         
-        label_her2_met_gen_mir_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_her2_null]),7]
+        label_her2_met_gen_mir_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_her2_null),7]
         label_her2_met_gen_mir_no_her2_null = label_her2_met_gen_mir_no_her2_null.tolist()
         label_her2_met_gen_mir_no_her2_null = [0 if x=='Positive' else x for x in label_her2_met_gen_mir_no_her2_null]
         label_her2_met_gen_mir_no_her2_null = [1 if x=='Negative' else x for x in label_her2_met_gen_mir_no_her2_null]
@@ -366,21 +865,21 @@ def label_cancer_type(dataset=3):
         label_her2_met_gen_mir_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_met_gen_mir_no_her2_null]
         label_her2_met_gen_mir_no_her2_null = np.asarray(label_her2_met_gen_mir_no_her2_null)
         
-        label_er_met_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_null]),2]
+        label_er_met_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_null),2]
         label_er_met_gen_mir_no_null = label_er_met_gen_mir_no_null.tolist()
         label_er_met_gen_mir_no_null = [0 if x=='Positive' else x for x in label_er_met_gen_mir_no_null]
         label_er_met_gen_mir_no_null = [1 if x=='Negative' else x for x in label_er_met_gen_mir_no_null]
         label_er_met_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_er_met_gen_mir_no_null]
         label_er_met_gen_mir_no_null = np.asarray(label_er_met_gen_mir_no_null)
         
-        label_pgr_met_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_null]),4]
+        label_pgr_met_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_null),4]
         label_pgr_met_gen_mir_no_null = label_pgr_met_gen_mir_no_null.tolist()
         label_pgr_met_gen_mir_no_null = [0 if x=='Positive' else x for x in label_pgr_met_gen_mir_no_null]
         label_pgr_met_gen_mir_no_null = [1 if x=='Negative' else x for x in label_pgr_met_gen_mir_no_null]
         label_pgr_met_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_met_gen_mir_no_null]
         label_pgr_met_gen_mir_no_null = np.asarray(label_pgr_met_gen_mir_no_null)
         
-        label_her2_met_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_met_gen_mir_no_null]),7]
+        label_her2_met_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_met_gen_mir_no_null),7]
         label_her2_met_gen_mir_no_null = label_her2_met_gen_mir_no_null.tolist()
         label_her2_met_gen_mir_no_null = [0 if x=='Positive' else x for x in label_her2_met_gen_mir_no_null]
         label_her2_met_gen_mir_no_null = [1 if x=='Negative' else x for x in label_her2_met_gen_mir_no_null]
@@ -390,21 +889,21 @@ def label_cancer_type(dataset=3):
         
         
         # 7. Methylation Long + Gene + miRNA
-        label_er_metlong_gen_mir_no_er_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_er_null]),2]
+        label_er_metlong_gen_mir_no_er_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_er_null),2]
         label_er_metlong_gen_mir_no_er_null = label_er_metlong_gen_mir_no_er_null.tolist()
         label_er_metlong_gen_mir_no_er_null = [0 if x=='Positive' else x for x in label_er_metlong_gen_mir_no_er_null]
         label_er_metlong_gen_mir_no_er_null = [1 if x=='Negative' else x for x in label_er_metlong_gen_mir_no_er_null]
         label_er_metlong_gen_mir_no_er_null = [2 if x=='Indeterminate' else x for x in label_er_metlong_gen_mir_no_er_null]
         label_er_metlong_gen_mir_no_er_null = np.asarray(label_er_metlong_gen_mir_no_er_null)
         
-        label_pgr_metlong_gen_mir_no_pgr_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_pgr_null]),4]
+        label_pgr_metlong_gen_mir_no_pgr_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_pgr_null),4]
         label_pgr_metlong_gen_mir_no_pgr_null = label_pgr_metlong_gen_mir_no_pgr_null.tolist()
         label_pgr_metlong_gen_mir_no_pgr_null = [0 if x=='Positive' else x for x in label_pgr_metlong_gen_mir_no_pgr_null]
         label_pgr_metlong_gen_mir_no_pgr_null = [1 if x=='Negative' else x for x in label_pgr_metlong_gen_mir_no_pgr_null]
         label_pgr_metlong_gen_mir_no_pgr_null = [2 if x=='Indeterminate' else x for x in label_pgr_metlong_gen_mir_no_pgr_null]
         label_pgr_metlong_gen_mir_no_pgr_null = np.asarray(label_pgr_metlong_gen_mir_no_pgr_null)
         
-        label_her2_metlong_gen_mir_no_her2_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_her2_null]),7]
+        label_her2_metlong_gen_mir_no_her2_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_her2_null),7]
         label_her2_metlong_gen_mir_no_her2_null = label_her2_metlong_gen_mir_no_her2_null.tolist()
         label_her2_metlong_gen_mir_no_her2_null = [0 if x=='Positive' else x for x in label_her2_metlong_gen_mir_no_her2_null]
         label_her2_metlong_gen_mir_no_her2_null = [1 if x=='Negative' else x for x in label_her2_metlong_gen_mir_no_her2_null]
@@ -412,21 +911,21 @@ def label_cancer_type(dataset=3):
         label_her2_metlong_gen_mir_no_her2_null = [3 if x=='Equivocal' else x for x in label_her2_metlong_gen_mir_no_her2_null]
         label_her2_metlong_gen_mir_no_her2_null = np.asarray(label_her2_metlong_gen_mir_no_her2_null)
         
-        label_er_metlong_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_null]),2]
+        label_er_metlong_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_null),2]
         label_er_metlong_gen_mir_no_null = label_er_metlong_gen_mir_no_null.tolist()
         label_er_metlong_gen_mir_no_null = [0 if x=='Positive' else x for x in label_er_metlong_gen_mir_no_null]
         label_er_metlong_gen_mir_no_null = [1 if x=='Negative' else x for x in label_er_metlong_gen_mir_no_null]
         label_er_metlong_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_er_metlong_gen_mir_no_null]
         label_er_metlong_gen_mir_no_null = np.asarray(label_er_metlong_gen_mir_no_null)
         
-        label_pgr_metlong_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_null]),4]
+        label_pgr_metlong_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_null),4]
         label_pgr_metlong_gen_mir_no_null = label_pgr_metlong_gen_mir_no_null.tolist()
         label_pgr_metlong_gen_mir_no_null = [0 if x=='Positive' else x for x in label_pgr_metlong_gen_mir_no_null]
         label_pgr_metlong_gen_mir_no_null = [1 if x=='Negative' else x for x in label_pgr_metlong_gen_mir_no_null]
         label_pgr_metlong_gen_mir_no_null = [2 if x=='Indeterminate' else x for x in label_pgr_metlong_gen_mir_no_null]
         label_pgr_metlong_gen_mir_no_null = np.asarray(label_pgr_metlong_gen_mir_no_null)
         
-        label_her2_metlong_gen_mir_no_null = pat_rec[np.logical_or.reduce([pat_rec[:,0] == i for i in cases_metlong_gen_mir_no_null]),7]
+        label_her2_metlong_gen_mir_no_null = pat_rec[rows_in(pat_rec[:,0], cases_metlong_gen_mir_no_null),7]
         label_her2_metlong_gen_mir_no_null = label_her2_metlong_gen_mir_no_null.tolist()
         label_her2_metlong_gen_mir_no_null = [0 if x=='Positive' else x for x in label_her2_metlong_gen_mir_no_null]
         label_her2_metlong_gen_mir_no_null = [1 if x=='Negative' else x for x in label_her2_metlong_gen_mir_no_null]
@@ -564,183 +1063,25 @@ def input_met_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MET_TYPE)):
         os.makedirs(DATASET_INPUT_MET_TYPE)
 
-    data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-    
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_met[0]=='file_id')[0]
-    file_name_column, = np.where(data_met[0]=='file_name')[0]
-    case_id_column, = np.where(data_met[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_met[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_met = data_met[1:]
-
-    with open(TARGET_METHYLATION + "cpg.json") as f:
-        cpg = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_short_idx.json") as f:
-        cpg_in_cpg_short_idx = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_long_idx.json") as f:
-        cpg_in_cpg_long_idx = yaml.safe_load(f)
-
+    store_cases, store_met = load_store("met")
 
     # 1. Methylation ER classification
-    input_met_type_er = np.empty((0,25978), float)
-    for case in cases_met_no_er_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_type_er = np.vstack([input_met_type_er,temp])
-
-    np.save(DATASET_INPUT_MET_TYPE + 'input_met_type_er.npy', input_met_type_er)
+    store_input_matrix(DATASET_INPUT_MET_TYPE + 'input_met_type_er.npy', store_met, store_rows(store_cases, cases_met_no_er_null))
     print('input_met_type_er.npy is created')
 
 
     # 2. Methylation PGR classification
-    input_met_type_pgr = np.empty((0,25978), float)
-    for case in cases_met_no_pgr_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_type_pgr = np.vstack([input_met_type_pgr,temp])
-
-    np.save(DATASET_INPUT_MET_TYPE + 'input_met_type_pgr.npy', input_met_type_pgr)
+    store_input_matrix(DATASET_INPUT_MET_TYPE + 'input_met_type_pgr.npy', store_met, store_rows(store_cases, cases_met_no_pgr_null))
     print('input_met_type_pgr.npy is created')
 
 
     # 3. Methylation HER2 classification
-    input_met_type_her2 = np.empty((0,25978), float)
-    for case in cases_met_no_her2_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_type_her2 = np.vstack([input_met_type_her2,temp])
-
-    np.save(DATASET_INPUT_MET_TYPE + 'input_met_type_her2.npy', input_met_type_her2)
+    store_input_matrix(DATASET_INPUT_MET_TYPE + 'input_met_type_her2.npy', store_met, store_rows(store_cases, cases_met_no_her2_null))
     print('input_met_type_her2.npy is created')
 
 
     # 4. Methylation universal classification
-    input_met_type_univ = np.empty((0,25978), float)
-    for case in cases_met_no_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_type_univ = np.vstack([input_met_type_univ,temp])
-
-    np.save(DATASET_INPUT_MET_TYPE + 'input_met_type_univ.npy', input_met_type_univ)
+    store_input_matrix(DATASET_INPUT_MET_TYPE + 'input_met_type_univ.npy', store_met, store_rows(store_cases, cases_met_no_null))
     print('input_met_type_univ.npy is created')
 
 
@@ -787,186 +1128,26 @@ def input_metlong_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_METLONG_TYPE)):
         os.makedirs(DATASET_INPUT_METLONG_TYPE)
 
-    data_metlong = np.genfromtxt(TARGET_META_CSV + "methylation_long_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_metlong[0]=='file_id')[0]
-    file_name_column, = np.where(data_metlong[0]=='file_name')[0]
-    case_id_column, = np.where(data_metlong[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_metlong[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_metlong = data_metlong[1:]
+    store_cases, store_metlong = load_store("metlong")
 
     # 1. Methylation ER classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_type_er = []
-        for case in cases_metlong_no_er_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_type_er.append(temp)
-            print(str(len(input_metlong_type_er)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_' + str(i) + '.npy', input_metlong_type_er)
-        print('input_metlong_type_er_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_3.npy')
-    input_metlong_type_er = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                            np.concatenate((temp_2, temp_3), axis=0)),
-                                           axis=0)
-    np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er.npy', input_metlong_type_er)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_er.npy', store_metlong, store_rows(store_cases, cases_metlong_no_er_null))
+    print('input_metlong_type_er.npy is created')
 
 
     # 2. Methylation PGR classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_type_pgr = []
-        for case in cases_metlong_no_pgr_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_type_pgr.append(temp)
-            print(str(len(input_metlong_type_pgr)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_' + str(i) + '.npy', input_metlong_type_pgr)
-        print('input_metlong_type_pgr_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_3.npy')
-    input_metlong_type_pgr = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                             np.concatenate((temp_2, temp_3), axis=0)),
-                                            axis=0)
-    np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr.npy', input_metlong_type_pgr)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_pgr.npy', store_metlong, store_rows(store_cases, cases_metlong_no_pgr_null))
+    print('input_metlong_type_pgr.npy is created')
 
 
     # 3. Methylation HER2 classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_type_her2 = []
-        for case in cases_metlong_no_her2_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_type_her2.append(temp)
-            print(str(len(input_metlong_type_her2)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_' + str(i) + '.npy', input_metlong_type_her2)
-        print('input_metlong_type_her2_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_3.npy')
-    input_metlong_type_her2 = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                              np.concatenate((temp_2, temp_3), axis=0)),
-                                             axis=0)
-    np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2.npy', input_metlong_type_her2)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_her2.npy', store_metlong, store_rows(store_cases, cases_metlong_no_her2_null))
+    print('input_metlong_type_her2.npy is created')
 
 
     # 4. Methylation universal classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_type_univ = []
-        for case in cases_metlong_no_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_type_univ.append(temp)
-            print(str(len(input_metlong_type_univ)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_' + str(i) + '.npy', input_metlong_type_univ)
-        print('input_metlong_type_univ_' + str(i) + 'npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_3.npy')
-    input_metlong_type_univ = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                              np.concatenate((temp_2, temp_3), axis=0)),
-                                             axis=0)
-    np.save(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ.npy', input_metlong_type_univ)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_TYPE + 'input_metlong_type_univ.npy', store_metlong, store_rows(store_cases, cases_metlong_no_null))
+    print('input_metlong_type_univ.npy is created')
 
 
 
@@ -1013,226 +1194,67 @@ def input_gen_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_GEN_TYPE)):
         os.makedirs(DATASET_INPUT_GEN_TYPE)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1.a. Gene (count) ER classification
-    input_gen_count_type_er = np.empty((0,60483), int)
-    for case in cases_gen_no_er_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_count_type_er = np.vstack([input_gen_count_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_er.npy', input_gen_count_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_er.npy', store_gen_count, store_rows(store_cases, cases_gen_no_er_null))
     print('input_gen_count_type_er.npy is created')
 
 
     # 1.b. Gene (FPKM) ER classification
-    input_gen_fpkm_type_er = np.empty((0,60483), int)
-    for case in cases_gen_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkm_type_er = np.vstack([input_gen_fpkm_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_er.npy', input_gen_fpkm_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_er.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_no_er_null))
     print('input_gen_fpkm_type_er.npy is created')
 
 
     # 1.c. Gene (FPKM-UQ) ER classification
-    input_gen_fpkmuq_type_er = np.empty((0,60483), int)
-    for case in cases_gen_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkmuq_type_er = np.vstack([input_gen_fpkmuq_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_er.npy', input_gen_fpkmuq_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_er.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_no_er_null))
     print('input_gen_fpkmuq_type_er.npy is created')
 
 
     # 2.a. Gene (count) PGR classification
-    input_gen_count_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_no_pgr_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_count_type_pgr = np.vstack([input_gen_count_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_pgr.npy', input_gen_count_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_pgr.npy', store_gen_count, store_rows(store_cases, cases_gen_no_pgr_null))
     print('input_gen_count_type_pgr.npy is created')
 
 
     # 2.b. Gene (FPKM) PGR classification
-    input_gen_fpkm_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkm_type_pgr = np.vstack([input_gen_fpkm_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_pgr.npy', input_gen_fpkm_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_pgr.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_no_pgr_null))
     print('input_gen_fpkm_type_pgr.npy is created')
 
 
     # 2.c. Gene (FPKM-UQ) PGR classification
-    input_gen_fpkmuq_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkmuq_type_pgr = np.vstack([input_gen_fpkmuq_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_pgr.npy', input_gen_fpkmuq_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_pgr.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_no_pgr_null))
     print('input_gen_fpkmuq_type_pgr.npy is created')
 
 
     # 3.a. Gene (count) HER2 classification
-    input_gen_count_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_no_her2_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_count_type_her2 = np.vstack([input_gen_count_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_her2.npy', input_gen_count_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_her2.npy', store_gen_count, store_rows(store_cases, cases_gen_no_her2_null))
     print('input_gen_count_type_her2.npy is created')
 
 
     # 3.b. Gene (FPKM) HER2 classification
-    input_gen_fpkm_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkm_type_her2 = np.vstack([input_gen_fpkm_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_her2.npy', input_gen_fpkm_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_her2.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_no_her2_null))
     print('input_gen_fpkm_type_her2.npy is created')
 
 
     # 3.c. Gene (FPKM-UQ) HER2 classification
-    input_gen_fpkmuq_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkmuq_type_her2 = np.vstack([input_gen_fpkmuq_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_her2.npy', input_gen_fpkmuq_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_her2.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_no_her2_null))
     print('input_gen_fpkmuq_type_her2.npy is created')
 
 
     # 4.a. Gene (count) universal classification
-    input_gen_count_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_no_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_count_type_univ = np.vstack([input_gen_count_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_univ.npy', input_gen_count_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_count_type_univ.npy', store_gen_count, store_rows(store_cases, cases_gen_no_null))
     print('input_gen_count_type_univ.npy is created')
 
 
     # 4.b. Gene (FPKM) universal classification
-    input_gen_fpkm_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkm_type_univ = np.vstack([input_gen_fpkm_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_univ.npy', input_gen_fpkm_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkm_type_univ.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_no_null))
     print('input_gen_fpkm_type_univ.npy is created')
 
 
     # 4.c. Gene (FPKM-UQ) universal classification
-    input_gen_fpkmuq_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkmuq_type_univ = np.vstack([input_gen_fpkmuq_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_univ.npy', input_gen_fpkmuq_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_TYPE + 'input_gen_fpkmuq_type_univ.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_no_null))
     print('input_gen_fpkmuq_type_univ.npy is created')
 
 
@@ -1278,73 +1300,25 @@ def input_mir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_MIR_TYPE)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
+    store_cases, store_mir = load_store("mir")
 
     # 1. miRNA ER classification
-    input_mir_type_er = np.empty((0,1881), float)
-    for case in cases_mir_no_er_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_type_er = np.vstack([input_mir_type_er,row])
-
-    np.save(DATASET_INPUT_MIR_TYPE + 'input_mir_type_er.npy', input_mir_type_er)
+    store_input_matrix(DATASET_INPUT_MIR_TYPE + 'input_mir_type_er.npy', store_mir, store_rows(store_cases, cases_mir_no_er_null))
     print('input_mir_type_er.npy is created')
 
 
     # 2. miRNA PGR classification
-    input_mir_type_pgr = np.empty((0,1881), float)
-    for case in cases_mir_no_pgr_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_type_pgr = np.vstack([input_mir_type_pgr,row])
-
-    np.save(DATASET_INPUT_MIR_TYPE + 'input_mir_type_pgr.npy', input_mir_type_pgr)
+    store_input_matrix(DATASET_INPUT_MIR_TYPE + 'input_mir_type_pgr.npy', store_mir, store_rows(store_cases, cases_mir_no_pgr_null))
     print('input_mir_type_pgr.npy is created')
 
 
     # 3. miRNA HER2 classification
-    input_mir_type_her2 = np.empty((0,1881), float)
-    for case in cases_mir_no_her2_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_type_her2 = np.vstack([input_mir_type_her2,row])
-
-    np.save(DATASET_INPUT_MIR_TYPE + 'input_mir_type_her2.npy', input_mir_type_her2)
+    store_input_matrix(DATASET_INPUT_MIR_TYPE + 'input_mir_type_her2.npy', store_mir, store_rows(store_cases, cases_mir_no_her2_null))
     print('input_mir_type_her2.npy is created')
 
 
     # 4. miRNA universal classification
-    input_mir_type_univ = np.empty((0,1881), float)
-    for case in cases_mir_no_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_type_univ = np.vstack([input_mir_type_univ,row])
-
-    np.save(DATASET_INPUT_MIR_TYPE + 'input_mir_type_univ.npy', input_mir_type_univ)
+    store_input_matrix(DATASET_INPUT_MIR_TYPE + 'input_mir_type_univ.npy', store_mir, store_rows(store_cases, cases_mir_no_null))
     print('input_mir_type_univ.npy is created')
 
 
@@ -1398,226 +1372,67 @@ def input_gen_genmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_GEN_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_GEN_GEN_MIR_TYPE)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1.a. Gene (count) ER classification
-    input_gen_genmir_count_type_er = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_er_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_genmir_count_type_er = np.vstack([input_gen_genmir_count_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_er.npy', input_gen_genmir_count_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_er.npy', store_gen_count, store_rows(store_cases, cases_gen_mir_no_er_null))
     print('input_gen_genmir_count_type_er.npy is created')
 
 
     # 1.b. Gene (FPKM) ER classification
-    input_gen_genmir_fpkm_type_er = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkm_type_er = np.vstack([input_gen_genmir_fpkm_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_er.npy', input_gen_genmir_fpkm_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_er.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_mir_no_er_null))
     print('input_gen_genmir_fpkm_type_er.npy is created')
 
 
     # 1.c. Gene (FPKM-UQ) ER classification
-    input_gen_genmir_fpkmuq_type_er = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkmuq_type_er = np.vstack([input_gen_genmir_fpkmuq_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_er.npy', input_gen_genmir_fpkmuq_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_er.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_mir_no_er_null))
     print('input_gen_genmir_fpkmuq_type_er.npy is created')
 
 
     # 2.a. Gene (count) PGR classification
-    input_gen_genmir_count_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_pgr_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_genmir_count_type_pgr = np.vstack([input_gen_genmir_count_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_pgr.npy', input_gen_genmir_count_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_pgr.npy', store_gen_count, store_rows(store_cases, cases_gen_mir_no_pgr_null))
     print('input_gen_genmir_count_type_pgr.npy is created')
 
 
     # 2.b. Gene (FPKM) PGR classification
-    input_gen_genmir_fpkm_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkm_type_pgr = np.vstack([input_gen_genmir_fpkm_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_pgr.npy', input_gen_genmir_fpkm_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_pgr.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_mir_no_pgr_null))
     print('input_gen_genmir_fpkm_type_pgr.npy is created')
 
 
     # 2.c. Gene (FPKM-UQ) PGR classification
-    input_gen_genmir_fpkmuq_type_pgr = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkmuq_type_pgr = np.vstack([input_gen_genmir_fpkmuq_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_pgr.npy', input_gen_genmir_fpkmuq_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_pgr.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_mir_no_pgr_null))
     print('input_gen_genmir_fpkmuq_type_pgr.npy is created')
 
 
     # 3.a. Gene (count) HER2 classification
-    input_gen_genmir_count_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_her2_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_genmir_count_type_her2 = np.vstack([input_gen_genmir_count_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_her2.npy', input_gen_genmir_count_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_her2.npy', store_gen_count, store_rows(store_cases, cases_gen_mir_no_her2_null))
     print('input_gen_genmir_count_type_her2.npy is created')
 
 
     # 3.b. Gene (FPKM) HER2 classification
-    input_gen_genmir_fpkm_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkm_type_her2 = np.vstack([input_gen_genmir_fpkm_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_her2.npy', input_gen_genmir_fpkm_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_her2.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_mir_no_her2_null))
     print('input_gen_genmir_fpkm_type_her2.npy is created')
 
 
     # 3.c. Gene (FPKM-UQ) HER2 classification
-    input_gen_genmir_fpkmuq_type_her2 = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkmuq_type_her2 = np.vstack([input_gen_genmir_fpkmuq_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_her2.npy', input_gen_genmir_fpkmuq_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_her2.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_mir_no_her2_null))
     print('input_gen_genmir_fpkmuq_type_her2.npy is created')
 
 
     # 4.a. Gene (count) universal classification
-    input_gen_genmir_count_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_genmir_count_type_univ = np.vstack([input_gen_genmir_count_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_univ.npy', input_gen_genmir_count_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_count_type_univ.npy', store_gen_count, store_rows(store_cases, cases_gen_mir_no_null))
     print('input_gen_genmir_count_type_univ.npy is created')
 
 
     # 4.b. Gene (FPKM) universal classification
-    input_gen_genmir_fpkm_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkm_type_univ = np.vstack([input_gen_genmir_fpkm_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_univ.npy', input_gen_genmir_fpkm_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkm_type_univ.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_mir_no_null))
     print('input_gen_genmir_fpkm_type_univ.npy is created')
 
 
     # 4.c. Gene (FPKM-UQ) universal classification
-    input_gen_genmir_fpkmuq_type_univ = np.empty((0,60483), int)
-    for case in cases_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkmuq_type_univ = np.vstack([input_gen_genmir_fpkmuq_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_univ.npy', input_gen_genmir_fpkmuq_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_TYPE + 'input_gen_genmir_fpkmuq_type_univ.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_mir_no_null))
     print('input_gen_genmir_fpkmuq_type_univ.npy is created')
 
 
@@ -1669,73 +1484,25 @@ def input_mir_genmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MIR_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_MIR_GEN_MIR_TYPE)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
+    store_cases, store_mir = load_store("mir")
 
     # 1. miRNA ER classification
-    input_mir_genmir_type_er = np.empty((0,1881), float)
-    for case in cases_gen_mir_no_er_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_genmir_type_er = np.vstack([input_mir_genmir_type_er,row])
-
-    np.save(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_er.npy', input_mir_genmir_type_er)
+    store_input_matrix(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_er.npy', store_mir, store_rows(store_cases, cases_gen_mir_no_er_null))
     print('input_mir_genmir_type_er.npy is created')
 
 
     # 2. miRNA PGR classification
-    input_mir_genmir_type_pgr = np.empty((0,1881), float)
-    for case in cases_gen_mir_no_pgr_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_genmir_type_pgr = np.vstack([input_mir_genmir_type_pgr,row])
-
-    np.save(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_pgr.npy', input_mir_genmir_type_pgr)
+    store_input_matrix(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_pgr.npy', store_mir, store_rows(store_cases, cases_gen_mir_no_pgr_null))
     print('input_mir_genmir_type_pgr.npy is created')
 
 
     # 3. miRNA HER2 classification
-    input_mir_genmir_type_her2 = np.empty((0,1881), float)
-    for case in cases_gen_mir_no_her2_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_genmir_type_her2 = np.vstack([input_mir_genmir_type_her2,row])
-
-    np.save(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_her2.npy', input_mir_genmir_type_her2)
+    store_input_matrix(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_her2.npy', store_mir, store_rows(store_cases, cases_gen_mir_no_her2_null))
     print('input_mir_genmir_type_her2.npy is created')
 
 
     # 4. miRNA universal classification
-    input_mir_genmir_type_univ = np.empty((0,1881), float)
-    for case in cases_gen_mir_no_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_genmir_type_univ = np.vstack([input_mir_genmir_type_univ,row])
-
-    np.save(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_univ.npy', input_mir_genmir_type_univ)
+    store_input_matrix(DATASET_INPUT_MIR_GEN_MIR_TYPE + 'input_mir_genmir_type_univ.npy', store_mir, store_rows(store_cases, cases_gen_mir_no_null))
     print('input_mir_genmir_type_univ.npy is created')
 
 
@@ -1790,183 +1557,25 @@ def input_met_metgenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MET_MET_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_MET_MET_GEN_MIR_TYPE)
 
-    data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-    
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_met[0]=='file_id')[0]
-    file_name_column, = np.where(data_met[0]=='file_name')[0]
-    case_id_column, = np.where(data_met[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_met[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_met = data_met[1:]
-
-    with open(TARGET_METHYLATION + "cpg.json") as f:
-        cpg = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_short_idx.json") as f:
-        cpg_in_cpg_short_idx = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_long_idx.json") as f:
-        cpg_in_cpg_long_idx = yaml.safe_load(f)
-
+    store_cases, store_met = load_store("met")
 
     # 1. Methylation ER classification
-    input_met_metgenmir_type_er = np.empty((0,25978), float)
-    for case in cases_met_gen_mir_no_er_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_metgenmir_type_er = np.vstack([input_met_metgenmir_type_er,temp])
-
-    np.save(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_er.npy', input_met_metgenmir_type_er)
+    store_input_matrix(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_er.npy', store_met, store_rows(store_cases, cases_met_gen_mir_no_er_null))
     print('input_met_metgenmir_type_er.npy is created')
 
 
     # 2. Methylation PGR classification
-    input_met_metgenmir_type_pgr = np.empty((0,25978), float)
-    for case in cases_met_gen_mir_no_pgr_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_metgenmir_type_pgr = np.vstack([input_met_metgenmir_type_pgr,temp])
-
-    np.save(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_pgr.npy', input_met_metgenmir_type_pgr)
+    store_input_matrix(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_pgr.npy', store_met, store_rows(store_cases, cases_met_gen_mir_no_pgr_null))
     print('input_met_metgenmir_type_pgr.npy is created')
 
 
     # 3. Methylation HER2 classification
-    input_met_metgenmir_type_her2 = np.empty((0,25978), float)
-    for case in cases_met_gen_mir_no_her2_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_metgenmir_type_her2 = np.vstack([input_met_metgenmir_type_her2,temp])
-
-    np.save(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_her2.npy', input_met_metgenmir_type_her2)
+    store_input_matrix(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_her2.npy', store_met, store_rows(store_cases, cases_met_gen_mir_no_her2_null))
     print('input_met_metgenmir_type_her2.npy is created')
 
 
     # 4. Methylation universal classification
-    input_met_metgenmir_type_univ = np.empty((0,25978), float)
-    for case in cases_met_gen_mir_no_null:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_metgenmir_type_univ = np.vstack([input_met_metgenmir_type_univ,temp])
-
-    np.save(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_univ.npy', input_met_metgenmir_type_univ)
+    store_input_matrix(DATASET_INPUT_MET_MET_GEN_MIR_TYPE + 'input_met_metgenmir_type_univ.npy', store_met, store_rows(store_cases, cases_met_gen_mir_no_null))
     print('input_met_metgenmir_type_univ.npy is created')
 
 
@@ -2022,226 +1631,67 @@ def input_gen_metgenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
-
-    # 1.a. Gene (count) ER classification
-    input_gen_metgenmir_count_type_er = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_er_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metgenmir_count_type_er = np.vstack([input_gen_metgenmir_count_type_er,row])
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_er.npy', input_gen_metgenmir_count_type_er)
+    # 1.a. Gene (count) ER classification
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_er.npy', store_gen_count, store_rows(store_cases, cases_met_gen_mir_no_er_null))
     print('input_gen_metgenmir_count_type_er.npy is created')
 
 
     # 1.b. Gene (FPKM) ER classification
-    input_gen_metgenmir_fpkm_type_er = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkm_type_er = np.vstack([input_gen_metgenmir_fpkm_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_er.npy', input_gen_metgenmir_fpkm_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_er.npy', store_gen_fpkm, store_rows(store_cases, cases_met_gen_mir_no_er_null))
     print('input_gen_metgenmir_fpkm_type_er.npy is created')
 
 
     # 1.c. Gene (FPKM-UQ) ER classification
-    input_gen_metgenmir_fpkmuq_type_er = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkmuq_type_er = np.vstack([input_gen_metgenmir_fpkmuq_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_er.npy', input_gen_metgenmir_fpkmuq_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_er.npy', store_gen_fpkmuq, store_rows(store_cases, cases_met_gen_mir_no_er_null))
     print('input_gen_metgenmir_fpkmuq_type_er.npy is created')
 
 
     # 2.a. Gene (count) PGR classification
-    input_gen_metgenmir_count_type_pgr = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_pgr_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metgenmir_count_type_pgr = np.vstack([input_gen_metgenmir_count_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_pgr.npy', input_gen_metgenmir_count_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_pgr.npy', store_gen_count, store_rows(store_cases, cases_met_gen_mir_no_pgr_null))
     print('input_gen_metgenmir_count_type_pgr.npy is created')
 
 
     # 2.b. Gene (FPKM) PGR classification
-    input_gen_metgenmir_fpkm_type_pgr = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkm_type_pgr = np.vstack([input_gen_metgenmir_fpkm_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_pgr.npy', input_gen_metgenmir_fpkm_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_pgr.npy', store_gen_fpkm, store_rows(store_cases, cases_met_gen_mir_no_pgr_null))
     print('input_gen_metgenmir_fpkm_type_pgr.npy is created')
 
 
     # 2.c. Gene (FPKM-UQ) PGR classification
-    input_gen_metgenmir_fpkmuq_type_pgr = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkmuq_type_pgr = np.vstack([input_gen_metgenmir_fpkmuq_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_pgr.npy', input_gen_metgenmir_fpkmuq_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_pgr.npy', store_gen_fpkmuq, store_rows(store_cases, cases_met_gen_mir_no_pgr_null))
     print('input_gen_metgenmir_fpkmuq_type_pgr.npy is created')
 
 
     # 3.a. Gene (count) HER2 classification
-    input_gen_metgenmir_count_type_her2 = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_her2_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metgenmir_count_type_her2 = np.vstack([input_gen_metgenmir_count_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_her2.npy', input_gen_metgenmir_count_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_her2.npy', store_gen_count, store_rows(store_cases, cases_met_gen_mir_no_her2_null))
     print('input_gen_metgenmir_count_type_her2.npy is created')
 
 
     # 3.b. Gene (FPKM) HER2 classification
-    input_gen_metgenmir_fpkm_type_her2 = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkm_type_her2 = np.vstack([input_gen_metgenmir_fpkm_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_her2.npy', input_gen_metgenmir_fpkm_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_her2.npy', store_gen_fpkm, store_rows(store_cases, cases_met_gen_mir_no_her2_null))
     print('input_gen_metgenmir_fpkm_type_her2.npy is created')
 
 
     # 3.c. Gene (FPKM-UQ) HER2 classification
-    input_gen_metgenmir_fpkmuq_type_her2 = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkmuq_type_her2 = np.vstack([input_gen_metgenmir_fpkmuq_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_her2.npy', input_gen_metgenmir_fpkmuq_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_her2.npy', store_gen_fpkmuq, store_rows(store_cases, cases_met_gen_mir_no_her2_null))
     print('input_gen_metgenmir_fpkmuq_type_her2.npy is created')
 
 
     # 4.a. Gene (count) universal classification
-    input_gen_metgenmir_count_type_univ = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metgenmir_count_type_univ = np.vstack([input_gen_metgenmir_count_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_univ.npy', input_gen_metgenmir_count_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_count_type_univ.npy', store_gen_count, store_rows(store_cases, cases_met_gen_mir_no_null))
     print('input_gen_metgenmir_count_type_univ.npy is created')
 
 
     # 4.b. Gene (FPKM) universal classification
-    input_gen_metgenmir_fpkm_type_univ = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkm_type_univ = np.vstack([input_gen_metgenmir_fpkm_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_univ.npy', input_gen_metgenmir_fpkm_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkm_type_univ.npy', store_gen_fpkm, store_rows(store_cases, cases_met_gen_mir_no_null))
     print('input_gen_metgenmir_fpkm_type_univ.npy is created')
 
 
     # 4.c. Gene (FPKM-UQ) universal classification
-    input_gen_metgenmir_fpkmuq_type_univ = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkmuq_type_univ = np.vstack([input_gen_metgenmir_fpkmuq_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_univ.npy', input_gen_metgenmir_fpkmuq_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_TYPE + 'input_gen_metgenmir_fpkmuq_type_univ.npy', store_gen_fpkmuq, store_rows(store_cases, cases_met_gen_mir_no_null))
     print('input_gen_metgenmir_fpkmuq_type_univ.npy is created')
 
 
@@ -2295,73 +1745,25 @@ def input_mir_metgenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
+    store_cases, store_mir = load_store("mir")
 
     # 1. miRNA ER classification
-    input_mir_metgenmir_type_er = np.empty((0,1881), float)
-    for case in cases_met_gen_mir_no_er_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metgenmir_type_er = np.vstack([input_mir_metgenmir_type_er,row])
-
-    np.save(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_er.npy', input_mir_metgenmir_type_er)
+    store_input_matrix(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_er.npy', store_mir, store_rows(store_cases, cases_met_gen_mir_no_er_null))
     print('input_mir_metgenmir_type_er.npy is created')
 
 
     # 2. miRNA PGR classification
-    input_mir_metgenmir_type_pgr = np.empty((0,1881), float)
-    for case in cases_met_gen_mir_no_pgr_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metgenmir_type_pgr = np.vstack([input_mir_metgenmir_type_pgr,row])
-
-    np.save(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_pgr.npy', input_mir_metgenmir_type_pgr)
+    store_input_matrix(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_pgr.npy', store_mir, store_rows(store_cases, cases_met_gen_mir_no_pgr_null))
     print('input_mir_metgenmir_type_pgr.npy is created')
 
 
     # 3. miRNA HER2 classification
-    input_mir_metgenmir_type_her2 = np.empty((0,1881), float)
-    for case in cases_met_gen_mir_no_her2_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metgenmir_type_her2 = np.vstack([input_mir_metgenmir_type_her2,row])
-
-    np.save(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_her2.npy', input_mir_metgenmir_type_her2)
+    store_input_matrix(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_her2.npy', store_mir, store_rows(store_cases, cases_met_gen_mir_no_her2_null))
     print('input_mir_metgenmir_type_her2.npy is created')
 
 
     # 4. miRNA universal classification
-    input_mir_metgenmir_type_univ = np.empty((0,1881), float)
-    for case in cases_met_gen_mir_no_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metgenmir_type_univ = np.vstack([input_mir_metgenmir_type_univ,row])
-
-    np.save(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_univ.npy', input_mir_metgenmir_type_univ)
+    store_input_matrix(DATASET_INPUT_MIR_MET_GEN_MIR_TYPE + 'input_mir_metgenmir_type_univ.npy', store_mir, store_rows(store_cases, cases_met_gen_mir_no_null))
     print('input_mir_metgenmir_type_univ.npy is created')
 
 
@@ -2418,186 +1820,26 @@ def input_metlong_metlonggenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE)
 
-    data_metlong = np.genfromtxt(TARGET_META_CSV + "methylation_long_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_metlong[0]=='file_id')[0]
-    file_name_column, = np.where(data_metlong[0]=='file_name')[0]
-    case_id_column, = np.where(data_metlong[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_metlong[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_metlong = data_metlong[1:]
+    store_cases, store_metlong = load_store("metlong")
 
     # 1. Methylation ER classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_metlonggenmir_type_er = []
-        for case in cases_metlong_gen_mir_no_er_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_metlonggenmir_type_er.append(temp)
-            print(str(len(input_metlong_metlonggenmir_type_er)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_' + str(i) + '.npy', input_metlong_metlonggenmir_type_er)
-        print('input_metlong_metlonggenmir_type_er_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_3.npy')
-    input_metlong_metlonggenmir_type_er = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                                          np.concatenate((temp_2, temp_3), axis=0)),
-                                                         axis=0)
-    np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er.npy', input_metlong_metlonggenmir_type_er)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_er.npy', store_metlong, store_rows(store_cases, cases_metlong_gen_mir_no_er_null))
+    print('input_metlong_metlonggenmir_type_er.npy is created')
 
 
     # 2. Methylation PGR classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_metlonggenmir_type_pgr = []
-        for case in cases_metlong_gen_mir_no_pgr_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_metlonggenmir_type_pgr.append(temp)
-            print(str(len(input_metlong_metlonggenmir_type_pgr)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_' + str(i) + '.npy', input_metlong_metlonggenmir_type_pgr)
-        print('input_metlong_metlonggenmir_type_pgr_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_3.npy')
-    input_metlong_metlonggenmir_type_pgr = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                                           np.concatenate((temp_2, temp_3), axis=0)),
-                                                          axis=0)
-    np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr.npy', input_metlong_metlonggenmir_type_pgr)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_pgr.npy', store_metlong, store_rows(store_cases, cases_metlong_gen_mir_no_pgr_null))
+    print('input_metlong_metlonggenmir_type_pgr.npy is created')
 
 
     # 3. Methylation HER2 classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_metlonggenmir_type_her2 = []
-        for case in cases_metlong_gen_mir_no_her2_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_metlonggenmir_type_her2.append(temp)
-            print(str(len(input_metlong_metlonggenmir_type_her2)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_' + str(i) + '.npy', input_metlong_metlonggenmir_type_her2)
-        print('input_metlong_metlonggenmir_type_her2_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_3.npy')
-    input_metlong_metlonggenmir_type_her2 = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                                            np.concatenate((temp_2, temp_3), axis=0)),
-                                                           axis=0)
-    np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2.npy', input_metlong_metlonggenmir_type_her2)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_her2.npy', store_metlong, store_rows(store_cases, cases_metlong_gen_mir_no_her2_null))
+    print('input_metlong_metlonggenmir_type_her2.npy is created')
 
 
     # 4. Methylation universal classification
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_metlonggenmir_type_univ = []
-        for case in cases_metlong_gen_mir_no_null[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_metlonggenmir_type_univ.append(temp)
-            print(str(len(input_metlong_metlonggenmir_type_univ)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_' + str(i) + '.npy', input_metlong_metlonggenmir_type_univ)
-        print('input_metlong_metlonggenmir_type_univ_' + str(i) + 'npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_3.npy')
-    input_metlong_metlonggenmir_type_univ = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                                            np.concatenate((temp_2, temp_3), axis=0)),
-                                                           axis=0)
-    np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ.npy', input_metlong_metlonggenmir_type_univ)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_METLONG_GEN_MIR_TYPE + 'input_metlong_metlonggenmir_type_univ.npy', store_metlong, store_rows(store_cases, cases_metlong_gen_mir_no_null))
+    print('input_metlong_metlonggenmir_type_univ.npy is created')
 
 
 
@@ -2654,226 +1896,67 @@ def input_gen_metlonggenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1.a. Gene (count) ER classification
-    input_gen_metlonggenmir_count_type_er = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_er_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metlonggenmir_count_type_er = np.vstack([input_gen_metlonggenmir_count_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_er.npy', input_gen_metlonggenmir_count_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_er.npy', store_gen_count, store_rows(store_cases, cases_metlong_gen_mir_no_er_null))
     print('input_gen_metlonggenmir_count_type_er.npy is created')
 
 
     # 1.b. Gene (FPKM) ER classification
-    input_gen_metlonggenmir_fpkm_type_er = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkm_type_er = np.vstack([input_gen_metlonggenmir_fpkm_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_er.npy', input_gen_metlonggenmir_fpkm_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_er.npy', store_gen_fpkm, store_rows(store_cases, cases_metlong_gen_mir_no_er_null))
     print('input_gen_metlonggenmir_fpkm_type_er.npy is created')
 
 
     # 1.c. Gene (FPKM-UQ) ER classification
-    input_gen_metlonggenmir_fpkmuq_type_er = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_er_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkmuq_type_er = np.vstack([input_gen_metlonggenmir_fpkmuq_type_er,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_er.npy', input_gen_metlonggenmir_fpkmuq_type_er)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_er.npy', store_gen_fpkmuq, store_rows(store_cases, cases_metlong_gen_mir_no_er_null))
     print('input_gen_metlonggenmir_fpkmuq_type_er.npy is created')
 
 
     # 2.a. Gene (count) PGR classification
-    input_gen_metlonggenmir_count_type_pgr = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_pgr_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metlonggenmir_count_type_pgr = np.vstack([input_gen_metlonggenmir_count_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_pgr.npy', input_gen_metlonggenmir_count_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_pgr.npy', store_gen_count, store_rows(store_cases, cases_metlong_gen_mir_no_pgr_null))
     print('input_gen_metlonggenmir_count_type_pgr.npy is created')
 
 
     # 2.b. Gene (FPKM) PGR classification
-    input_gen_metlonggenmir_fpkm_type_pgr = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkm_type_pgr = np.vstack([input_gen_metlonggenmir_fpkm_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_pgr.npy', input_gen_metlonggenmir_fpkm_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_pgr.npy', store_gen_fpkm, store_rows(store_cases, cases_metlong_gen_mir_no_pgr_null))
     print('input_gen_metlonggenmir_fpkm_type_pgr.npy is created')
 
 
     # 2.c. Gene (FPKM-UQ) PGR classification
-    input_gen_metlonggenmir_fpkmuq_type_pgr = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_pgr_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkmuq_type_pgr = np.vstack([input_gen_metlonggenmir_fpkmuq_type_pgr,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_pgr.npy', input_gen_metlonggenmir_fpkmuq_type_pgr)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_pgr.npy', store_gen_fpkmuq, store_rows(store_cases, cases_metlong_gen_mir_no_pgr_null))
     print('input_gen_metlonggenmir_fpkmuq_type_pgr.npy is created')
 
 
     # 3.a. Gene (count) HER2 classification
-    input_gen_metlonggenmir_count_type_her2 = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_her2_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metlonggenmir_count_type_her2 = np.vstack([input_gen_metlonggenmir_count_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_her2.npy', input_gen_metlonggenmir_count_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_her2.npy', store_gen_count, store_rows(store_cases, cases_metlong_gen_mir_no_her2_null))
     print('input_gen_metlonggenmir_count_type_her2.npy is created')
 
 
     # 3.b. Gene (FPKM) HER2 classification
-    input_gen_metlonggenmir_fpkm_type_her2 = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkm_type_her2 = np.vstack([input_gen_metlonggenmir_fpkm_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_her2.npy', input_gen_metlonggenmir_fpkm_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_her2.npy', store_gen_fpkm, store_rows(store_cases, cases_metlong_gen_mir_no_her2_null))
     print('input_gen_metlonggenmir_fpkm_type_her2.npy is created')
 
 
     # 3.c. Gene (FPKM-UQ) HER2 classification
-    input_gen_metlonggenmir_fpkmuq_type_her2 = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_her2_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkmuq_type_her2 = np.vstack([input_gen_metlonggenmir_fpkmuq_type_her2,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_her2.npy', input_gen_metlonggenmir_fpkmuq_type_her2)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkmuq_type_her2.npy', store_gen_fpkmuq, store_rows(store_cases, cases_metlong_gen_mir_no_her2_null))
     print('input_gen_metlonggenmir_fpkmuq_type_her2.npy is created')
 
 
     # 4.a. Gene (count) universal classification
-    input_gen_metlonggenmir_count_type_univ = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_null:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metlonggenmir_count_type_univ = np.vstack([input_gen_metlonggenmir_count_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_univ.npy', input_gen_metlonggenmir_count_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_count_type_univ.npy', store_gen_count, store_rows(store_cases, cases_metlong_gen_mir_no_null))
     print('input_gen_metlonggenmir_count_type_univ.npy is created')
 
 
     # 4.b. Gene (FPKM) universal classification
-    input_gen_metlonggenmir_fpkm_type_univ = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkm_type_univ = np.vstack([input_gen_metlonggenmir_fpkm_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_univ.npy', input_gen_metlonggenmir_fpkm_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_metlonggenmir_fpkm_type_univ.npy', store_gen_fpkm, store_rows(store_cases, cases_metlong_gen_mir_no_null))
     print('input_gen_metlonggenmir_fpkm_type_univ.npy is created')
 
 
     # 4.c. Gene (FPKM-UQ) universal classification
-    input_gen_metlonggenmir_fpkmuq_type_univ = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_no_null:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkmuq_type_univ = np.vstack([input_gen_metlonggenmir_fpkmuq_type_univ,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_fpkmuq_type_univ.npy', input_gen_metlonggenmir_fpkmuq_type_univ)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_TYPE + 'input_gen_fpkmuq_type_univ.npy', store_gen_fpkmuq, store_rows(store_cases, cases_metlong_gen_mir_no_null))
     print('input_gen_metlonggenmir_fpkmuq_type_univ.npy is created')
 
 
@@ -2929,73 +2012,25 @@ def input_mir_metlonggenmir_cancer_type():
     if not(os.path.isdir(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE)):
         os.makedirs(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
+    store_cases, store_mir = load_store("mir")
 
     # 1. miRNA ER classification
-    input_mir_metlonggenmir_type_er = np.empty((0,1881), float)
-    for case in cases_metlong_gen_mir_no_er_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metlonggenmir_type_er = np.vstack([input_mir_metlonggenmir_type_er,row])
-
-    np.save(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_er.npy', input_mir_metlonggenmir_type_er)
+    store_input_matrix(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_er.npy', store_mir, store_rows(store_cases, cases_metlong_gen_mir_no_er_null))
     print('input_mir_metlonggenmir_type_er.npy is created')
 
 
     # 2. miRNA PGR classification
-    input_mir_metlonggenmir_type_pgr = np.empty((0,1881), float)
-    for case in cases_metlong_gen_mir_no_pgr_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metlonggenmir_type_pgr = np.vstack([input_mir_metlonggenmir_type_pgr,row])
-
-    np.save(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_pgr.npy', input_mir_metlonggenmir_type_pgr)
+    store_input_matrix(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_pgr.npy', store_mir, store_rows(store_cases, cases_metlong_gen_mir_no_pgr_null))
     print('input_mir_metlonggenmir_type_pgr.npy is created')
 
 
     # 3. miRNA HER2 classification
-    input_mir_metlonggenmir_type_her2 = np.empty((0,1881), float)
-    for case in cases_metlong_gen_mir_no_her2_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metlonggenmir_type_her2 = np.vstack([input_mir_metlonggenmir_type_her2,row])
-
-    np.save(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_her2.npy', input_mir_metlonggenmir_type_her2)
+    store_input_matrix(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_her2.npy', store_mir, store_rows(store_cases, cases_metlong_gen_mir_no_her2_null))
     print('input_mir_metlonggenmir_type_her2.npy is created')
 
 
     # 4. miRNA universal classification
-    input_mir_metlonggenmir_type_univ = np.empty((0,1881), float)
-    for case in cases_metlong_gen_mir_no_null:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metlonggenmir_type_univ = np.vstack([input_mir_metlonggenmir_type_univ,row])
-
-    np.save(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_univ.npy', input_mir_metlonggenmir_type_univ)
+    store_input_matrix(DATASET_INPUT_MIR_METLONG_GEN_MIR_TYPE + 'input_mir_metlonggenmir_type_univ.npy', store_mir, store_rows(store_cases, cases_metlong_gen_mir_no_null))
     print('input_mir_metlonggenmir_type_univ.npy is created')
 
 
@@ -3078,26 +2113,26 @@ def label_survival(dataset=3):
     # LABELS OF SURVIVAL RATE REGRESSION #
     ######################################
     if (dataset==1) or (dataset==5):
-        label_sur_met = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_met_sur]),survival_estimate_column]
+        label_sur_met = sur[rows_in(sur[:,0], cases_met_sur),survival_estimate_column]
         label_sur_met = label_sur_met.astype(np.float)
-        label_sur_metlong = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_metlong_sur]),survival_estimate_column]
+        label_sur_metlong = sur[rows_in(sur[:,0], cases_metlong_sur),survival_estimate_column]
         label_sur_metlong = label_sur_metlong.astype(np.float)
     
     if (dataset==2) or (dataset==4) or (dataset==5):
-        label_sur_gen = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_gen_sur]),survival_estimate_column]
+        label_sur_gen = sur[rows_in(sur[:,0], cases_gen_sur),survival_estimate_column]
         label_sur_gen = label_sur_gen.astype(np.float)
     
     if (dataset==3) or (dataset==4) or (dataset==5):
-        label_sur_mir = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_mir_sur]),survival_estimate_column]
+        label_sur_mir = sur[rows_in(sur[:,0], cases_mir_sur),survival_estimate_column]
         label_sur_mir = label_sur_mir.astype(np.float)
     
     if (dataset==4) or (dataset==5):
-        label_sur_gen_mir = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_gen_mir_sur]),survival_estimate_column]
+        label_sur_gen_mir = sur[rows_in(sur[:,0], cases_gen_mir_sur),survival_estimate_column]
         label_sur_gen_mir = label_sur_gen_mir.astype(np.float)
     
     if (dataset==5):
-        label_sur_met_gen_mir = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_met_gen_mir_sur]),survival_estimate_column]
-        label_sur_metlong_gen_mir = sur[np.logical_or.reduce([sur[:,0] == i for i in cases_metlong_gen_mir_sur]),survival_estimate_column]
+        label_sur_met_gen_mir = sur[rows_in(sur[:,0], cases_met_gen_mir_sur),survival_estimate_column]
+        label_sur_metlong_gen_mir = sur[rows_in(sur[:,0], cases_metlong_gen_mir_sur),survival_estimate_column]
         label_sur_met_gen_mir = label_sur_met_gen_mir.astype(np.float)
         label_sur_metlong_gen_mir = label_sur_metlong_gen_mir.astype(np.float)
 
@@ -3189,62 +2224,9 @@ def input_met_survival():
     if not(os.path.isdir(DATASET_INPUT_MET_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MET_SURVIVAL)
 
-    data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-    
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_met[0]=='file_id')[0]
-    file_name_column, = np.where(data_met[0]=='file_name')[0]
-    case_id_column, = np.where(data_met[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_met[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_met = data_met[1:]
-
-    with open(TARGET_METHYLATION + "cpg.json") as f:
-        cpg = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_short_idx.json") as f:
-        cpg_in_cpg_short_idx = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_long_idx.json") as f:
-        cpg_in_cpg_long_idx = yaml.safe_load(f)
-
-
-    input_met_sur = np.empty((0,25978), float)
-    for case in cases_met_sur:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-
-                temp = np.append(temp, beta)
+    store_cases, store_met = load_store("met")
 
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_sur = np.vstack([input_met_sur,temp])
-
-    np.save(DATASET_INPUT_MET_SURVIVAL + 'input_met_sur.npy', input_met_sur)
+    store_input_matrix(DATASET_INPUT_MET_SURVIVAL + 'input_met_sur.npy', store_met, store_rows(store_cases, cases_met_sur))
     print('input_met_sur.npy is created')
 
 
@@ -3291,56 +2273,10 @@ def input_metlong_survival():
     if not(os.path.isdir(DATASET_INPUT_METLONG_SURVIVAL)):
         os.makedirs(DATASET_INPUT_METLONG_SURVIVAL)
 
-    data_metlong = np.genfromtxt(TARGET_META_CSV + "methylation_long_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_metlong[0]=='file_id')[0]
-    file_name_column, = np.where(data_metlong[0]=='file_name')[0]
-    case_id_column, = np.where(data_metlong[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_metlong[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_metlong = data_metlong[1:]
-
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_sur = []
-        for case in cases_metlong_sur[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_sur.append(temp)
-            print(str(len(input_metlong_sur)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_' + str(i) + '.npy', input_metlong_sur)
-        print('input_metlong_sur_' + str(i) + '.npy is created')
+    store_cases, store_metlong = load_store("metlong")
 
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_3.npy')
-    input_metlong_sur = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                        np.concatenate((temp_2, temp_3), axis=0)),
-                                       axis=0)
-    np.save(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur.npy', input_metlong_sur)
-
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_SURVIVAL + 'input_metlong_sur.npy', store_metlong, store_rows(store_cases, cases_metlong_sur))
+    print('input_metlong_sur.npy is created')
 
 
 
@@ -3387,67 +2323,22 @@ def input_gen_survival():
     if not(os.path.isdir(DATASET_INPUT_GEN_SURVIVAL)):
         os.makedirs(DATASET_INPUT_GEN_SURVIVAL)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1. Gene (count) survival regression
-    input_gen_count_sur = np.empty((0,60483), int)
-    for case in cases_gen_sur:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_count_sur = np.vstack([input_gen_count_sur,row])
-
-    np.save(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_count_sur.npy', input_gen_count_sur)
+    store_input_matrix(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_count_sur.npy', store_gen_count, store_rows(store_cases, cases_gen_sur))
     print('input_gen_count_sur.npy is created')
 
 
     # 2. Gene (FPKM) survival regression
-    input_gen_fpkm_sur = np.empty((0,60483), int)
-    for case in cases_gen_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkm_sur = np.vstack([input_gen_fpkm_sur,row])
-
-    np.save(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_fpkm_sur.npy', input_gen_fpkm_sur)
+    store_input_matrix(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_fpkm_sur.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_sur))
     print('input_gen_fpkm_sur.npy is created')
 
 
     # 3. Gene (FPKM-UQ) survival regression
-    input_gen_fpkmuq_sur = np.empty((0,60483), int)
-    for case in cases_gen_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_fpkmuq_sur = np.vstack([input_gen_fpkmuq_sur,row])
-
-    np.save(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_fpkmuq_sur.npy', input_gen_fpkmuq_sur)
+    store_input_matrix(DATASET_INPUT_GEN_SURVIVAL + 'input_gen_fpkmuq_sur.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_sur))
     print('input_gen_fpkmuq_sur.npy is created')
 
 
@@ -3493,27 +2384,9 @@ def input_mir_survival():
     if not(os.path.isdir(DATASET_INPUT_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MIR_SURVIVAL)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
-
-    input_mir_sur = np.empty((0,1881), float)
-    for case in cases_mir_sur:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_sur = np.vstack([input_mir_sur,row])
+    store_cases, store_mir = load_store("mir")
 
-    np.save(DATASET_INPUT_MIR_SURVIVAL + 'input_mir_sur.npy', input_mir_sur)
+    store_input_matrix(DATASET_INPUT_MIR_SURVIVAL + 'input_mir_sur.npy', store_mir, store_rows(store_cases, cases_mir_sur))
     print('input_mir_sur.npy is created')
 
 
@@ -3567,67 +2440,22 @@ def input_gen_genmir_survival():
     if not(os.path.isdir(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1. Gene (count) survival regression
-    input_gen_genmir_count_sur = np.empty((0,60483), int)
-    for case in cases_gen_mir_sur:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_genmir_count_sur = np.vstack([input_gen_genmir_count_sur,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_count_sur.npy', input_gen_genmir_count_sur)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_count_sur.npy', store_gen_count, store_rows(store_cases, cases_gen_mir_sur))
     print('input_gen_genmir_count_sur.npy is created')
 
 
     # 2. Gene (FPKM) survival regression
-    input_gen_genmir_fpkm_sur = np.empty((0,60483), int)
-    for case in cases_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkm_sur = np.vstack([input_gen_genmir_fpkm_sur,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_fpkm_sur.npy', input_gen_genmir_fpkm_sur)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_fpkm_sur.npy', store_gen_fpkm, store_rows(store_cases, cases_gen_mir_sur))
     print('input_gen_genmir_fpkm_sur.npy is created')
 
 
     # 3. Gene (FPKM-UQ) survival regression
-    input_gen_genmir_fpkmuq_sur = np.empty((0,60483), int)
-    for case in cases_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_genmir_fpkmuq_sur = np.vstack([input_gen_genmir_fpkmuq_sur,row])
-
-    np.save(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_fpkmuq_sur.npy', input_gen_genmir_fpkmuq_sur)
+    store_input_matrix(DATASET_INPUT_GEN_GEN_MIR_SURVIVAL + 'input_gen_genmir_fpkmuq_sur.npy', store_gen_fpkmuq, store_rows(store_cases, cases_gen_mir_sur))
     print('input_gen_genmir_fpkmuq_sur.npy is created')
 
 
@@ -3679,27 +2507,9 @@ def input_mir_genmir_survival():
     if not(os.path.isdir(DATASET_INPUT_MIR_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MIR_GEN_MIR_SURVIVAL)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
+    store_cases, store_mir = load_store("mir")
 
-    input_mir_genmir_sur = np.empty((0,1881), float)
-    for case in cases_gen_mir_sur:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_genmir_sur = np.vstack([input_mir_genmir_sur,row])
-
-    np.save(DATASET_INPUT_MIR_GEN_MIR_SURVIVAL + 'input_mir_genmir_sur.npy', input_mir_genmir_sur)
+    store_input_matrix(DATASET_INPUT_MIR_GEN_MIR_SURVIVAL + 'input_mir_genmir_sur.npy', store_mir, store_rows(store_cases, cases_gen_mir_sur))
     print('input_mir_genmir_sur.npy is created')
 
 
@@ -3754,62 +2564,9 @@ def input_met_metgenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_MET_MET_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MET_MET_GEN_MIR_SURVIVAL)
 
-    data_met = np.genfromtxt(TARGET_META_CSV + "methylation_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-    
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_met[0]=='file_id')[0]
-    file_name_column, = np.where(data_met[0]=='file_name')[0]
-    case_id_column, = np.where(data_met[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_met[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_met = data_met[1:]
-
-    with open(TARGET_METHYLATION + "cpg.json") as f:
-        cpg = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_short_idx.json") as f:
-        cpg_in_cpg_short_idx = yaml.safe_load(f)
-
-    with open(TARGET_METHYLATION + "cpg_in_cpg_long_idx.json") as f:
-        cpg_in_cpg_long_idx = yaml.safe_load(f)
-
-
-    input_met_metgenmir_sur = np.empty((0,25978), float)
-    for case in cases_met_gen_mir_sur:
-        file_id = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_met[np.intersect1d(np.where(data_met[:,case_id_column] == case), np.where(data_met[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-            file_met = [row.split("\t") for row in f]
-
-        file_met = file_met[1:]
-        
-        temp = np.empty((0,1), float)
-
-        if len(file_met) == 27578:
-            for idx in sorted(cpg_in_cpg_short_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
+    store_cases, store_met = load_store("met")
 
-                temp = np.append(temp, beta)
-
-        elif len(file_met) == 485577:
-            for idx in sorted(cpg_in_cpg_long_idx):
-                if file_met[idx][1] == "NA":
-                    beta = 0.
-
-                else:
-                    beta = float(file_met[idx][1])
-                
-                temp = np.append(temp, beta)
-        
-        print(case)
-        input_met_metgenmir_sur = np.vstack([input_met_metgenmir_sur,temp])
-
-    np.save(DATASET_INPUT_MET_MET_GEN_MIR_SURVIVAL + 'input_met_metgenmir_sur.npy', input_met_metgenmir_sur)
+    store_input_matrix(DATASET_INPUT_MET_MET_GEN_MIR_SURVIVAL + 'input_met_metgenmir_sur.npy', store_met, store_rows(store_cases, cases_met_gen_mir_sur))
     print('input_met_metgenmir_sur.npy is created')
 
 
@@ -3865,67 +2622,22 @@ def input_gen_metgenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1. Gene (count) survival regression
-    input_gen_metgenmir_count_sur = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_sur:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metgenmir_count_sur = np.vstack([input_gen_metgenmir_count_sur,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_count_sur.npy', input_gen_metgenmir_count_sur)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_count_sur.npy', store_gen_count, store_rows(store_cases, cases_met_gen_mir_sur))
     print('input_gen_metgenmir_count_sur.npy is created')
 
 
     # 2. Gene (FPKM) survival regression
-    input_gen_metgenmir_fpkm_sur = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkm_sur = np.vstack([input_gen_metgenmir_fpkm_sur,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_fpkm_sur.npy', input_gen_metgenmir_fpkm_sur)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_fpkm_sur.npy', store_gen_fpkm, store_rows(store_cases, cases_met_gen_mir_sur))
     print('input_gen_metgenmir_fpkm_sur.npy is created')
 
 
     # 3. Gene (FPKM-UQ) survival regression
-    input_gen_metgenmir_fpkmuq_sur = np.empty((0,60483), int)
-    for case in cases_met_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metgenmir_fpkmuq_sur = np.vstack([input_gen_metgenmir_fpkmuq_sur,row])
-
-    np.save(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_fpkmuq_sur.npy', input_gen_metgenmir_fpkmuq_sur)
+    store_input_matrix(DATASET_INPUT_GEN_MET_GEN_MIR_SURVIVAL + 'input_gen_metgenmir_fpkmuq_sur.npy', store_gen_fpkmuq, store_rows(store_cases, cases_met_gen_mir_sur))
     print('input_gen_metgenmir_fpkmuq_sur.npy is created')
 
 
@@ -3979,27 +2691,9 @@ def input_mir_metgenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_MIR_MET_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MIR_MET_GEN_MIR_SURVIVAL)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
+    store_cases, store_mir = load_store("mir")
 
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
-
-    input_mir_metgenmir_sur = np.empty((0,1881), float)
-    for case in cases_met_gen_mir_sur:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metgenmir_sur = np.vstack([input_mir_metgenmir_sur,row])
-
-    np.save(DATASET_INPUT_MIR_MET_GEN_MIR_SURVIVAL + 'input_mir_metgenmir_sur.npy', input_mir_metgenmir_sur)
+    store_input_matrix(DATASET_INPUT_MIR_MET_GEN_MIR_SURVIVAL + 'input_mir_metgenmir_sur.npy', store_mir, store_rows(store_cases, cases_met_gen_mir_sur))
     print('input_mir_metgenmir_sur.npy is created')
 
 
@@ -4056,56 +2750,10 @@ def input_metlong_metlonggenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL)
 
-    data_metlong = np.genfromtxt(TARGET_META_CSV + "methylation_long_beta_value.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_metlong[0]=='file_id')[0]
-    file_name_column, = np.where(data_metlong[0]=='file_name')[0]
-    case_id_column, = np.where(data_metlong[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_metlong[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_metlong = data_metlong[1:]
-
-    # we divided the resulting file in 4 because the size is too large for 1 file
-    for i in range(4):
-        input_metlong_metlonggenmir_sur = []
-        for case in cases_metlong_gen_mir_sur[200*i:200*(i+1)]:
-            file_id = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-            file_name = data_metlong[np.intersect1d(np.where(data_metlong[:,case_id_column] == case), np.where(data_metlong[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-            
-            with open(DATASET_METHYLATION + file_id + "/" + file_name) as f:
-                file_metlong = [row.split("\t") for row in f]
-
-            file_metlong = file_metlong[1:]
-            
-            temp = []
-
-            for j in range(len(file_metlong)):
-                if file_metlong[j][1] == "NA":
-                    beta = 0.
-                else:
-                    beta = float(file_metlong[j][1])
-                temp.append(beta)
-            
-            input_metlong_metlonggenmir_sur.append(temp)
-            print(str(len(input_metlong_metlonggenmir_sur)) + ". " + case)
-
-        np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_' + str(i) + '.npy', input_metlong_metlonggenmir_sur)
-        print('input_metlong_metlonggenmir_sur_' + str(i) + '.npy is created')
-
-    # combine it in 1 file
-    temp_0 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_0.npy')
-    temp_1 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_1.npy')
-    temp_2 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_2.npy')
-    temp_3 = np.load(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_3.npy')
-    input_metlong_metlonggenmir_sur = np.concatenate((np.concatenate((temp_0, temp_1), axis=0),
-                                                      np.concatenate((temp_2, temp_3), axis=0)),
-                                                     axis=0)
-    np.save(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur.npy', input_metlong_metlonggenmir_sur)
+    store_cases, store_metlong = load_store("metlong")
 
-    # remove temp file
-    for i in range(4):
-        os.remove(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur_' + str(i) + '.npy')
+    store_input_matrix(DATASET_INPUT_METLONG_METLONG_GEN_MIR_SURVIVAL + 'input_metlong_metlonggenmir_sur.npy', store_metlong, store_rows(store_cases, cases_metlong_gen_mir_sur))
+    print('input_metlong_metlonggenmir_sur.npy is created')
 
 
 
@@ -4162,67 +2810,22 @@ def input_gen_metlonggenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL)
 
-    data_gene = np.genfromtxt(TARGET_META_CSV + "gene_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_gene[0]=='file_id')[0]
-    file_name_column, = np.where(data_gene[0]=='file_name')[0]
-    case_id_column, = np.where(data_gene[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_gene[0]=='cases.0.samples.0.sample_type')[0]
-    workflow_column, = np.where(data_gene[0]=='analysis.workflow_type')[0]
-
-    data_gene = data_gene[1:]
+    store_cases, store_gen_count = load_store("gen_count")
+    store_cases, store_gen_fpkm = load_store("gen_fpkm")
+    store_cases, store_gen_fpkmuq = load_store("gen_fpkmuq")
 
     # 1. Gene (count) survival regression
-    input_gen_metlonggenmir_count_sur = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_sur:
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:60483,1].astype(float)
-        input_gen_metlonggenmir_count_sur = np.vstack([input_gen_metlonggenmir_count_sur,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_count_sur.npy', input_gen_metlonggenmir_count_sur)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_count_sur.npy', store_gen_count, store_rows(store_cases, cases_metlong_gen_mir_sur))
     print('input_gen_metlonggenmir_count_sur.npy is created')
 
 
     # 2. Gene (FPKM) survival regression
-    input_gen_metlonggenmir_fpkm_sur = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkm_sur = np.vstack([input_gen_metlonggenmir_fpkm_sur,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_fpkm_sur.npy', input_gen_metlonggenmir_fpkm_sur)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_fpkm_sur.npy', store_gen_fpkm, store_rows(store_cases, cases_metlong_gen_mir_sur))
     print('input_gen_metlonggenmir_fpkm_sur.npy is created')
 
 
     # 3. Gene (FPKM-UQ) survival regression
-    input_gen_metlonggenmir_fpkmuq_sur = np.empty((0,60483), int)
-    for case in cases_metlong_gen_mir_sur:
-        file_name = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,workflow_column] == "HTSeq - Counts")), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        file_name = file_name.split(".")[0] + ".FPKM-UQ.txt.gz"
-        file_id = data_gene[np.intersect1d(np.intersect1d(np.where(data_gene[:,case_id_column] == case), np.where(data_gene[:,file_name_column] == file_name)), np.where(data_gene[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        
-        with gzip.open(DATASET_GENE + file_id + "/" + file_name) as f:
-            file = np.genfromtxt(f, dtype=str, delimiter='\t')
-        print(case)
-        
-        row = file[:,1].astype(float)
-        input_gen_metlonggenmir_fpkmuq_sur = np.vstack([input_gen_metlonggenmir_fpkmuq_sur,row])
-
-    np.save(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_fpkmuq_sur.npy', input_gen_metlonggenmir_fpkmuq_sur)
+    store_input_matrix(DATASET_INPUT_GEN_METLONG_GEN_MIR_SURVIVAL + 'input_gen_metlonggenmir_fpkmuq_sur.npy', store_gen_fpkmuq, store_rows(store_cases, cases_metlong_gen_mir_sur))
     print('input_gen_metlonggenmir_fpkmuq_sur.npy is created')
 
 
@@ -4278,27 +2881,9 @@ def input_mir_metlonggenmir_survival():
     if not(os.path.isdir(DATASET_INPUT_MIR_METLONG_GEN_MIR_SURVIVAL)):
         os.makedirs(DATASET_INPUT_MIR_METLONG_GEN_MIR_SURVIVAL)
 
-    data_mir = np.genfromtxt(TARGET_META_CSV + "mirna_expression_quantification.csv", dtype=str, delimiter=',', skip_header=0)
-
-    # find where the case id column is located in your meta_clinicals.csv
-    file_id_column, = np.where(data_mir[0]=='file_id')[0]
-    file_name_column, = np.where(data_mir[0]=='file_name')[0]
-    case_id_column, = np.where(data_mir[0]=='cases.0.case_id')[0]
-    sample_type_column, = np.where(data_mir[0]=='cases.0.samples.0.sample_type')[0]
-
-    data_mir = data_mir[1:]
-
-    input_mir_metlonggenmir_sur = np.empty((0,1881), float)
-    for case in cases_metlong_gen_mir_sur:
-        file_id = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_id_column][0]
-        file_name = data_mir[np.intersect1d(np.where(data_mir[:,case_id_column] == case), np.where(data_mir[:,sample_type_column] == "Primary Tumor")),file_name_column][0]
-        
-        file = np.genfromtxt(DATASET_MIRNA + file_id + "/" + file_name, dtype=str, delimiter='\t', skip_header=1)
-        
-        row = file[:,1].astype(float)
-        input_mir_metlonggenmir_sur = np.vstack([input_mir_metlonggenmir_sur,row])
+    store_cases, store_mir = load_store("mir")
 
-    np.save(DATASET_INPUT_MIR_METLONG_GEN_MIR_SURVIVAL + 'input_mir_metlonggenmir_sur.npy', input_mir_metlonggenmir_sur)
+    store_input_matrix(DATASET_INPUT_MIR_METLONG_GEN_MIR_SURVIVAL + 'input_mir_metlonggenmir_sur.npy', store_mir, store_rows(store_cases, cases_metlong_gen_mir_sur))
     print('input_mir_metlonggenmir_sur.npy is created')
 
 
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+
+# Running statistics of every feature of a store, updated one case at a time (Welford's algorithm)
+# n: number of present values, mean and m2: mean and sum of squared deviations of the present values, na: number of missing values
+def feature_stats(n_features):
+    return dict((key, np.zeros(n_features)) for key in ["n", "mean", "m2", "na"])
+
+
+
+# Add the vector of one case to the running statistics, NaN values are counted as missing
+def update_feature_stats(stats, row):
+    present = ~np.isnan(row)
+    value = np.where(present, row, 0.)
+
+    stats["n"] += present
+    stats["na"] += ~present
+    delta = np.where(present, value - stats["mean"], 0.)
+    stats["mean"] += delta / np.maximum(stats["n"], 1)
+    stats["m2"] += delta * (value - stats["mean"])
+
+
+
+def save_feature_stats(path, stats):
+    np.savez(path, **stats)
+
+
+
+def load_feature_stats(path):
+    with np.load(path) as f:
+        return dict((key, f[key]) for key in f.files)
+
+
+
+# Index of the features kept by the filter, in their original order
+# Features missing in more than max_na_rate of the cases are dropped, then the top_k features of highest variance are kept
+def select_features(stats, top_k=None, max_na_rate=1.):
+    variance = stats["m2"] / np.maximum(stats["n"], 1)
+    na_rate = stats["na"] / np.maximum(stats["n"] + stats["na"], 1)
+
+    features = np.flatnonzero(na_rate <= max_na_rate)
+    if (top_k is not None) and (top_k < len(features)):
+        features = features[np.argsort(-variance[features], kind="mergesort")[:top_k]]
+
+    return np.sort(features)
@@ -3,7 +3,7 @@ import sys
 import subprocess
 from shutil import copyfile
 
-def create_dataset(dataset=3, location="/home"):
+def create_dataset(dataset=3, location="/home", memmap=False, workers=1, resume=False, met_dtype="float64", top_features=None, max_na_rate=1., sparse_input=False):
 	global DATASET
 	DATASET = dataset
 	
@@ -118,6 +118,14 @@ def create_dataset(dataset=3, location="/home"):
 	###### CREATE DATASET ######
 	############################
 	from preprocess_packaging import *
+	import preprocess_packaging
+	preprocess_packaging.INPUT_MEMMAP = memmap
+	preprocess_packaging.WORKERS = workers
+	preprocess_packaging.RESUME = resume
+	preprocess_packaging.METHYLATION_DTYPE = met_dtype
+	preprocess_packaging.TOP_FEATURES = top_features
+	preprocess_packaging.MAX_NA_RATE = max_na_rate
+	preprocess_packaging.INPUT_SPARSE = sparse_input
 
 	# 1. labels
 	label_cancer_type(dataset=DATASET)
@@ -125,6 +133,7 @@ def create_dataset(dataset=3, location="/home"):
 
 	# 2. DNA Methylation
 	if (dataset==1) or (dataset==5):
+		methylation_store()
 		input_met_cancer_type()
 		input_metlong_cancer_type()
 		input_met_survival()
@@ -132,11 +141,13 @@ def create_dataset(dataset=3, location="/home"):
 
 	# 3. Gene Expression
 	if (dataset==2) or (dataset==4) or (dataset==5):
+		gene_store()
 		input_gen_cancer_type()
 		input_gen_survival()
 
 	# 4. miRNA Expression
 	if (dataset==3) or (dataset==4) or (dataset==5):
+		mirna_store()
 		input_mir_cancer_type()
 		input_mir_survival()
 
@@ -22,6 +22,9 @@ import matplotlib
 matplotlib.use('agg')
 import matplotlib.pyplot as plt
 from dataset_location import *
+from transform_cache import cached_transform
+from reduction import pca_transform
+from inputs import load_input, scale_input
 
 def print_and_plot_confusion_matrix(cm, classes, normalize=False, title='Confusion matrix', cmap=plt.cm.Blues):
     """
@@ -51,14 +54,16 @@ def print_and_plot_confusion_matrix(cm, classes, normalize=False, title='Confusi
     return cm
 
 
-def load_data(dataset, pca=2):
+def load_data(dataset, pca=2, mmap=2):
     """ The load dataset function
     
     This function covers for singular dataset
     (either DNA Methylation, Gene Expression, or miRNA Expression)
     for ER, PGR, and HER2 status prediction.
-    Input is .npy file location in string format.
-    Output is in numpy.ndarray format.
+    Input is .npy file location in string format,
+    memory-mapped instead of read into memory if mmap is 1.
+    Output is a generator of the datasets of ER, PGR, and HER2 in turn,
+    each one a list of input and label sets in numpy.ndarray format.
     """
 
     # Initialize list of dataset files' name
@@ -85,29 +90,24 @@ def load_data(dataset, pca=2):
         temp_label.extend((LABELS_MIR_TYPE_ER,LABELS_MIR_TYPE_PGR,LABELS_MIR_TYPE_HER2))
 
     
-    min_max_scaler = MinMaxScaler()     # Initialize normalization function
-    rval = []                           # Initialize list of outputs
-
     # Iterate 3 times, each for ER, PGR, and HER2
+    # The datasets of a status are only loaded when the previous one is done with, so one at a time is kept in memory
     for i in range(3):
         # Load the dataset as 'numpy.ndarray'
         try:
-            input_set = np.load(temp_input[i])
+            input_set = load_input(temp_input[i], mmap)
             label_set = np.load(temp_label[i])
         except Exception as e:
             sys.exit("Change your choice of features because the data is not available")
 
         # feature selection by PCA
-        if pca == 1:
-            pca0 = PCA(n_components=600)
-            input_set = pca0.fit_transform(input_set)
+        if pca in (1, 3, 4, 5):
+            input_set = cached_transform(temp_input[i], input_set, pca_transform(pca))
         
         # normalize input
-        input_set = min_max_scaler.fit_transform(input_set)
-
-        rval.extend((input_set, label_set))
+        input_set = scale_input(input_set)
 
-    return rval
+        yield [input_set, label_set]
 
 
 def test_DBN(finetune_lr=0.1,
@@ -116,7 +116,8 @@ def test_DBN(finetune_lr=0.1,
     training_epochs=100,
     dataset=6, batch_size=10,
     layers=[1000, 1000, 1000],
-    dropout=0.4, pca=2, optimizer=1):
+    dropout=0.4, pca=2, mmap=2, optimizer=1,
+    input_pipeline='feed_dict'):
     
     # Title
     temp_title = ["DNA Methylation Platform GPL8490",
@@ -127,13 +128,13 @@ def test_DBN(finetune_lr=0.1,
                   "miRNA Expression"]
     print("\nCancer Type Classification with " + temp_title[dataset-1] + " (Tensorflow)\n")
     
-    # Load datasets
-    datasets = load_data(dataset, pca)
+    # Load datasets, one status at a time
+    tasks = load_data(dataset, pca, mmap)
     
     temp_str = ["ER", "PGR", "HER2"]
 
     # Iterate for ER, PGR, and HER2
-    for protein in range(3):
+    for protein, datasets in enumerate(tasks):
         # start timer
         start = timeit.default_timer()
         
@@ -141,7 +142,7 @@ def test_DBN(finetune_lr=0.1,
         print("\n" + temp_str[protein] + " Status Prediction\n")
 
         # Split dataset into training set and test set
-        X_train, X_test, Y_train, Y_test = train_test_split(datasets[protein*2], datasets[(protein*2)+1], test_size=0.25, random_state=100)
+        X_train, X_test, Y_train, Y_test = train_test_split(datasets[0], datasets[1], test_size=0.25, random_state=100)
 
         # Training
         classifier = SupervisedDBNClassification(hidden_layers_structure=layers,
@@ -152,7 +153,8 @@ def test_DBN(finetune_lr=0.1,
                                                  batch_size=batch_size,
                                                  activation_function='relu',
                                                  dropout_p=0.2,
-                                                 l2_regularization=1.)
+                                                 l2_regularization=1.,
+                                                 input_pipeline=input_pipeline)
         classifier.fit(X_train, Y_train)
 
         # Compute the prediction accuracy 
@@ -10,15 +10,19 @@ import sys
 import numpy
 
 from dataset_location import *
+from transform_cache import cached_transform
+from reduction import pca_transform
+from inputs import load_input, scale_input
 
 
-def load_data(dataset, pca=2):
+def load_data(dataset, pca=2, mmap=2):
     """ The load dataset function
     
     This function covers for singular dataset
     (either DNA Methylation, Gene Expression, or miRNA Expression)
     for survival rate prediction.
-    Input is .npy file location in string format.
+    Input is .npy file location in string format,
+    memory-mapped instead of read into memory if mmap is 1.
     """
 
     # Input list of dataset files' name
@@ -43,19 +47,17 @@ def load_data(dataset, pca=2):
     
     # Load the dataset as 'numpy.ndarray'
     try:
-        input_set = numpy.load(temp_input)
+        input_set = load_input(temp_input, mmap)
         label_set = numpy.load(temp_label)
     except Exception as e:
         sys.exit("Change your choice of features because the data is not available")
 
     # feature selection by PCA
-    if pca == 1:
-        pca0 = PCA(n_components=600)
-        input_set = pca0.fit_transform(input_set)
+    if pca in (1, 3, 4, 5):
+        input_set = cached_transform(temp_input, input_set, pca_transform(pca))
 
     # normalize input
-    min_max_scaler = MinMaxScaler()
-    input_set = min_max_scaler.fit_transform(input_set)
+    input_set = scale_input(input_set)
 
     return input_set, label_set
 
@@ -68,7 +70,9 @@ def test_DBN(finetune_lr=0.1,
     layers=[1000, 1000, 1000],
     dropout=0.2,
     pca=2,
-    optimizer=1):
+    mmap=2,
+    optimizer=1,
+    input_pipeline='feed_dict'):
 	
     # title
     temp_title = ["DNA Methylation Platform GPL8490",
@@ -80,7 +84,7 @@ def test_DBN(finetune_lr=0.1,
     print("\nSurvival Rate Regression with " + temp_title[dataset-1] + " (Tensorflow)\n")
     
     # Loading dataset
-    X, Y = load_data(dataset, pca)
+    X, Y = load_data(dataset, pca, mmap)
 
     # Splitting data
     X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.2, random_state=1337)
@@ -93,7 +97,8 @@ def test_DBN(finetune_lr=0.1,
                                     	n_iter_backprop=training_epochs,
                                     	batch_size=batch_size,
                                     	activation_function='relu',
-                                        dropout_p=dropout)
+                                        dropout_p=dropout,
+                                        input_pipeline=input_pipeline)
     regressor.fit(X_train, Y_train)
 
     # Test
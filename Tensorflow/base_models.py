@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
 import numpy as np
+from scipy import sparse
 from scipy.stats import truncnorm
 from sklearn.base import BaseEstimator, TransformerMixin, ClassifierMixin, RegressorMixin
 
@@ -35,6 +36,7 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
                  learning_rate=1e-3,
                  n_epochs=10,
                  contrastive_divergence_iter=1,
+                 contrastive_divergence_mode='batch',  # 'batch' or 'sample'
                  batch_size=32,
                  verbose=True):
         self.n_hidden_units = n_hidden_units
@@ -43,13 +45,14 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
         self.learning_rate = learning_rate
         self.n_epochs = n_epochs
         self.contrastive_divergence_iter = contrastive_divergence_iter
+        self.contrastive_divergence_mode = contrastive_divergence_mode
         self.batch_size = batch_size
         self.verbose = verbose
 
     def fit(self, X):
         """
         Fit a model given data.
-        :param X: array-like, shape = (n_samples, n_features)
+        :param X: array-like or sparse matrix, shape = (n_samples, n_features)
         :return:
         """
         # Initialize RBM parameters
@@ -68,6 +71,11 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
         else:
             raise ValueError("Invalid activation function.")
 
+        if self.contrastive_divergence_mode not in ('batch', 'sample'):
+            raise ValueError("Invalid contrastive divergence mode.")
+        if sparse.issparse(X) and self.contrastive_divergence_mode != 'batch':
+            raise ValueError("Sparse data needs the batch contrastive divergence mode.")
+
         if self.optimization_algorithm == 'sgd':
             self._stochastic_gradient_descent(X)
         else:
@@ -103,17 +111,23 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
         accum_delta_b = np.zeros(self.b.shape)
         accum_delta_c = np.zeros(self.c.shape)
         for iteration in range(1, self.n_epochs + 1):
-            idx = np.random.permutation(len(_data))
+            idx = np.random.permutation(_data.shape[0])
             data = _data[idx]
             for batch in batch_generator(self.batch_size, data):
                 accum_delta_W[:] = .0
                 accum_delta_b[:] = .0
                 accum_delta_c[:] = .0
-                for sample in batch:
-                    delta_W, delta_b, delta_c = self._contrastive_divergence(sample)
+                if self.contrastive_divergence_mode == 'batch':
+                    delta_W, delta_b, delta_c = self._contrastive_divergence_matrix(batch)
                     accum_delta_W += delta_W
                     accum_delta_b += delta_b
                     accum_delta_c += delta_c
+                else:
+                    for sample in batch:
+                        delta_W, delta_b, delta_c = self._contrastive_divergence(sample)
+                        accum_delta_W += delta_W
+                        accum_delta_b += delta_b
+                        accum_delta_c += delta_c
                 self.W += self.learning_rate * (accum_delta_W / self.batch_size)
                 self.b += self.learning_rate * (accum_delta_b / self.batch_size)
                 self.c += self.learning_rate * (accum_delta_c / self.batch_size)
@@ -145,6 +159,36 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
 
         return delta_W, delta_b, delta_c
 
+    def _contrastive_divergence_matrix(self, matrix_visible_units):
+        """
+        Computes gradients using Contrastive Divergence method for a whole batch at once. The returned deltas are the
+        sums over the batch of the per-sample deltas computed by _contrastive_divergence.
+        A sparse batch stays sparse in the positive phase, which then costs O(nnz x U) instead of O(N x V x U).
+        :param matrix_visible_units: array-like or sparse matrix, shape = (n_samples, n_features)
+        :return:
+        """
+        V_0 = matrix_visible_units
+        V_t = V_0 if sparse.issparse(V_0) else np.array(V_0)
+
+        # Sampling
+        for t in range(self.contrastive_divergence_iter):
+            H_t = self._sample_hidden_units_matrix(V_t)
+            V_t = self._compute_visible_units_matrix(H_t)
+
+        # Computing deltas
+        V_k = V_t
+        H_0 = self._compute_hidden_units_matrix(V_0)
+        H_k = self._compute_hidden_units_matrix(V_k)
+        if sparse.issparse(V_0):
+            delta_W = np.transpose(V_0.T.dot(H_0)) - np.dot(np.transpose(H_k), V_k)
+            delta_b = np.asarray(V_0.sum(0)).ravel() - np.sum(V_k, 0)
+        else:
+            delta_W = np.dot(np.transpose(H_0), V_0) - np.dot(np.transpose(H_k), V_k)
+            delta_b = np.sum(V_0 - V_k, 0)
+        delta_c = np.sum(H_0 - H_k, 0)
+
+        return delta_W, delta_b, delta_c
+
     def _sample_hidden_units(self, vector_visible_units):
         """
         Computes hidden unit activations by sampling from a binomial distribution.
@@ -154,6 +198,15 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
         hidden_units = self._compute_hidden_units(vector_visible_units)
         return (np.random.random_sample(len(hidden_units)) < hidden_units).astype(np.int64)
 
+    def _sample_hidden_units_matrix(self, matrix_visible_units):
+        """
+        Computes hidden unit activations by sampling from a binomial distribution.
+        :param matrix_visible_units: array-like, shape = (n_samples, n_features)
+        :return:
+        """
+        hidden_units = self._compute_hidden_units_matrix(matrix_visible_units)
+        return (np.random.random_sample(hidden_units.shape) < hidden_units).astype(np.int64)
+
     def _sample_visible_units(self, vector_hidden_units):
         """
         Computes visible unit activations by sampling from a binomial distribution.
@@ -175,9 +228,12 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
     def _compute_hidden_units_matrix(self, matrix_visible_units):
         """
         Computes hidden unit outputs.
-        :param matrix_visible_units: array-like, shape = (n_samples, n_features)
+        :param matrix_visible_units: array-like or sparse matrix, shape = (n_samples, n_features)
         :return:
         """
+        if sparse.issparse(matrix_visible_units):
+            return self._activation_function_class.function(
+                matrix_visible_units.dot(np.transpose(self.W)) + self.c[np.newaxis, :])
         return np.transpose(self._activation_function_class.function(
             np.dot(self.W, np.transpose(matrix_visible_units)) + self.c[:, np.newaxis]))
 
@@ -210,11 +266,16 @@ class BinaryRBM(BaseEstimator, TransformerMixin, BaseModel):
     def _compute_reconstruction_error(self, data):
         """
         Computes the reconstruction error of the data.
-        :param data: array-like, shape = (n_samples, n_features)
+        :param data: array-like or sparse matrix, shape = (n_samples, n_features)
         :return:
         """
         data_transformed = self.transform(data)
         data_reconstructed = self._reconstruct(data_transformed)
+        if sparse.issparse(data):
+            # |r - d|^2 = |r|^2 - 2 r.d + |d|^2, so that the data is never made dense
+            return np.mean(np.sum(data_reconstructed ** 2, 1)
+                           - 2 * np.asarray(data.multiply(data_reconstructed).sum(1)).ravel()
+                           + np.asarray(data.multiply(data).sum(1)).ravel())
         return np.mean(np.sum((data_reconstructed - data) ** 2, 1))
 
 
@@ -230,6 +291,7 @@ class UnsupervisedDBN(BaseEstimator, TransformerMixin, BaseModel):
                  learning_rate_rbm=1e-3,
                  n_epochs_rbm=10,
                  contrastive_divergence_iter=1,
+                 contrastive_divergence_mode='batch',
                  batch_size=32,
                  verbose=True):
         self.hidden_layers_structure = hidden_layers_structure
@@ -238,6 +300,7 @@ class UnsupervisedDBN(BaseEstimator, TransformerMixin, BaseModel):
         self.learning_rate_rbm = learning_rate_rbm
         self.n_epochs_rbm = n_epochs_rbm
         self.contrastive_divergence_iter = contrastive_divergence_iter
+        self.contrastive_divergence_mode = contrastive_divergence_mode
         self.batch_size = batch_size
         self.rbm_layers = None
         self.verbose = verbose
@@ -252,14 +315,7 @@ class UnsupervisedDBN(BaseEstimator, TransformerMixin, BaseModel):
         # Initialize rbm layers
         self.rbm_layers = list()
         for n_hidden_units in self.hidden_layers_structure:
-            rbm = self.rbm_class(n_hidden_units=n_hidden_units,
-                                 activation_function=self.activation_function,
-                                 optimization_algorithm=self.optimization_algorithm,
-                                 learning_rate=self.learning_rate_rbm,
-                                 n_epochs=self.n_epochs_rbm,
-                                 contrastive_divergence_iter=self.contrastive_divergence_iter,
-                                 batch_size=self.batch_size,
-                                 verbose=self.verbose)
+            rbm = self.rbm_class(n_hidden_units=n_hidden_units, **self._get_rbm_params())
             self.rbm_layers.append(rbm)
 
         # Fit RBM
@@ -273,6 +329,20 @@ class UnsupervisedDBN(BaseEstimator, TransformerMixin, BaseModel):
             print("[END] Pre-training step")
         return self
 
+    def _get_rbm_params(self):
+        """
+        Returns the parameters shared by all RBM layers.
+        :return:
+        """
+        return {'activation_function': self.activation_function,
+                'optimization_algorithm': self.optimization_algorithm,
+                'learning_rate': self.learning_rate_rbm,
+                'n_epochs': self.n_epochs_rbm,
+                'contrastive_divergence_iter': self.contrastive_divergence_iter,
+                'contrastive_divergence_mode': self.contrastive_divergence_mode,
+                'batch_size': self.batch_size,
+                'verbose': self.verbose}
+
     def transform(self, X):
         """
         Transforms data using the fitted model.
@@ -302,6 +372,7 @@ class AbstractSupervisedDBN(BaseEstimator, BaseModel):
                  l2_regularization=1.0,
                  n_epochs_rbm=10,
                  contrastive_divergence_iter=1,
+                 contrastive_divergence_mode='batch',
                  batch_size=32,
                  dropout_p=0,  # float between 0 and 1. Fraction of the input units to drop
                  verbose=True):
@@ -311,6 +382,7 @@ class AbstractSupervisedDBN(BaseEstimator, BaseModel):
                                                        learning_rate_rbm=learning_rate_rbm,
                                                        n_epochs_rbm=n_epochs_rbm,
                                                        contrastive_divergence_iter=contrastive_divergence_iter,
+                                                       contrastive_divergence_mode=contrastive_divergence_mode,
                                                        batch_size=batch_size,
                                                        verbose=verbose)
         self.unsupervised_dbn_class = unsupervised_dbn_class
@@ -414,6 +486,34 @@ class NumPyAbstractSupervisedDBN(AbstractSupervisedDBN):
 
         return layers_activation
 
+    def _compute_activations_matrix(self, matrix_visible_units):
+        """
+        Compute output values of all layers for a batch of samples. Dropout is applied in place on the given batch.
+        :param matrix_visible_units: array-like or sparse matrix, shape = (n_samples, n_features)
+        :return:
+        """
+        input_data = matrix_visible_units
+        if self.dropout_p > 0 and sparse.issparse(input_data):
+            # dropping a zero input changes nothing, so only the stored values are sampled
+            input_data.data *= np.random.binomial(1, self.p, input_data.nnz)
+        elif self.dropout_p > 0:
+            r = np.random.binomial(1, self.p, input_data.shape)
+            input_data *= r
+        layers_activation = list()
+
+        for rbm in self.unsupervised_dbn.rbm_layers:
+            input_data = rbm.transform(input_data)
+            if self.dropout_p > 0:
+                r = np.random.binomial(1, self.p, input_data.shape)
+                input_data *= r
+            layers_activation.append(input_data)
+
+        # Computing activation of output layer
+        input_data = self._compute_output_units_matrix(input_data)
+        layers_activation.append(input_data)
+
+        return layers_activation
+
     def _stochastic_gradient_descent(self, _data, _labels):
         """
         Performs stochastic gradient descend optimization algorithm.
@@ -422,31 +522,24 @@ class NumPyAbstractSupervisedDBN(AbstractSupervisedDBN):
         :return:
         """
         if self.verbose:
-            matrix_error = np.zeros([len(_data), self.num_classes])
-        num_samples = len(_data)
+            matrix_error = np.zeros([_data.shape[0], self.num_classes])
+        num_samples = _data.shape[0]
         accum_delta_W = [np.zeros(rbm.W.shape) for rbm in self.unsupervised_dbn.rbm_layers]
         accum_delta_W.append(np.zeros(self.W.shape))
         accum_delta_bias = [np.zeros(rbm.c.shape) for rbm in self.unsupervised_dbn.rbm_layers]
         accum_delta_bias.append(np.zeros(self.b.shape))
 
         for iteration in range(1, self.n_iter_backprop + 1):
-            idx = np.random.permutation(len(_data))
+            idx = np.random.permutation(_data.shape[0])
             data = _data[idx]
             labels = _labels[idx]
             i = 0
             for batch_data, batch_labels in batch_generator(self.batch_size, data, labels):
-                # Clear arrays
-                for arr1, arr2 in zip(accum_delta_W, accum_delta_bias):
-                    arr1[:], arr2[:] = .0, .0
-                for sample, label in zip(batch_data, batch_labels):
-                    delta_W, delta_bias, predicted = self._backpropagation(sample, label)
-                    for layer in range(len(self.unsupervised_dbn.rbm_layers) + 1):
-                        accum_delta_W[layer] += delta_W[layer]
-                        accum_delta_bias[layer] += delta_bias[layer]
-                    if self.verbose:
-                        loss = self._compute_loss(predicted, label)
-                        matrix_error[i, :] = loss
-                        i += 1
+                predicted = self._backpropagation_matrix(batch_data, batch_labels, accum_delta_W, accum_delta_bias)
+                if self.verbose:
+                    loss = self._compute_loss_matrix(predicted, batch_labels)
+                    matrix_error[i:i + batch_data.shape[0], :] = loss
+                    i += batch_data.shape[0]
 
                 layer = 0
                 for rbm in self.unsupervised_dbn.rbm_layers:
@@ -466,6 +559,55 @@ class NumPyAbstractSupervisedDBN(AbstractSupervisedDBN):
                 error = np.mean(np.sum(matrix_error, 1))
                 print(">> Epoch %d finished \tANN training loss %f" % (iteration, error))
 
+    def _backpropagation_matrix(self, matrix_visible_units, labels, accum_delta_W, accum_delta_bias):
+        """
+        Performs Backpropagation algorithm for a whole batch. The gradients summed over the batch are written in place
+        into accum_delta_W and accum_delta_bias, one array per layer.
+        :param matrix_visible_units: array-like or sparse matrix, shape = (n_samples, n_features)
+        :param labels: array-like, shape = (n_samples, n_targets)
+        :param accum_delta_W: list of array-like, one per layer
+        :param accum_delta_bias: list of array-like, one per layer
+        :return:
+        """
+        deltas = list()
+        list_layer_weights = list()
+        for rbm in self.unsupervised_dbn.rbm_layers:
+            list_layer_weights.append(rbm.W)
+        list_layer_weights.append(self.W)
+
+        # Forward pass
+        layers_activation = self._compute_activations_matrix(matrix_visible_units)
+
+        # Backward pass: computing deltas
+        activation_output_layer = layers_activation[-1]
+        delta_output_layer = self._compute_output_layer_delta_matrix(labels, activation_output_layer)
+        deltas.append(delta_output_layer)
+        layer_idx = list(range(len(self.unsupervised_dbn.rbm_layers)))
+        layer_idx.reverse()
+        delta_previous_layer = delta_output_layer
+        for layer in layer_idx:
+            neuron_activations = layers_activation[layer]
+            W = list_layer_weights[layer + 1]
+            delta = np.dot(delta_previous_layer, W) * self.unsupervised_dbn.rbm_layers[
+                layer]._activation_function_class.prime(neuron_activations)
+            deltas.append(delta)
+            delta_previous_layer = delta
+        deltas.reverse()
+
+        # Computing gradients
+        layers_activation.pop()
+        layers_activation.insert(0, matrix_visible_units)
+        for layer in range(len(list_layer_weights)):
+            neuron_activations = layers_activation[layer]
+            delta = deltas[layer]
+            if sparse.issparse(neuron_activations):
+                accum_delta_W[layer][:] = np.transpose(neuron_activations.T.dot(delta))
+            else:
+                np.dot(np.transpose(delta), neuron_activations, out=accum_delta_W[layer])
+            np.sum(delta, 0, out=accum_delta_bias[layer])
+
+        return activation_output_layer
+
     def _backpropagation(self, input_vector, label):
         """
         Performs Backpropagation algorithm for computing gradients.
@@ -556,6 +698,14 @@ class NumPyAbstractSupervisedDBN(AbstractSupervisedDBN):
     def _compute_output_layer_delta(self, label, predicted):
         return
 
+    @abstractmethod
+    def _compute_loss_matrix(self, predicted, labels):
+        return
+
+    @abstractmethod
+    def _compute_output_layer_delta_matrix(self, labels, predicted):
+        return
+
 
 class SupervisedDBNClassification(NumPyAbstractSupervisedDBN, ClassifierMixin):
     """
@@ -623,6 +773,15 @@ class SupervisedDBNClassification(NumPyAbstractSupervisedDBN, ClassifierMixin):
         dscores[np.where(label == 1)] -= 1
         return dscores
 
+    def _compute_output_layer_delta_matrix(self, labels, predicted):
+        """
+        Compute deltas of the output layer for a batch, using cross-entropy cost function.
+        :param labels: array-like, shape = (n_samples, n_features)
+        :param predicted: array-like, shape = (n_samples, n_features)
+        :return:
+        """
+        return predicted - labels
+
     def predict_proba(self, X):
         """
         Predicts probability distribution of classes for each sample in the given data.
@@ -677,6 +836,15 @@ class SupervisedDBNClassification(NumPyAbstractSupervisedDBN, ClassifierMixin):
         """
         return -np.log(probs[np.where(label == 1)])
 
+    def _compute_loss_matrix(self, probs, labels):
+        """
+        Computes categorical cross-entropy loss for a batch
+        :param probs: shape = (n_samples, n_classes)
+        :param labels: shape = (n_samples, n_classes)
+        :return:
+        """
+        return -np.log(np.sum(probs * labels, 1, keepdims=True))
+
 
 class SupervisedDBNRegression(NumPyAbstractSupervisedDBN, RegressorMixin):
     """
@@ -717,6 +885,16 @@ class SupervisedDBNRegression(NumPyAbstractSupervisedDBN, RegressorMixin):
         """
         return -(label - predicted)
 
+    def _compute_output_layer_delta_matrix(self, labels, predicted):
+        """
+        Compute deltas of the output layer for a batch in the regression case, using common (one-half) squared-error
+        cost function.
+        :param labels: array-like, shape = (n_samples, n_targets)
+        :param predicted: array-like, shape = (n_samples, n_targets)
+        :return:
+        """
+        return -(np.reshape(labels, predicted.shape) - predicted)
+
     def _determine_num_output_neurons(self, labels):
         """
         Given labels, compute the needed number of output units.
@@ -737,3 +915,13 @@ class SupervisedDBNRegression(NumPyAbstractSupervisedDBN, RegressorMixin):
         """
         error = predicted - label
         return error * error
+
+    def _compute_loss_matrix(self, predicted, labels):
+        """
+        Computes Mean squared error loss for a batch.
+        :param predicted: shape = (n_samples, n_targets)
+        :param labels: shape = (n_samples, n_targets)
+        :return:
+        """
+        error = predicted - np.reshape(labels, predicted.shape)
+        return error * error
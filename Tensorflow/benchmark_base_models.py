@@ -0,0 +1,93 @@
+"""
+======================
+NumPy models benchmark
+======================
+
+Times the NumPy implementation in base_models on synthetic data shaped like
+the TCGA-BRCA inputs (methylation has 25978 features) and checks that the
+batched code paths give the same result as the per-sample ones, both for
+RBM contrastive divergence and for DBN backpropagation.
+
+Usage: python benchmark_base_models.py [n_samples] [n_features] [n_hidden_units]
+
+"""
+
+print(__doc__)
+
+import sys
+import timeit
+
+import numpy as np
+
+from base_models import BinaryRBM, SupervisedDBNClassification
+
+N_SAMPLES = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+N_FEATURES = int(sys.argv[2]) if len(sys.argv) > 2 else 25978
+N_HIDDEN_UNITS = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+BATCH_SIZE = 32
+
+
+def fit_rbm(X, mode, seed=0):
+    np.random.seed(seed)
+    rbm = BinaryRBM(n_hidden_units=N_HIDDEN_UNITS,
+                    n_epochs=1,
+                    contrastive_divergence_mode=mode,
+                    batch_size=BATCH_SIZE,
+                    verbose=False)
+    return rbm.fit(X)
+
+
+def benchmark_rbm(X):
+    print("BinaryRBM contrastive divergence (%d x %d -> %d)" % (X.shape + (N_HIDDEN_UNITS,)))
+    rbm_sample = fit_rbm(X, 'sample')
+    rbm_batch = fit_rbm(X, 'batch')
+    print("  max |W_sample - W_batch| = %e" % np.max(np.abs(rbm_sample.W - rbm_batch.W)))
+
+    t_sample = min(timeit.repeat(lambda: fit_rbm(X, 'sample'), number=1, repeat=3))
+    t_batch = min(timeit.repeat(lambda: fit_rbm(X, 'batch'), number=1, repeat=3))
+    print("  sample: %.3fs  batch: %.3fs  speedup: %.1fx" % (t_sample, t_batch, t_sample / t_batch))
+
+
+def backpropagation_per_sample(dbn, batch_data, batch_labels):
+    accum_delta_W = [np.zeros(rbm.W.shape) for rbm in dbn.unsupervised_dbn.rbm_layers] + [np.zeros(dbn.W.shape)]
+    accum_delta_bias = [np.zeros(rbm.c.shape) for rbm in dbn.unsupervised_dbn.rbm_layers] + [np.zeros(dbn.b.shape)]
+    for sample, label in zip(batch_data, batch_labels):
+        delta_W, delta_bias, predicted = dbn._backpropagation(sample, label)
+        for layer in range(len(accum_delta_W)):
+            accum_delta_W[layer] += delta_W[layer]
+            accum_delta_bias[layer] += delta_bias[layer]
+    return accum_delta_W, accum_delta_bias
+
+
+def backpropagation_batch(dbn, batch_data, batch_labels):
+    accum_delta_W = [np.zeros(rbm.W.shape) for rbm in dbn.unsupervised_dbn.rbm_layers] + [np.zeros(dbn.W.shape)]
+    accum_delta_bias = [np.zeros(rbm.c.shape) for rbm in dbn.unsupervised_dbn.rbm_layers] + [np.zeros(dbn.b.shape)]
+    dbn._backpropagation_matrix(batch_data, batch_labels, accum_delta_W, accum_delta_bias)
+    return accum_delta_W, accum_delta_bias
+
+
+def benchmark_backpropagation(X, y):
+    print("DBN backpropagation (%d x %d -> [%d, %d])" % (X.shape + (N_HIDDEN_UNITS, N_HIDDEN_UNITS)))
+    dbn = SupervisedDBNClassification(hidden_layers_structure=[N_HIDDEN_UNITS, N_HIDDEN_UNITS],
+                                      n_epochs_rbm=1,
+                                      n_iter_backprop=0,
+                                      batch_size=BATCH_SIZE,
+                                      verbose=False)
+    dbn.fit(X, y)
+    labels = dbn._transform_labels_to_network_format(y)
+    batch_data, batch_labels = X[:BATCH_SIZE], labels[:BATCH_SIZE]
+
+    delta_W_sample, _ = backpropagation_per_sample(dbn, batch_data, batch_labels)
+    delta_W_batch, _ = backpropagation_batch(dbn, batch_data, batch_labels)
+    print("  max |dW_sample - dW_batch| = %e" % max(np.max(np.abs(a - b)) for a, b in zip(delta_W_sample, delta_W_batch)))
+
+    t_sample = min(timeit.repeat(lambda: backpropagation_per_sample(dbn, batch_data, batch_labels), number=1, repeat=3))
+    t_batch = min(timeit.repeat(lambda: backpropagation_batch(dbn, batch_data, batch_labels), number=1, repeat=3))
+    print("  sample: %.3fs  batch: %.3fs  speedup: %.1fx" % (t_sample, t_batch, t_sample / t_batch))
+
+
+if __name__ == '__main__':
+    X = np.random.RandomState(1).rand(N_SAMPLES, N_FEATURES)
+    y = np.random.RandomState(2).randint(0, 2, N_SAMPLES)
+    benchmark_rbm(X)
+    benchmark_backpropagation(X, y)
@@ -0,0 +1,88 @@
+"""
+=============
+PCA benchmark
+=============
+
+Compares the --pca modes of load_data (PCA, IncrementalPCA fitted on row
+chunks, PCA with randomized SVD and sparse random projection) with an exact
+PCA using a full SVD, on a synthetic memory-mapped input set shaped like the
+TCGA-BRCA GPL16304 inputs (485577 features).
+Each mode runs in its own process, which reports its time, its peak resident
+memory and the variance explained by the 600 components (PCA modes only).
+
+Usage: python benchmark_pca.py [n_samples] [n_features] [n_components]
+
+"""
+
+print(__doc__)
+
+import os
+import sys
+import timeit
+import resource
+import tempfile
+import multiprocessing
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from reduction import pca_transform, streaming, fit_transform_chunks
+
+N_SAMPLES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+N_FEATURES = int(sys.argv[2]) if len(sys.argv) > 2 else 485577
+N_COMPONENTS = int(sys.argv[3]) if len(sys.argv) > 3 else 600
+MODES = ['exact PCA', '--pca 1 PCA', '--pca 3 IncrementalPCA', '--pca 4 randomized SVD', '--pca 5 random projection']
+
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / float(1024 ** 3)
+
+
+def make_transform(mode):
+    if mode == 0:
+        return PCA(n_components=N_COMPONENTS, svd_solver='full')
+    return pca_transform([1, 3, 4, 5][mode - 1], N_COMPONENTS)
+
+
+def run(path, mode, queue):
+    input_set = np.load(path, mmap_mode='r')
+    transform = make_transform(mode)
+    start = timeit.default_timer()
+    if streaming(transform):
+        fit_transform_chunks(transform, input_set)
+    else:
+        transform.fit_transform(input_set)
+    if hasattr(transform, 'explained_variance_ratio_'):
+        explained_variance = '%.4f' % transform.explained_variance_ratio_.sum()
+    else:
+        explained_variance = '-'
+    queue.put((timeit.default_timer() - start, peak_rss(), explained_variance))
+
+
+def make_input_set(path):
+    # low rank signal plus noise, written in row chunks so the parent stays small
+    rng = np.random.RandomState(1)
+    basis = rng.rand(50, N_FEATURES).astype(np.float32)
+    input_set = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(N_SAMPLES, N_FEATURES))
+    for start in range(0, N_SAMPLES, 100):
+        stop = min(start + 100, N_SAMPLES)
+        input_set[start:stop] = rng.rand(stop - start, 50).astype(np.float32).dot(basis) + 0.1 * rng.rand(stop - start, N_FEATURES)
+    input_set.flush()
+
+
+if __name__ == '__main__':
+    path = os.path.join(tempfile.mkdtemp(), 'input_set.npy')
+    make_input_set(path)
+    print("%d x %d -> %d components" % (N_SAMPLES, N_FEATURES, N_COMPONENTS))
+
+    for mode, name in enumerate(MODES):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run, args=(path, mode, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        print("  %-26s time: %8.2fs  peak RSS: %6.2f GB  explained variance: %s" % ((name,) + result))
+
+    os.remove(path)
@@ -6,6 +6,9 @@
 # MAIN_MDBN_TCGA_BRCA = "main_data_folder"
 DATASET_INPUT = MAIN_MDBN_TCGA_BRCA + "input/"
 
+# Fitted PCA transforms of the inputs below, reused by load_data (see transform_cache.py)
+TRANSFORM_CACHE = DATASET_INPUT + "transform_cache/"
+
 INPUT_MET_TYPE_ER = DATASET_INPUT + "type/met/input_met_type_er.npy"
 INPUT_MET_TYPE_PGR = DATASET_INPUT + "type/met/input_met_type_pgr.npy"
 INPUT_MET_TYPE_HER2 = DATASET_INPUT + "type/met/input_met_type_her2.npy"
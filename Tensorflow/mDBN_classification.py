@@ -20,6 +20,9 @@ import itertools
 from tf_models import *
 import matplotlib.pyplot as plt
 from dataset_location import *
+from transform_cache import cached_transform
+from reduction import pca_transform
+from inputs import load_input
 
 def print_and_plot_confusion_matrix(cm, classes, normalize=False, title='Confusion matrix', cmap=plt.cm.Blues):
     """
@@ -49,14 +52,16 @@ def print_and_plot_confusion_matrix(cm, classes, normalize=False, title='Confusi
     return cm
 
 
-def load_data(dataset, pca=2):
+def load_data(dataset, pca=2, mmap=2):
     """ The load dataset function
     
     This function covers for singular dataset
     (either DNA Methylation, Gene Expression, or miRNA Expression)
     for ER, PGR, and HER2 status prediction.
-    Input is .npy file location in string format.
-    Output is in numpy.ndarray format.
+    Input is .npy file location in string format,
+    memory-mapped instead of read into memory if mmap is 1.
+    Output is a generator of the datasets of ER, PGR, and HER2 in turn,
+    each one a list of input and label sets in numpy.ndarray format.
     """
 
     # Initialize list of dataset files' name
@@ -115,30 +120,31 @@ def load_data(dataset, pca=2):
 
     
     min_max_scaler = MinMaxScaler()     # Initialize normalization function
-    rval = []                           # Initialize list of outputs
 
     # Iterate 3 times, each for ER, PGR, and HER2
+    # The datasets of a status are only loaded when the previous one is done with, so one at a time is kept in memory
     for i in range(3):
+        rval = []
+
         # Iterate for the number of dataset
         for j in range(n_dataset):
             # Load the dataset as 'numpy.ndarray'
             try:
-                input_set = np.load(temp_input[(j * 3) + i])
+                input_set = load_input(temp_input[(j * 3) + i], mmap, dense=True)
                 label_set = np.load(temp_label[i])
             except Exception as e:
                 sys.exit("Change your choice of features because the data is not available")
 
             # feature selection by PCA
-            if pca == 1:
-                pca0 = PCA(n_components=600)
-                input_set = pca0.fit_transform(input_set)
+            if pca in (1, 3, 4, 5):
+                input_set = cached_transform(temp_input[(j * 3) + i], input_set, pca_transform(pca))
 
             # normalize input
             input_set = min_max_scaler.fit_transform(input_set)
 
             rval.extend((input_set, label_set))
 
-    return rval
+        yield rval
 
 
 
@@ -192,8 +198,10 @@ def test_mDBN(finetune_lr=0.1,
     layers_tot=[500, 500, 500],
     dropout=0.2,
     pca=2,
+    mmap=2,
     optimizer=1,
-    activation_function=1):
+    activation_function=1,
+    input_pipeline='feed_dict'):
     
     # Title
     print("\nBreast Cancer Type Classification with ", end="")
@@ -215,13 +223,13 @@ def test_mDBN(finetune_lr=0.1,
     elif (dataset>=10) and (dataset<=15):   # Methylation + Gene + miRNA
         n_dataset = 3
 
-    # Load datasets
-    datasets = load_data(dataset, pca)
+    # Load datasets, one status at a time
+    tasks = load_data(dataset, pca, mmap)
     
     temp_str = ["ER", "PGR", "HER2"]
 
     # Iterate for ER, PGR, and HER2
-    for protein in range(3):
+    for protein, datasets in enumerate(tasks):
         # start timer
         start = timeit.default_timer()
         
@@ -262,12 +270,8 @@ def test_mDBN(finetune_lr=0.1,
 
             ############################## PREPARE DATASET ##############################
             # take input and label set
-            if n_dataset == 2:
-                input_set = datasets[(protein*4)+(nr_dataset*2)]
-                label_set = datasets[(protein*4)+(nr_dataset*2)+1]
-            elif n_dataset == 3:
-                input_set = datasets[(protein*6)+(nr_dataset*2)]
-                label_set = datasets[(protein*6)+(nr_dataset*2)+1]
+            input_set = datasets[nr_dataset*2]
+            label_set = datasets[(nr_dataset*2)+1]
 
             # Split dataset into training and test set
             X_train, X_test, Y_train, Y_test = train_test_split(input_set, label_set, test_size=0.25, random_state=100)
@@ -282,21 +286,24 @@ def test_mDBN(finetune_lr=0.1,
                                       optimization_algorithm='sgd',
                                       learning_rate_rbm=pretrain_lr,
                                       n_epochs_rbm=pretraining_epochs,
-                                      batch_size=batch_size)
+                                      batch_size=batch_size,
+                                      input_pipeline=input_pipeline)
             elif dataset_type == 1:
                 dbn = UnsupervisedDBN(hidden_layers_structure=layers_gen,
                                       activation_function='relu',
                                       optimization_algorithm='sgd',
                                       learning_rate_rbm=pretrain_lr,
                                       n_epochs_rbm=pretraining_epochs,
-                                      batch_size=batch_size)
+                                      batch_size=batch_size,
+                                      input_pipeline=input_pipeline)
             elif dataset_type == 2:
                 dbn = UnsupervisedDBN(hidden_layers_structure=layers_mir,
                                       activation_function='relu',
                                       optimization_algorithm='sgd',
                                       learning_rate_rbm=pretrain_lr,
                                       n_epochs_rbm=pretraining_epochs,
-                                      batch_size=batch_size)
+                                      batch_size=batch_size,
+                                      input_pipeline=input_pipeline)
 
 
             ############################# PRETRAIN NN MODEL #############################
@@ -351,7 +358,8 @@ def test_mDBN(finetune_lr=0.1,
                               optimization_algorithm='sgd',
                               learning_rate_rbm=pretrain_lr,
                               n_epochs_rbm=pretraining_epochs,
-                              batch_size=batch_size)
+                              batch_size=batch_size,
+                              input_pipeline=input_pipeline)
 
 
         ############################# PRETRAIN NN MODEL #############################
@@ -385,16 +393,16 @@ def test_mDBN(finetune_lr=0.1,
         for nr_dataset in range(n_dataset):
             # take input and label set
             if n_dataset == 2:
-                input_set = datasets[(protein*4)+(nr_dataset*2)]
-                label_set = datasets[(protein*4)+(nr_dataset*2)+1]
+                input_set = datasets[nr_dataset*2]
+                label_set = datasets[(nr_dataset*2)+1]
                 # placeholder
                 if nr_dataset == 0:
                     X_1 = tf.placeholder(tf.float32, [None, input_set.shape[1]])
                 elif nr_dataset == 1:
                     X_2 = tf.placeholder(tf.float32, [None, input_set.shape[1]])
             elif n_dataset == 3:
-                input_set = datasets[(protein*6)+(nr_dataset*2)]
-                label_set = datasets[(protein*6)+(nr_dataset*2)+1]
+                input_set = datasets[nr_dataset*2]
+                label_set = datasets[(nr_dataset*2)+1]
                 # placeholder
                 if nr_dataset == 0:
                     X_0 = tf.placeholder(tf.float32, [None, input_set.shape[1]])
@@ -447,6 +455,22 @@ def test_mDBN(finetune_lr=0.1,
         y = tf.placeholder(tf.float32, [None, n_classes])
         dropout_keep_prob = tf.placeholder(tf.float32)
 
+        # 4. tf.data input pipeline, the placeholders above are fed directly only for testing
+        if input_pipeline in ('tf.data', 'while_loop'):
+            pipeline_placeholders = [tf.placeholder(tf.float32, [None, X_train.shape[1]]) for X_train in Xs_train]
+            pipeline_placeholders.append(tf.placeholder(tf.float32, [None, n_classes]))
+            iterator = build_input_pipeline(tuple(pipeline_placeholders), batch_size, repeat=input_pipeline == 'while_loop')
+        if input_pipeline == 'tf.data':
+            next_batch = iterator.get_next()
+            if n_dataset == 2:
+                X_1 = tf.placeholder_with_default(next_batch[0], [None, Xs_train[0].shape[1]])
+                X_2 = tf.placeholder_with_default(next_batch[1], [None, Xs_train[1].shape[1]])
+            elif n_dataset == 3:
+                X_0 = tf.placeholder_with_default(next_batch[0], [None, Xs_train[0].shape[1]])
+                X_1 = tf.placeholder_with_default(next_batch[1], [None, Xs_train[1].shape[1]])
+                X_2 = tf.placeholder_with_default(next_batch[2], [None, Xs_train[2].shape[1]])
+            y = tf.placeholder_with_default(next_batch[-1], [None, n_classes])
+
         
         ############################### BUILD NN MODEL ##############################
         print('Build NN Model')
@@ -465,6 +489,19 @@ def test_mDBN(finetune_lr=0.1,
             optimizer = tf.train.AdamOptimizer(learning_rate=finetune_lr)
         train = optimizer.minimize(J)
 
+        # In-graph training loop, the whole epochs run inside a single sess.run
+        # train above creates the slots of the optimizer (RMSProp, Adam), the loop only applies the batch gradients through it
+        if input_pipeline == 'while_loop':
+            def build_training_step(*batch):
+                if n_dataset == 2:
+                    batch_logits = mDBN(_X_0=batch[0], _X_1=batch[0], _X_2=batch[1], _weights=weights, _biases=biases, dropout_keep_prob=dropout_keep_prob, activation_function=activation_function)
+                elif n_dataset == 3:
+                    batch_logits = mDBN(_X_0=batch[0], _X_1=batch[1], _X_2=batch[2], _weights=weights, _biases=biases, dropout_keep_prob=dropout_keep_prob, activation_function=activation_function)
+                batch_J = tf.reduce_mean(tf.nn.softmax_cross_entropy_with_logits(logits=batch_logits, labels=batch[-1]))
+                return build_optimizer_step(optimizer, batch_J, [variable for layer in weights + biases for variable in layer]), batch_J
+
+            n_batches_placeholder, n_epochs_placeholder, epoch_costs_op = build_training_loop(iterator, build_training_step)
+
         # Initializing the variables
         sess.run(tf.global_variables_initializer())
 
@@ -472,29 +509,42 @@ def test_mDBN(finetune_lr=0.1,
         ############################# FINETUNE NN MODEL #############################
         print('Train NN Model')
 
-        for epoch in range(training_epochs):
-            avg_cost = 0.
-            total_batch = int(Xs_train[0].shape[0] / batch_size)
+        if input_pipeline == 'while_loop':
+            sess.run(iterator.initializer, feed_dict=dict(zip(pipeline_placeholders, Xs_train + [Y_train_])))
+            n_batches = int(np.ceil(Xs_train[0].shape[0] / float(batch_size)))
+            # Ten epochs per sess.run, the cost of the first one is printed as in the other pipelines
+            for epoch in range(0, training_epochs, 10):
+                epoch_costs = sess.run(epoch_costs_op, feed_dict={n_batches_placeholder: n_batches, n_epochs_placeholder: min(10, training_epochs-epoch), dropout_keep_prob: 1.-dropout})
+                print("Epoch:", '%04d' % (epoch+1), "cost={:.9f}".format(epoch_costs[0]))
+        else:
+            for epoch in range(training_epochs):
+                if input_pipeline == 'tf.data':
+                    pipeline_feed_dict = dict(zip(pipeline_placeholders, Xs_train + [Y_train_]))
+                    costs = run_input_pipeline(iterator, pipeline_feed_dict, [train, J], feed_dict={dropout_keep_prob: 1.-dropout})
+                    avg_cost = np.mean([c for _, c in costs])
+                else:
+                    avg_cost = 0.
+                    total_batch = int(Xs_train[0].shape[0] / batch_size)
             
-            for i in range(total_batch):
-                if n_dataset == 2:
-                    batch_xs_1 = Xs_train[0][(i*batch_size):((i+1)*batch_size)]
-                    batch_xs_2 = Xs_train[1][(i*batch_size):((i+1)*batch_size)]
-                elif n_dataset == 3:
-                    batch_xs_0 = Xs_train[0][(i*batch_size):((i+1)*batch_size)]
-                    batch_xs_1 = Xs_train[1][(i*batch_size):((i+1)*batch_size)]
-                    batch_xs_2 = Xs_train[2][(i*batch_size):((i+1)*batch_size)]
-                batch_ys = Y_train_[(i*batch_size):((i+1)*batch_size)]
+                    for i in range(total_batch):
+                        if n_dataset == 2:
+                            batch_xs_1 = Xs_train[0][(i*batch_size):((i+1)*batch_size)]
+                            batch_xs_2 = Xs_train[1][(i*batch_size):((i+1)*batch_size)]
+                        elif n_dataset == 3:
+                            batch_xs_0 = Xs_train[0][(i*batch_size):((i+1)*batch_size)]
+                            batch_xs_1 = Xs_train[1][(i*batch_size):((i+1)*batch_size)]
+                            batch_xs_2 = Xs_train[2][(i*batch_size):((i+1)*batch_size)]
+                        batch_ys = Y_train_[(i*batch_size):((i+1)*batch_size)]
                 
-                if n_dataset == 2:
-                    _, c = sess.run([train, J], feed_dict={X_1: batch_xs_1, X_2: batch_xs_2, y: batch_ys, dropout_keep_prob: 1.-dropout})
-                elif n_dataset == 3:
-                    _, c = sess.run([train, J], feed_dict={X_0: batch_xs_0, X_1: batch_xs_1, X_2: batch_xs_2, y: batch_ys, dropout_keep_prob: 1.-dropout})
+                        if n_dataset == 2:
+                            _, c = sess.run([train, J], feed_dict={X_1: batch_xs_1, X_2: batch_xs_2, y: batch_ys, dropout_keep_prob: 1.-dropout})
+                        elif n_dataset == 3:
+                            _, c = sess.run([train, J], feed_dict={X_0: batch_xs_0, X_1: batch_xs_1, X_2: batch_xs_2, y: batch_ys, dropout_keep_prob: 1.-dropout})
                 
-                avg_cost += c / total_batch
+                        avg_cost += c / total_batch
             
-            if epoch % 10 == 0:
-                print("Epoch:", '%04d' % (epoch+1), "cost={:.9f}".format(avg_cost))
+                if epoch % 10 == 0:
+                    print("Epoch:", '%04d' % (epoch+1), "cost={:.9f}".format(avg_cost))
 
         
         ############################### TEST NN MODEL ###############################
@@ -0,0 +1,149 @@
+"""
+Tests of the TensorFlow models, run from this folder with: python -m unittest test_tf_models
+They need TensorFlow 1.x, like the models.
+"""
+
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from tf_models import (BinaryRBM, SupervisedDBNClassification, SupervisedDBNRegression, build_input_pipeline,
+                       build_optimizer_step, build_training_loop, sess)
+
+INPUT_PIPELINES = ['feed_dict', 'tf.data', 'while_loop']
+
+
+def ancestor_tensors(fetches):
+    """
+    Every tensor the given fetches depend on, through data inputs and control dependencies.
+    :param fetches: list of tensors or operations
+    :return:
+    """
+    tensors = set()
+    visited = set()
+    ops = [fetch if isinstance(fetch, tf.Operation) else fetch.op for fetch in fetches]
+    while ops:
+        op = ops.pop()
+        if op in visited:
+            continue
+        visited.add(op)
+        tensors.update(op.outputs)
+        ops.extend(tensor.op for tensor in op.inputs)
+        ops.extend(op.control_inputs)
+    return tensors
+
+
+class BinaryRBMGraphTest(unittest.TestCase):
+    # GPL16304 methylation input with 1000 hidden units, the [N, U, V] batch of outer products would take 19 GB
+    n_visible_units = 485577
+    n_hidden_units = 1000
+    batch_size = 10
+
+    def build_rbm(self, input_pipeline='feed_dict'):
+        rbm = BinaryRBM(n_hidden_units=self.n_hidden_units, batch_size=self.batch_size, input_pipeline=input_pipeline)
+        rbm.n_visible_units = self.n_visible_units
+        rbm._build_model()
+        return rbm
+
+    def assert_gradient_memory(self, fetches):
+        """
+        Checks that no tensor of the gradient path is of rank > 2 or as large as the [N, U, V] outer products, so the
+        memory of an update stays O(U x V) whatever the batch size.
+        """
+        batch_outer_products = self.batch_size * self.n_hidden_units * self.n_visible_units
+        for tensor in ancestor_tensors(fetches):
+            shape = tensor.get_shape()
+            if shape.ndims is None:
+                continue
+            self.assertLessEqual(shape.ndims, 2, "%s has shape %s" % (tensor.name, shape))
+            if shape.is_fully_defined():
+                self.assertLess(shape.num_elements(), batch_outer_products, "%s has shape %s" % (tensor.name, shape))
+
+    def test_update_ops(self):
+        rbm = self.build_rbm()
+        visible_units = tf.placeholder(tf.float32, shape=[self.batch_size, self.n_visible_units])
+        self.assert_gradient_memory(list(rbm._build_update_ops(visible_units)))
+
+    def test_training_step(self):
+        rbm = self.build_rbm()
+        visible_units = tf.placeholder(tf.float32, shape=[self.batch_size, self.n_visible_units])
+        self.assert_gradient_memory(list(rbm._build_training_step(visible_units)))
+
+
+class InputPipelineTest(unittest.TestCase):
+    """
+    Runs one epoch of every model in every input pipeline.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.X = (rng.rand(40, 12) > 0.5).astype(np.float32)
+        self.y = (self.X[:, 0] > 0.5).astype(int)
+
+    def test_binary_rbm(self):
+        for input_pipeline in INPUT_PIPELINES:
+            rbm = BinaryRBM(n_hidden_units=5, n_epochs=1, batch_size=8, input_pipeline=input_pipeline, verbose=False)
+            rbm.fit(self.X)
+            self.assertEqual(rbm.transform(self.X).shape, (40, 5), input_pipeline)
+
+    def test_supervised_dbn_classification(self):
+        for input_pipeline in INPUT_PIPELINES:
+            dbn = SupervisedDBNClassification(hidden_layers_structure=[6, 4], n_epochs_rbm=1, n_iter_backprop=1,
+                                              batch_size=8, dropout_p=0.2, input_pipeline=input_pipeline,
+                                              verbose=False)
+            dbn.fit(self.X, self.y)
+            self.assertEqual(dbn.predict_proba(self.X).shape, (40, 2), input_pipeline)
+
+    def test_supervised_dbn_regression(self):
+        for input_pipeline in INPUT_PIPELINES:
+            dbn = SupervisedDBNRegression(hidden_layers_structure=[6], n_epochs_rbm=1, n_iter_backprop=1, batch_size=8,
+                                          input_pipeline=input_pipeline, verbose=False)
+            dbn.fit(self.X, self.y.astype(np.float32))
+            self.assertEqual(dbn.predict(self.X).shape, (40, 1), input_pipeline)
+
+
+class TrainingLoopOptimizerTest(unittest.TestCase):
+    """
+    The mDBN scripts train with RMSProp and Adam inside build_training_loop, no variable may be created in the loop.
+    """
+
+    def check_optimizer(self, optimizer):
+        rng = np.random.RandomState(0)
+        X = rng.rand(40, 3).astype(np.float32)
+        y = X.dot(np.array([[1.], [-2.], [0.5]], dtype=np.float32))
+
+        X_placeholder = tf.placeholder(tf.float32, shape=[None, 3])
+        y_placeholder = tf.placeholder(tf.float32, shape=[None, 1])
+        W = tf.Variable(tf.zeros([3, 1]))
+        b = tf.Variable(tf.zeros([1]))
+        cost_function = tf.reduce_mean(tf.square(tf.matmul(X_placeholder, W) + b - y_placeholder))
+        optimizer.minimize(cost_function, var_list=[W, b])
+
+        def build_training_step(batch_X, batch_y):
+            batch_cost_function = tf.reduce_mean(tf.square(tf.matmul(batch_X, W) + b - batch_y))
+            return build_optimizer_step(optimizer, batch_cost_function, [W, b]), batch_cost_function
+
+        iterator = build_input_pipeline((X_placeholder, y_placeholder), 8, repeat=True)
+        global_variables = set(tf.global_variables())
+        n_batches, n_epochs, epoch_losses_op = build_training_loop(iterator, build_training_step)
+        self.assertEqual(set(tf.global_variables()), global_variables)
+
+        sess.run(tf.variables_initializer([W, b] + optimizer.variables()))
+        sess.run(iterator.initializer, feed_dict={X_placeholder: X, y_placeholder: y})
+        epoch_losses = sess.run(epoch_losses_op, feed_dict={n_batches: 5, n_epochs: 20})
+        self.assertEqual(epoch_losses.shape, (20,))
+        self.assertLess(epoch_losses[-1], epoch_losses[0])
+
+    def test_gradient_descent(self):
+        self.check_optimizer(tf.train.GradientDescentOptimizer(0.1))
+
+    def test_rmsprop(self):
+        self.check_optimizer(tf.train.RMSPropOptimizer(0.01))
+
+    def test_adam(self):
+        self.check_optimizer(tf.train.AdamOptimizer(0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
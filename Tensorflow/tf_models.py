@@ -3,6 +3,7 @@ from abc import ABCMeta
 
 import numpy as np
 import tensorflow as tf
+from scipy import sparse
 from sklearn.base import ClassifierMixin, RegressorMixin
 
 from base_models import AbstractSupervisedDBN as BaseAbstractSupervisedDBN
@@ -30,6 +31,106 @@ def bias_variable(value, shape, dtype=tf.float32):
     return tf.Variable(initial)
 
 
+def matmul_transposed(visible_units, W):
+    """
+    Computes visible_units W^T, without making visible_units dense when it is a SparseTensor.
+    :param visible_units: tensor or SparseTensor, shape = (n_samples, n_features)
+    :param W: tensor, shape = (n_units, n_features)
+    :return:
+    """
+    if isinstance(visible_units, tf.SparseTensor):
+        return tf.sparse_tensor_dense_matmul(visible_units, W, adjoint_b=True)
+    return tf.transpose(tf.matmul(W, tf.transpose(visible_units)))
+
+
+def feed_value(matrix):
+    """
+    Converts a scipy sparse matrix to the value fed to a sparse placeholder, other arrays are fed as they are.
+    :param matrix: array-like or sparse matrix, shape = (n_samples, n_features)
+    :return:
+    """
+    if sparse.issparse(matrix):
+        matrix = matrix.tocoo()
+        return tf.SparseTensorValue(np.column_stack((matrix.row, matrix.col)).astype(np.int64),
+                                    matrix.data.astype(np.float32), matrix.shape)
+    return matrix
+
+
+def build_input_pipeline(placeholders, batch_size, repeat=False):
+    """
+    Builds a tf.data pipeline over the arrays fed through the given placeholders when the iterator is initialized.
+    Samples are shuffled, batched and prefetched on a background thread while the graph is executing.
+    :param placeholders: tuple of placeholders, one per array, sharing the first dimension
+    :param batch_size: int
+    :param repeat: bool, whether to repeat the epochs (reshuffled every time) indefinitely
+    :return: initializable iterator
+    """
+    dataset = tf.data.Dataset.from_tensor_slices(placeholders)
+    dataset = dataset.shuffle(buffer_size=tf.shape(placeholders[0], out_type=tf.int64)[0])
+    dataset = dataset.batch(batch_size)
+    if repeat:
+        dataset = dataset.repeat()
+    dataset = dataset.prefetch(1)
+    return dataset.make_initializable_iterator()
+
+
+def build_training_loop(iterator, build_training_step):
+    """
+    Builds a tf.while_loop that trains over a number of epochs of a repeated pipeline in a single sess.run.
+    :param iterator: iterator returned by build_input_pipeline with repeat=True
+    :param build_training_step: function building the train op and the loss from the tensors of one batch
+    :return: placeholders for the number of batches per epoch and the number of epochs, and the op returning the
+    mean batch loss of every epoch
+    """
+    n_batches = tf.placeholder(tf.int32, shape=[])
+    n_epochs = tf.placeholder(tf.int32, shape=[])
+    n_steps = n_batches * n_epochs
+
+    def body(step, losses):
+        train_step, loss = build_training_step(*iterator.get_next())
+        with tf.control_dependencies([train_step]):
+            return step + 1, losses.write(step, loss)
+
+    _, losses = tf.while_loop(lambda step, losses: step < n_steps, body,
+                              [tf.constant(0), tf.TensorArray(tf.float32, size=n_steps)],
+                              parallel_iterations=1)
+    epoch_losses = tf.reduce_mean(tf.reshape(losses.stack(), [n_epochs, n_batches]), 1)
+    return n_batches, n_epochs, epoch_losses
+
+
+def build_optimizer_step(optimizer, cost_function, var_list):
+    """
+    Builds the op applying the gradients of cost_function to var_list through optimizer, in the body of
+    build_training_loop. The slots of optimizer (RMSProp, Adam) must already exist, created by a minimize or
+    apply_gradients of the same variables outside of the loop, so that no variable is created inside the loop.
+    :param optimizer: tf.train.Optimizer
+    :param cost_function: tensor, the cost of one batch
+    :param var_list: list of the variables to train
+    :return:
+    """
+    gradients = tf.gradients(cost_function, var_list)
+    return optimizer.apply_gradients([(gradient, variable) for gradient, variable in zip(gradients, var_list)
+                                      if gradient is not None])
+
+
+def run_input_pipeline(iterator, pipeline_feed_dict, fetches, feed_dict=None):
+    """
+    Initializes the iterator with the given data and runs fetches until every batch has been consumed.
+    :param iterator: iterator returned by build_input_pipeline
+    :param pipeline_feed_dict: dict mapping the pipeline placeholders to the arrays
+    :param fetches: fetches to run once per batch
+    :param feed_dict: dict of additional values fed on every run
+    :return: list with the fetched values of every batch
+    """
+    sess.run(iterator.initializer, feed_dict=pipeline_feed_dict)
+    results = list()
+    while True:
+        try:
+            results.append(sess.run(fetches, feed_dict=feed_dict))
+        except tf.errors.OutOfRangeError:
+            return results
+
+
 class BaseTensorFlowModel(BaseModel):
     def save(self, save_path):
         import pickle
@@ -75,13 +176,19 @@ class BinaryRBM(BaseBinaryRBM, BaseTensorFlowModel):
     This class implements a Binary Restricted Boltzmann machine based on TensorFlow.
     """
 
+    def __init__(self, input_pipeline='feed_dict', sparse_input=False, **kwargs):  # 'feed_dict', 'tf.data' or 'while_loop'
+        super(BinaryRBM, self).__init__(**kwargs)
+        self.input_pipeline = input_pipeline
+        self.sparse_input = sparse_input
+
     def fit(self, X):
         """
         Fit a model given data.
-        :param X: array-like, shape = (n_samples, n_features)
+        :param X: array-like or sparse matrix, shape = (n_samples, n_features)
         :return:
         """
         self.n_visible_units = X.shape[1]
+        self.sparse_input = sparse.issparse(X)
 
         # Initialize RBM parameters
         self._build_model()
@@ -108,6 +215,8 @@ class BinaryRBM(BaseBinaryRBM, BaseTensorFlowModel):
                 'n_epochs',
                 'contrastive_divergence_iter',
                 'batch_size',
+                'input_pipeline',
+                'sparse_input',
                 'verbose',
                 '_activation_function_class']
 
@@ -140,21 +249,61 @@ class BinaryRBM(BaseBinaryRBM, BaseTensorFlowModel):
         self._initialize_weights(weights)
 
         # TensorFlow operations
-        self.visible_units_placeholder = tf.placeholder(tf.float32, shape=[None, self.n_visible_units])
+        if self.sparse_input and self.input_pipeline != 'feed_dict':
+            raise ValueError("Sparse input is only supported by the feed_dict input pipeline.")
+        if self.input_pipeline in ('tf.data', 'while_loop'):
+            self.data_placeholder = tf.placeholder(tf.float32, shape=[None, self.n_visible_units])
+            self.iterator = build_input_pipeline((self.data_placeholder,), self.batch_size,
+                                                 repeat=self.input_pipeline == 'while_loop')
+        if self.input_pipeline == 'tf.data':
+            next_batch, = self.iterator.get_next()
+            # Training batches come from the pipeline, any data fed explicitly takes precedence
+            self.visible_units_placeholder = tf.placeholder_with_default(next_batch, shape=[None, self.n_visible_units])
+        elif self.sparse_input:
+            self.visible_units_placeholder = tf.sparse_placeholder(tf.float32, shape=[None, self.n_visible_units])
+        elif self.input_pipeline in ('feed_dict', 'while_loop'):
+            self.visible_units_placeholder = tf.placeholder(tf.float32, shape=[None, self.n_visible_units])
+        else:
+            raise ValueError("Invalid input pipeline.")
         self.compute_hidden_units_op = self._activation_function_class(
-            tf.transpose(tf.matmul(self.W, tf.transpose(self.visible_units_placeholder))) + self.c)
+            matmul_transposed(self.visible_units_placeholder, self.W) + self.c)
         self.hidden_units_placeholder = tf.placeholder(tf.float32, shape=[None, self.n_hidden_units])
         self.compute_visible_units_op = self._activation_function_class(
             tf.matmul(self.hidden_units_placeholder, self.W) + self.b)
-        self.random_uniform_values = tf.Variable(tf.random_uniform([self.batch_size, self.n_hidden_units]))
-        sample_hidden_units_op = tf.to_float(self.random_uniform_values < self.compute_hidden_units_op)
-        self.random_variables = [self.random_uniform_values]
+
+        if self.input_pipeline == 'while_loop':
+            self.n_batches_placeholder, self.n_epochs_placeholder, self.epoch_losses_op = build_training_loop(
+                self.iterator, self._build_training_step)
+        else:
+            self.update_W, self.update_b, self.update_c = self._build_update_ops(self.visible_units_placeholder)
+
+    def _build_update_ops(self, visible_units):
+        """
+        Builds the operations updating the parameters by Contrastive Divergence on a batch. A SparseTensor batch stays
+        sparse in the positive phase, which then costs O(nnz x U).
+        :param visible_units: tensor or SparseTensor, shape = (n_samples, n_features)
+        :return:
+        """
+        compute_hidden_units_op = self._activation_function_class(matmul_transposed(visible_units, self.W) + self.c)
+        # Bernoulli samples are drawn in the graph with the batch dimension of the fed data, so every run of the
+        # update ops re-samples and ragged batches need no padding
+        random_uniform_values = tf.random_uniform(tf.shape(compute_hidden_units_op))
+        sample_hidden_units_op = tf.to_float(random_uniform_values < compute_hidden_units_op)
 
         # Positive gradient
-        # Outer product. N is the batch size length.
-        # From http://stackoverflow.com/questions/35213787/tensorflow-batch-outer-product
-        positive_gradient_op = tf.matmul(tf.expand_dims(sample_hidden_units_op, 2),  # [N, U, 1]
-                                         tf.expand_dims(self.visible_units_placeholder, 1))  # [N, 1, V]
+        # Sum of the outer products over the batch, computed as H^T V. N is the batch size length.
+        # Never materialises the [N, U, V] batch of outer products, so memory stays O(U x V).
+        if isinstance(visible_units, tf.SparseTensor):
+            batch_size = tf.to_float(visible_units.dense_shape[0])
+            positive_gradient_op = tf.transpose(tf.sparse_tensor_dense_matmul(visible_units,  # [N, V]
+                                                                              sample_hidden_units_op,  # [N, U]
+                                                                              adjoint_a=True))
+            sum_visible_units_op = tf.sparse_reduce_sum(visible_units, 0)
+        else:
+            batch_size = tf.to_float(tf.shape(visible_units)[0])
+            positive_gradient_op = tf.matmul(sample_hidden_units_op,  # [N, U]
+                                             visible_units, transpose_a=True)  # [N, V]
+            sum_visible_units_op = tf.reduce_sum(visible_units, 0)
 
         # Negative gradient
         # Gibbs sampling
@@ -164,20 +313,35 @@ class BinaryRBM(BaseBinaryRBM, BaseTensorFlowModel):
                 tf.matmul(sample_hidden_units_gibbs_step_op, self.W) + self.b)
             compute_hidden_units_gibbs_step_op = self._activation_function_class(
                 tf.transpose(tf.matmul(self.W, tf.transpose(compute_visible_units_op))) + self.c)
-            random_uniform_values = tf.Variable(tf.random_uniform([self.batch_size, self.n_hidden_units]))
+            random_uniform_values = tf.random_uniform(tf.shape(compute_hidden_units_gibbs_step_op))
             sample_hidden_units_gibbs_step_op = tf.to_float(random_uniform_values < compute_hidden_units_gibbs_step_op)
-            self.random_variables.append(random_uniform_values)
 
-        negative_gradient_op = tf.matmul(tf.expand_dims(sample_hidden_units_gibbs_step_op, 2),  # [N, U, 1]
-                                         tf.expand_dims(compute_visible_units_op, 1))  # [N, 1, V]
+        negative_gradient_op = tf.matmul(sample_hidden_units_gibbs_step_op,  # [N, U]
+                                         compute_visible_units_op, transpose_a=True)  # [N, V]
 
-        compute_delta_W = tf.reduce_mean(positive_gradient_op - negative_gradient_op, 0)
-        compute_delta_b = tf.reduce_mean(self.visible_units_placeholder - compute_visible_units_op, 0)
+        compute_delta_W = (positive_gradient_op - negative_gradient_op) / batch_size
+        compute_delta_b = sum_visible_units_op / batch_size - tf.reduce_mean(compute_visible_units_op, 0)
         compute_delta_c = tf.reduce_mean(sample_hidden_units_op - sample_hidden_units_gibbs_step_op, 0)
 
-        self.update_W = tf.assign_add(self.W, self.learning_rate * compute_delta_W)
-        self.update_b = tf.assign_add(self.b, self.learning_rate * compute_delta_b)
-        self.update_c = tf.assign_add(self.c, self.learning_rate * compute_delta_c)
+        update_W = tf.assign_add(self.W, self.learning_rate * compute_delta_W)
+        update_b = tf.assign_add(self.b, self.learning_rate * compute_delta_b)
+        update_c = tf.assign_add(self.c, self.learning_rate * compute_delta_c)
+        return update_W, update_b, update_c
+
+    def _build_training_step(self, visible_units):
+        """
+        Builds one step of the in-graph training loop: the parameter updates and the reconstruction error of the batch,
+        computed before the update.
+        :param visible_units: tensor, shape = (n_samples, n_features)
+        :return:
+        """
+        hidden_units = self._activation_function_class(
+            tf.transpose(tf.matmul(self.W, tf.transpose(visible_units))) + self.c)
+        reconstructed_units = self._activation_function_class(tf.matmul(hidden_units, self.W) + self.b)
+        error = tf.reduce_mean(tf.reduce_sum(tf.square(reconstructed_units - visible_units), 1))
+        with tf.control_dependencies([error]):
+            train_step = tf.group(*self._build_update_ops(visible_units))
+        return train_step, error
 
     @classmethod
     def from_dict(cls, dct_to_load):
@@ -202,29 +366,47 @@ class BinaryRBM(BaseBinaryRBM, BaseTensorFlowModel):
         :param _data: array-like, shape = (n_samples, n_features)
         :return:
         """
+        if self.input_pipeline == 'while_loop':
+            self._run_training_loop(_data)
+            return
         for iteration in range(1, self.n_epochs + 1):
-            idx = np.random.permutation(len(_data))
+            idx = np.random.permutation(_data.shape[0])
             data = _data[idx]
-            for batch in batch_generator(self.batch_size, data):
-                if len(batch) < self.batch_size:
-                    # Pad with zeros
-                    pad = np.zeros((self.batch_size - batch.shape[0], batch.shape[1]), dtype=batch.dtype)
-                    batch = np.vstack((batch, pad))
-                sess.run(tf.variables_initializer(self.random_variables))  # Need to re-sample from uniform distribution
-                sess.run([self.update_W, self.update_b, self.update_c],
-                         feed_dict={self.visible_units_placeholder: batch})
+            if self.input_pipeline == 'tf.data':
+                run_input_pipeline(self.iterator, {self.data_placeholder: data},
+                                   [self.update_W, self.update_b, self.update_c])
+            else:
+                for batch in batch_generator(self.batch_size, data):
+                    sess.run([self.update_W, self.update_b, self.update_c],
+                             feed_dict={self.visible_units_placeholder: feed_value(batch)})
             if self.verbose:
                 error = self._compute_reconstruction_error(data)
                 print(">> Epoch %d finished \tRBM Reconstruction error %f" % (iteration, error))
 
+    def _run_training_loop(self, data):
+        """
+        Runs all epochs inside the in-graph training loop, one sess.run per epoch when verbose and a single one
+        otherwise.
+        :param data: array-like, shape = (n_samples, n_features)
+        :return:
+        """
+        sess.run(self.iterator.initializer, feed_dict={self.data_placeholder: data})
+        n_batches = int(np.ceil(len(data) / float(self.batch_size)))
+        epochs_per_run = 1 if self.verbose else max(self.n_epochs, 1)
+        for iteration in range(1, self.n_epochs + 1, epochs_per_run):
+            epoch_losses = sess.run(self.epoch_losses_op, feed_dict={self.n_batches_placeholder: n_batches,
+                                                                     self.n_epochs_placeholder: epochs_per_run})
+            if self.verbose:
+                print(">> Epoch %d finished \tRBM Reconstruction error %f" % (iteration, epoch_losses[0]))
+
     def _compute_hidden_units_matrix(self, matrix_visible_units):
         """
         Computes hidden unit outputs.
-        :param matrix_visible_units: array-like, shape = (n_samples, n_features)
+        :param matrix_visible_units: array-like or sparse matrix, shape = (n_samples, n_features)
         :return:
         """
         return sess.run(self.compute_hidden_units_op,
-                        feed_dict={self.visible_units_placeholder: matrix_visible_units})
+                        feed_dict={self.visible_units_placeholder: feed_value(matrix_visible_units)})
 
     def _compute_visible_units_matrix(self, matrix_hidden_units):
         """
@@ -241,8 +423,9 @@ class UnsupervisedDBN(BaseUnsupervisedDBN, BaseTensorFlowModel):
     This class implements a unsupervised Deep Belief Network in TensorFlow
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, input_pipeline='feed_dict', **kwargs):  # 'feed_dict', 'tf.data' or 'while_loop'
         super(UnsupervisedDBN, self).__init__(**kwargs)
+        self.input_pipeline = input_pipeline
         self.rbm_class = BinaryRBM
 
     @classmethod
@@ -254,12 +437,18 @@ class UnsupervisedDBN(BaseUnsupervisedDBN, BaseTensorFlowModel):
                 'n_epochs_rbm',
                 'contrastive_divergence_iter',
                 'batch_size',
+                'input_pipeline',
                 'verbose']
 
     @classmethod
     def _get_weight_variables_names(cls):
         return []
 
+    def _get_rbm_params(self):
+        params = super(UnsupervisedDBN, self)._get_rbm_params()
+        params['input_pipeline'] = self.input_pipeline
+        return params
+
     def to_dict(self):
         dct_to_save = super(UnsupervisedDBN, self).to_dict()
         dct_to_save['rbm_layers'] = [rbm.to_dict() for rbm in self.rbm_layers]
@@ -276,8 +465,10 @@ class UnsupervisedDBN(BaseUnsupervisedDBN, BaseTensorFlowModel):
 class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowModel):
     __metaclass__ = ABCMeta
 
-    def __init__(self, **kwargs):
+    def __init__(self, input_pipeline='feed_dict', **kwargs):  # 'feed_dict', 'tf.data' or 'while_loop'
         super(TensorFlowAbstractSupervisedDBN, self).__init__(UnsupervisedDBN, **kwargs)
+        self.input_pipeline = input_pipeline
+        self.unsupervised_dbn.input_pipeline = input_pipeline
 
     @classmethod
     def _get_param_names(cls):
@@ -286,6 +477,7 @@ class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowM
                 'learning_rate',
                 'batch_size',
                 'dropout_p',
+                'input_pipeline',
                 'verbose']
 
     @classmethod
@@ -333,21 +525,27 @@ class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowM
         return instance
 
     def _build_model(self, weights=None):
-        self.visible_units_placeholder = self.unsupervised_dbn.rbm_layers[0].visible_units_placeholder
-        keep_prob = tf.placeholder(tf.float32)
-        visible_units_placeholder_drop = tf.nn.dropout(self.visible_units_placeholder, keep_prob)
-        self.keep_prob_placeholders = [keep_prob]
+        if self.unsupervised_dbn.rbm_layers[0].sparse_input and self.input_pipeline != 'feed_dict':
+            raise ValueError("Sparse input is only supported by the feed_dict input pipeline.")
+        if self.input_pipeline in ('tf.data', 'while_loop'):
+            n_visible_units = self.unsupervised_dbn.rbm_layers[0].n_visible_units
+            self.data_placeholder = tf.placeholder(tf.float32, shape=[None, n_visible_units])
+            self.labels_placeholder = tf.placeholder(tf.float32, shape=[None, self.num_classes])
+            self.iterator = build_input_pipeline((self.data_placeholder, self.labels_placeholder), self.batch_size,
+                                                 repeat=self.input_pipeline == 'while_loop')
+        if self.input_pipeline == 'tf.data':
+            next_data, next_labels = self.iterator.get_next()
+            # Training batches come from the pipeline, any data fed explicitly takes precedence
+            self.visible_units_placeholder = tf.placeholder_with_default(next_data, shape=[None, n_visible_units])
+        elif self.input_pipeline in ('feed_dict', 'while_loop'):
+            self.visible_units_placeholder = self.unsupervised_dbn.rbm_layers[0].visible_units_placeholder
+        else:
+            raise ValueError("Invalid input pipeline.")
+        self.keep_prob_placeholders = [tf.placeholder(tf.float32)
+                                       for _ in range(len(self.unsupervised_dbn.rbm_layers) + 1)]
 
         # Define tensorflow operation for a forward pass
-        rbm_activation = visible_units_placeholder_drop
-        for rbm in self.unsupervised_dbn.rbm_layers:
-            rbm_activation = rbm._activation_function_class(
-                tf.transpose(tf.matmul(rbm.W, tf.transpose(rbm_activation))) + rbm.c)
-            keep_prob = tf.placeholder(tf.float32)
-            self.keep_prob_placeholders.append(keep_prob)
-            rbm_activation = tf.nn.dropout(rbm_activation, keep_prob)
-
-        self.transform_op = rbm_activation
+        self.transform_op = self._build_transform_op(self.visible_units_placeholder)
         self.input_units = self.unsupervised_dbn.rbm_layers[-1].n_hidden_units
 
         # weights and biases
@@ -360,11 +558,61 @@ class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowM
 
         # operations
         self.y = tf.matmul(self.transform_op, self.W) + self.b
-        self.y_ = tf.placeholder(tf.float32, shape=[None, self.num_classes])
-        self.train_step = None
-        self.cost_function = None
+        if self.input_pipeline == 'tf.data':
+            self.y_ = tf.placeholder_with_default(next_labels, shape=[None, self.num_classes])
+        else:
+            self.y_ = tf.placeholder(tf.float32, shape=[None, self.num_classes])
+        self.cost_function = self._build_cost_function(self.y, self.y_)
+        self.train_step = self.optimizer.minimize(self.cost_function, var_list=self._get_trainable_variables())
         self.output = None
 
+        # The train step above creates the slots of the optimizer, the loop only applies gradients through it
+        if self.input_pipeline == 'while_loop':
+            self.n_batches_placeholder, self.n_epochs_placeholder, self.epoch_losses_op = build_training_loop(
+                self.iterator, self._build_training_step)
+
+    def _build_transform_op(self, visible_units):
+        """
+        Builds the forward pass through the RBM layers, with dropout on the input and on every hidden layer.
+        A SparseTensor input only has its stored values dropped, zeros stay zeros.
+        :param visible_units: tensor or SparseTensor, shape = (n_samples, n_features)
+        :return:
+        """
+        if isinstance(visible_units, tf.SparseTensor):
+            rbm_activation = tf.SparseTensor(visible_units.indices,
+                                             tf.nn.dropout(visible_units.values, self.keep_prob_placeholders[0]),
+                                             visible_units.dense_shape)
+        else:
+            rbm_activation = tf.nn.dropout(visible_units, self.keep_prob_placeholders[0])
+        for rbm, keep_prob in zip(self.unsupervised_dbn.rbm_layers, self.keep_prob_placeholders[1:]):
+            rbm_activation = rbm._activation_function_class(matmul_transposed(rbm_activation, rbm.W) + rbm.c)
+            rbm_activation = tf.nn.dropout(rbm_activation, keep_prob)
+        return rbm_activation
+
+    def _build_training_step(self, visible_units, labels):
+        """
+        Builds one step of the in-graph training loop: the train op and the cost of the batch.
+        :param visible_units: tensor, shape = (n_samples, n_features)
+        :param labels: tensor, shape = (n_samples, n_classes)
+        :return:
+        """
+        y = tf.matmul(self._build_transform_op(visible_units), self.W) + self.b
+        cost_function = self._build_cost_function(y, labels)
+        return build_optimizer_step(self.optimizer, cost_function, self._get_trainable_variables()), cost_function
+
+    def _get_trainable_variables(self):
+        """
+        Variables trained by fine tuning: the output layer and the weights and hidden biases of every RBM layer.
+        :return:
+        """
+        variables = [self.W, self.b]
+        for rbm in self.unsupervised_dbn.rbm_layers:
+            variables.extend([rbm.W, rbm.c])
+        return variables
+
+    def _build_cost_function(self, y, y_):
+        pass
+
     def _fine_tuning(self, data, _labels):
         self.num_classes = self._determine_num_output_neurons(_labels)
         if self.num_classes == 1:
@@ -382,21 +630,48 @@ class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowM
             print("[END] Fine tuning step")
 
     def _stochastic_gradient_descent(self, data, labels):
+        if self.input_pipeline == 'while_loop':
+            self._run_training_loop(data, labels)
+            return
         for iteration in range(self.n_iter_backprop):
-            for batch_data, batch_labels in batch_generator(self.batch_size, data, labels):
-                feed_dict = {self.visible_units_placeholder: batch_data,
-                             self.y_: batch_labels}
-                feed_dict.update({placeholder: self.p for placeholder in self.keep_prob_placeholders})
-                sess.run(self.train_step, feed_dict=feed_dict)
+            if self.input_pipeline == 'tf.data':
+                run_input_pipeline(self.iterator, {self.data_placeholder: data, self.labels_placeholder: labels},
+                                   self.train_step,
+                                   feed_dict={placeholder: self.p for placeholder in self.keep_prob_placeholders})
+            else:
+                for batch_data, batch_labels in batch_generator(self.batch_size, data, labels):
+                    feed_dict = {self.visible_units_placeholder: feed_value(batch_data),
+                                 self.y_: batch_labels}
+                    feed_dict.update({placeholder: self.p for placeholder in self.keep_prob_placeholders})
+                    sess.run(self.train_step, feed_dict=feed_dict)
 
             if self.verbose:
-                feed_dict = {self.visible_units_placeholder: data, self.y_: labels}
+                feed_dict = {self.visible_units_placeholder: feed_value(data), self.y_: labels}
                 feed_dict.update({placeholder: 1.0 for placeholder in self.keep_prob_placeholders})
                 error = sess.run(self.cost_function, feed_dict=feed_dict)
                 print(">> Epoch %d finished \tANN training loss %f" % (iteration, error))
 
+    def _run_training_loop(self, data, labels):
+        """
+        Runs all epochs inside the in-graph training loop, one sess.run per epoch when verbose and a single one
+        otherwise.
+        The reported loss is the mean batch cost of the epoch.
+        :param data: array-like, shape = (n_samples, n_features)
+        :param labels: array-like, shape = (n_samples, n_classes)
+        :return:
+        """
+        sess.run(self.iterator.initializer, feed_dict={self.data_placeholder: data, self.labels_placeholder: labels})
+        n_batches = int(np.ceil(len(data) / float(self.batch_size)))
+        epochs_per_run = 1 if self.verbose else max(self.n_iter_backprop, 1)
+        feed_dict = {self.n_batches_placeholder: n_batches, self.n_epochs_placeholder: epochs_per_run}
+        feed_dict.update({placeholder: self.p for placeholder in self.keep_prob_placeholders})
+        for iteration in range(0, self.n_iter_backprop, epochs_per_run):
+            epoch_losses = sess.run(self.epoch_losses_op, feed_dict=feed_dict)
+            if self.verbose:
+                print(">> Epoch %d finished \tANN training loss %f" % (iteration, epoch_losses[0]))
+
     def transform(self, X):
-        feed_dict = {self.visible_units_placeholder: X}
+        feed_dict = {self.visible_units_placeholder: feed_value(X)}
         feed_dict.update({placeholder: 1.0 for placeholder in self.keep_prob_placeholders})
         return sess.run(self.transform_op,
                         feed_dict=feed_dict)
@@ -413,7 +688,7 @@ class TensorFlowAbstractSupervisedDBN(BaseAbstractSupervisedDBN, BaseTensorFlowM
         return predicted_data
 
     def _compute_output_units_matrix(self, matrix_visible_units):
-        feed_dict = {self.visible_units_placeholder: matrix_visible_units}
+        feed_dict = {self.visible_units_placeholder: feed_value(matrix_visible_units)}
         feed_dict.update({placeholder: 1.0 for placeholder in self.keep_prob_placeholders})
         return sess.run(self.output, feed_dict=feed_dict)
 
@@ -426,8 +701,9 @@ class SupervisedDBNClassification(TensorFlowAbstractSupervisedDBN, ClassifierMix
     def _build_model(self, weights=None):
         super(SupervisedDBNClassification, self)._build_model(weights)
         self.output = tf.nn.softmax(self.y)
-        self.cost_function = tf.reduce_mean(tf.nn.softmax_cross_entropy_with_logits(logits=self.y, labels=self.y_))
-        self.train_step = self.optimizer.minimize(self.cost_function)
+
+    def _build_cost_function(self, y, y_):
+        return tf.reduce_mean(tf.nn.softmax_cross_entropy_with_logits(logits=y, labels=y_))
 
     @classmethod
     def _get_param_names(cls):
@@ -507,8 +783,9 @@ class SupervisedDBNRegression(TensorFlowAbstractSupervisedDBN, RegressorMixin):
     def _build_model(self, weights=None):
         super(SupervisedDBNRegression, self)._build_model(weights)
         self.output = self.y
-        self.cost_function = tf.reduce_mean(tf.square(self.y_ - self.y))  # Mean Squared Error
-        self.train_step = self.optimizer.minimize(self.cost_function)
+
+    def _build_cost_function(self, y, y_):
+        return tf.reduce_mean(tf.square(y_ - y))  # Mean Squared Error
 
     def _transform_labels_to_network_format(self, labels):
         """
@@ -4,12 +4,12 @@ import numpy as np
 def batch_generator(batch_size, data, labels=None):
     """
     Generates batches of samples
-    :param data: array-like, shape = (n_samples, n_features)
+    :param data: array-like or sparse matrix, shape = (n_samples, n_features)
     :param labels: array-like, shape = (n_samples, )
     :return:
     """
-    n_batches = int(np.ceil(len(data) / float(batch_size)))
-    idx = np.random.permutation(len(data))
+    n_batches = int(np.ceil(data.shape[0] / float(batch_size)))
+    idx = np.random.permutation(data.shape[0])
     data_shuffled = data[idx]
     if labels is not None:
         labels_shuffled = labels[idx]
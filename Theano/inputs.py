@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import MinMaxScaler, MaxAbsScaler
+
+
+def input_path(path):
+    """ Path of the input set saved at path
+
+    Packaging saves the sparse input sets (HTSeq counts with --sparse) in
+    CSR format as a .npz file next to the .npy path of dataset_location.
+    """
+    sparse_path = os.path.splitext(path)[0] + ".npz"
+    if (not os.path.isfile(path)) and os.path.isfile(sparse_path):
+        return sparse_path
+    return path
+
+
+def load_input(path, mmap=2, dense=False):
+    """ Load the input set saved at path
+
+    A .npy input set is memory-mapped when mmap is 1. A CSR input set is
+    returned as a scipy sparse matrix, or as an array when dense is True
+    for the models that only take arrays.
+    """
+    path = input_path(path)
+    if path.endswith(".npz"):
+        input_set = sparse.load_npz(path).tocsr()
+        return input_set.toarray() if dense else input_set
+    return np.load(path, mmap_mode='r' if mmap == 1 else None)
+
+
+def scale_input(input_set):
+    """ Scale every feature of input_set to [0, 1]
+
+    A sparse input set is divided by the maximum of every feature instead of
+    min-max scaled, so that it stays sparse. For counts, whose minimum is 0,
+    both give the same result.
+    """
+    if sparse.issparse(input_set):
+        return MaxAbsScaler().fit_transform(input_set)
+    return MinMaxScaler().fit_transform(input_set)
@@ -21,6 +21,9 @@ import theano.tensor as T
 from theano.sandbox.rng_mrg import MRG_RandomStreams
 
 from dataset_location import *
+from transform_cache import cached_transform
+from reduction import pca_transform
+from inputs import load_input
 
 
 def print_and_plot_confusion_matrix(cm, classes, normalize=False, title='Confusion matrix', cmap=plt.cm.Blues):
@@ -73,15 +76,16 @@ def shared_dataset(data_xy, borrow=True):
     return shared_x, T.cast(shared_y, 'int32')
 
 
-def load_data(dataset, pca=2):
+def load_data(dataset, pca=2, mmap=2):
     """ The load dataset function
     
     This function covers for singular dataset
     (either DNA Methylation, Gene Expression, or miRNA Expression)
     for ER, PGR, and HER2 status prediction.
-    Input is .npy file location in string format.
-    Output is in Theano shared variable format
-    to speed up computation with GPU.
+    Input is .npy file location in string format,
+    memory-mapped instead of read into memory if mmap is 1.
+    Output is a generator of the datasets of ER, PGR, and HER2 in turn,
+    each one a list of input and label sets in numpy.ndarray format.
     """
     
     # Initialize list of dataset files' name
@@ -140,30 +144,31 @@ def load_data(dataset, pca=2):
 
     
     min_max_scaler = MinMaxScaler()     # Initialize normalization function
-    rval = []                           # Initialize list of outputs
 
     # Iterate 3 times, each for ER, PGR, and HER2
+    # The datasets of a status are only loaded when the previous one is done with, so one at a time is kept in memory
     for i in range(3):
+        rval = []
+
         # Iterate for the number of dataset
         for j in range(n_dataset):
             # Load the dataset as 'numpy.ndarray'
             try:
-                input_set = numpy.load(temp_input[(j * 3) + i])
+                input_set = load_input(temp_input[(j * 3) + i], mmap, dense=True)
                 label_set = numpy.load(temp_label[i])
             except Exception as e:
                 sys.exit("Change your choice of features because the data is not available")
 
             # feature selection by PCA
-            if pca == 1:
-                pca0 = PCA(n_components=600)
-                input_set = pca0.fit_transform(input_set)
+            if pca in (1, 3, 4, 5):
+                input_set = cached_transform(temp_input[(j * 3) + i], input_set, pca_transform(pca))
 
             # normalize input
             input_set = min_max_scaler.fit_transform(input_set)
 
             rval.extend((input_set, label_set))
 
-    return rval
+        yield rval
 
 
 class LogisticRegression(object):
@@ -910,6 +915,7 @@ def test_mDBN(finetune_lr=0.1,
     layers_tot=[500, 500, 500],
     dropout=0.2,
     pca=2,
+    mmap=2,
     optimizer=1):
     
     # Title
@@ -932,13 +938,13 @@ def test_mDBN(finetune_lr=0.1,
     elif (dataset>=10) and (dataset<=15):   # Methylation + Gene + miRNA
         n_dataset = 3
     
-    # Load datasets
-    datasets = load_data(dataset, pca)
+    # Load datasets, one status at a time
+    tasks = load_data(dataset, pca, mmap)
 
     temp_str = ["ER", "PGR", "HER2"]
 
     # Iterate for ER, PGR, and HER2
-    for protein in range(3):
+    for protein, datasets in enumerate(tasks):
         # start timer
         start = timeit.default_timer()
 
@@ -979,12 +985,8 @@ def test_mDBN(finetune_lr=0.1,
 
             ############################## PREPARE DATASET ##############################
             # take input and label set
-            if n_dataset == 2:
-                input_set = datasets[(protein*4)+(nr_dataset*2)]
-                label_set = datasets[(protein*4)+(nr_dataset*2)+1]
-            elif n_dataset == 3:
-                input_set = datasets[(protein*6)+(nr_dataset*2)]
-                label_set = datasets[(protein*6)+(nr_dataset*2)+1]
+            input_set = datasets[nr_dataset*2]
+            label_set = datasets[(nr_dataset*2)+1]
 
             # Split dataset into training and test set
             train_input_set, test_input_set, train_label_set, test_label_set = train_test_split(input_set, label_set, test_size=0.25, random_state=100)
@@ -1132,12 +1134,8 @@ def test_mDBN(finetune_lr=0.1,
 
         for nr_dataset in range(n_dataset):
             # take input and label set
-            if n_dataset == 2:
-                input_set = datasets[(protein*4)+(nr_dataset*2)]
-                label_set = datasets[(protein*4)+(nr_dataset*2)+1]
-            elif n_dataset == 3:
-                input_set = datasets[(protein*6)+(nr_dataset*2)]
-                label_set = datasets[(protein*6)+(nr_dataset*2)+1]
+            input_set = datasets[nr_dataset*2]
+            label_set = datasets[(nr_dataset*2)+1]
 
             # Split dataset into training and test set
             train_input_set, test_input_set, train_label_set, test_label_set = train_test_split(input_set, label_set, test_size=0.25, random_state=100)
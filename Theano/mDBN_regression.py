@@ -14,6 +14,9 @@ import theano.tensor as T
 from theano.sandbox.rng_mrg import MRG_RandomStreams
 
 from dataset_location import *
+from transform_cache import cached_transform
+from reduction import pca_transform
+from inputs import load_input
 
 
 def shared_dataset(data_xy, borrow=True):
@@ -34,13 +37,14 @@ def shared_dataset(data_xy, borrow=True):
     return shared_x, shared_y
 
 
-def load_data(dataset, pca=2):
+def load_data(dataset, pca=2, mmap=2):
     """ The load dataset function
     
     This function covers for singular dataset
     (either DNA Methylation, Gene Expression, or miRNA Expression)
     for survival rate prediction.
-    Input is .npy file location in string format.
+    Input is .npy file location in string format,
+    memory-mapped instead of read into memory if mmap is 1.
     Output is in Theano shared variable format
     to speed up computation with GPU.
     """
@@ -106,15 +110,14 @@ def load_data(dataset, pca=2):
     for j in range(n_dataset):
         # Load the dataset as 'numpy.ndarray'
         try:
-            input_set = numpy.load(temp_input[j])
+            input_set = load_input(temp_input[j], mmap, dense=True)
             label_set = numpy.load(temp_label)
         except Exception as e:
             sys.exit("Change your choice of features because the data is not available")
 
         # feature selection by PCA
-        if pca == 1:
-            pca0 = PCA(n_components=600)
-            input_set = pca0.fit_transform(input_set)
+        if pca in (1, 3, 4, 5):
+            input_set = cached_transform(temp_input[j], input_set, pca_transform(pca))
 
         # normalize input
         input_set = min_max_scaler.fit_transform(input_set)
@@ -864,6 +867,7 @@ def test_mDBN(finetune_lr=0.1,
     layers_tot=[500, 500, 500],
     dropout=0.2,
     pca=2,
+    mmap=2,
     optimizer=1):
     
     # Title
@@ -887,7 +891,7 @@ def test_mDBN(finetune_lr=0.1,
         n_dataset = 3
     
     # Load datasets
-    datasets = load_data(dataset, pca)
+    datasets = load_data(dataset, pca, mmap)
 
     #############################################################################
     ################################# DBN LVL-1 #################################
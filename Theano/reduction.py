@@ -0,0 +1,89 @@
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.random_projection import SparseRandomProjection
+
+# Size in bytes of the row chunks read from a (memory-mapped) input set by the streaming transforms
+CHUNK_SIZE = 256 * 1024 ** 2
+
+
+def pca_transform(pca, n_components=600):
+    """ The dimensionality reduction of a --pca mode
+
+    [1] PCA, needs the whole input set in memory
+    [2] no reduction, returns None
+    [3] IncrementalPCA, fitted on row chunks of the input set
+    [4] PCA with a seeded randomized SVD, whatever the shape of the input set
+    [5] seeded sparse random projection, applied to row chunks of the input set
+    """
+    if pca == 1:
+        return PCA(n_components=n_components)
+    elif pca == 3:
+        return IncrementalPCA(n_components=n_components, copy=False)
+    elif pca == 4:
+        return PCA(n_components=n_components, svd_solver="randomized", random_state=0)
+    elif pca == 5:
+        return SparseRandomProjection(n_components=n_components, dense_output=True, random_state=0)
+    return None
+
+
+def streaming(transform):
+    """ Whether transform is fitted and applied one row chunk at a time by fit_transform_chunks """
+    return isinstance(transform, (IncrementalPCA, SparseRandomProjection))
+
+
+def chunk_rows(input_set, transform):
+    """ Row ranges of input_set of about CHUNK_SIZE bytes
+
+    Every chunk has at least n_components rows, as IncrementalPCA needs,
+    so a smaller last chunk is merged into the one before.
+    """
+    n_rows = max(int(CHUNK_SIZE // (input_set.shape[1] * input_set.dtype.itemsize)), transform.n_components, 1)
+    starts = list(range(0, input_set.shape[0], n_rows))
+    if (len(starts) > 1) and (input_set.shape[0] - starts[-1] < transform.n_components):
+        starts.pop()
+    return list(zip(starts, starts[1:] + [input_set.shape[0]]))
+
+
+class Columns(object):
+    """ The given columns of a (memory-mapped) matrix, only read when rows are sliced
+
+    Lets the streaming transforms read the features kept by the feature
+    filter from a store one row chunk at a time.
+    """
+
+    def __init__(self, matrix, columns):
+        self.matrix = matrix
+        self.columns = columns
+        self.shape = (matrix.shape[0], len(columns))
+        self.dtype = matrix.dtype
+
+    def __getitem__(self, rows):
+        return np.asarray(self.matrix[rows])[:, self.columns]
+
+
+def read_rows(input_set, start, stop, dense=True):
+    """ Rows start to stop of input_set in memory, a CSR input set stays sparse unless dense is True """
+    rows = input_set[start:stop]
+    if sparse.issparse(rows):
+        return rows.toarray() if dense else rows
+    return np.array(rows)
+
+
+def fit_transform_chunks(transform, input_set):
+    """ Fit and apply a streaming transform, one row chunk at a time
+
+    Only one chunk of input_set is read into memory at a time,
+    so input_set can be a memory-mapped .npy file larger than the memory.
+    The random projection takes CSR chunks as they are.
+    """
+    chunks = chunk_rows(input_set, transform)
+    projection = isinstance(transform, SparseRandomProjection)
+    if projection:
+        # the projection matrix only depends on the number of features and the seed
+        transform.fit(read_rows(input_set, 0, 1, dense=False))
+    else:
+        for start, stop in chunks:
+            transform.partial_fit(read_rows(input_set, start, stop))
+    return np.concatenate([transform.transform(read_rows(input_set, start, stop, dense=not projection))
+                           for start, stop in chunks])
@@ -0,0 +1,158 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+from scipy import sparse
+
+from dataset_location import *
+from reduction import Columns, fit_transform_chunks, read_rows, streaming
+from inputs import input_path
+
+# Maximum size of the transform cache in bytes, the least recently used transforms are removed first
+CACHE_SIZE = 8 * 1024 ** 3
+
+def file_hash(path, cache_dir=TRANSFORM_CACHE):
+    """ SHA-1 of the content of a file
+
+    The hashes are kept in cache_dir/hashes.json with the size and
+    modification time of the file, so a file is only read again if it changed.
+    """
+    hashes_path = os.path.join(cache_dir, "hashes.json")
+    hashes = {}
+    if os.path.isfile(hashes_path):
+        with open(hashes_path) as f:
+            hashes = json.load(f)
+
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    if (path in hashes) and (hashes[path][:2] == [stat.st_size, stat.st_mtime]):
+        return hashes[path][2]
+
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(16 * 1024 ** 2), b""):
+            sha1.update(chunk)
+
+    hashes[path] = [stat.st_size, stat.st_mtime, sha1.hexdigest()]
+    with open(hashes_path, "w") as f:
+        json.dump(hashes, f, indent=2)
+
+    return sha1.hexdigest()
+
+
+def evict(cache_dir=TRANSFORM_CACHE, max_size=CACHE_SIZE, keep=None):
+    """ Remove the least recently used transforms until the cache fits in max_size """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npz"):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(entry[1] for entry in entries)
+    for mtime, size, name in sorted(entries):
+        if total <= max_size:
+            break
+        if name != keep:
+            os.remove(os.path.join(cache_dir, name))
+            total -= size
+
+
+def fit_transform(input_set, transform):
+    """ Fit transform on input_set and return the transformed input set
+
+    A sparse input set is only made dense for the PCA modes that need it.
+    """
+    if streaming(transform):
+        return fit_transform_chunks(transform, input_set)
+    elif sparse.issparse(input_set):
+        return transform.fit_transform(input_set.toarray())
+    elif isinstance(input_set, Columns):
+        return transform.fit_transform(read_rows(input_set, 0, input_set.shape[0]))
+    return transform.fit_transform(input_set)
+
+
+def load_cache(cache_path):
+    """ The transformed input set saved at cache_path, None if it is not cached """
+    if not os.path.isfile(cache_path):
+        return None
+    os.utime(cache_path, None)      # mark as recently used
+    with np.load(cache_path) as cache:
+        return cache["transformed"]
+
+
+def save_cache(cache_path, transformed, transform, cache_dir, max_size):
+    """ Save the transformed input set and the fitted components of transform at cache_path """
+    fitted = {}
+    for attribute in ("components_", "mean_", "explained_variance_"):
+        value = getattr(transform, attribute, None)
+        if sparse.issparse(value):     # random projection matrix, saved in CSR format
+            value = value.tocsr()
+            fitted.update({attribute + "data": value.data, attribute + "indices": value.indices, attribute + "indptr": value.indptr})
+        elif value is not None:
+            fitted[attribute] = value
+
+    # write to a temporary file first, so an interrupted run never leaves a broken transform behind
+    np.savez(cache_path[:-4] + ".tmp.npz", transformed=transformed, **fitted)
+    os.rename(cache_path[:-4] + ".tmp.npz", cache_path)
+    evict(cache_dir, max_size, keep=os.path.basename(cache_path))
+
+
+def input_store(path, input_set):
+    """ The store, rows and features the input set at path was copied from
+
+    Packaging saves them next to the input set with the _store.npz suffix.
+    Returns None when they are missing or do not match the shape of input_set,
+    e.g. for an input set created before they were saved.
+    """
+    store_path = os.path.splitext(path)[0] + "_store.npz"
+    if not os.path.isfile(store_path):
+        return None
+
+    with np.load(store_path) as f:
+        store = os.path.join(os.path.dirname(os.path.abspath(path)), str(f["store"]))
+        rows, features = f["rows"], f["features"]
+
+    if (not os.path.isfile(store)) or ((len(rows), len(features)) != tuple(input_set.shape)):
+        return None
+    return store, rows, features
+
+
+def cached_transform(path, input_set, transform, cache_dir=TRANSFORM_CACHE, max_size=CACHE_SIZE):
+    """ Fit transform (e.g. PCA(n_components=600)) on input_set loaded from path
+
+    When the input set was copied from a store, the transform is fitted once
+    on all the cases of the store and the rows of the input set are taken
+    from the transformed store. The ER, PGR and HER2 input sets of a modality
+    select different cases of the same store, so they share one fit.
+    The transformed store is cached in cache_dir, keyed by the content of the
+    store, the features kept by the feature filter and the parameters of the
+    transform.
+    Other input sets are fitted on their own and cached by the content of
+    their file and the parameters of the transform.
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+
+    store = input_store(path, input_set)
+    if store is not None:
+        store_path, rows, features = store
+        key = file_hash(store_path, cache_dir) + hashlib.sha1(np.ascontiguousarray(features, dtype=np.int64)).hexdigest()
+    else:
+        key = file_hash(input_path(path), cache_dir)
+    cache_path = os.path.join(cache_dir, hashlib.sha1((key + repr(transform)).encode("utf-8")).hexdigest() + ".npz")
+
+    transformed = load_cache(cache_path)
+    if transformed is None:
+        if store is not None:
+            store_set = np.load(store_path, mmap_mode="r")
+            if len(features) < store_set.shape[1]:
+                store_set = Columns(store_set, features)
+            transformed = fit_transform(store_set, transform)
+        else:
+            transformed = fit_transform(input_set, transform)
+        save_cache(cache_path, transformed, transform, cache_dir, max_size)
+
+    if store is not None:
+        return transformed[rows]
+    return transformed
@@ -19,6 +19,13 @@ def main():
 	parser = argparse.ArgumentParser()
 	requiredArgs = parser.add_argument_group('required arguments')
 	requiredArgs.add_argument("-d", "--dataset", type=int, help="Dataset of TCGA BRCA to be downloaded [1-5]", required=True)
+	parser.add_argument("--memmap", action="store_true", help="Write the input matrices directly to disk instead of building them in memory")
+	parser.add_argument("--workers", type=int, default=1, help="Number of processes used to parse the raw files. Default = 1")
+	parser.add_argument("--resume", action="store_true", help="Resume an interrupted dataset creation")
+	parser.add_argument("--met_dtype", choices=["float64", "float32", "float16"], default="float64", help="Data type of the DNA methylation matrices. Default = float64")
+	parser.add_argument("--top_features", type=int, help="Keep only the given number of features of highest variance in each input matrix")
+	parser.add_argument("--max_na_rate", type=float, default=1., help="Drop the features missing in more than this rate of the cases. Default = 1")
+	parser.add_argument("--sparse", action="store_true", help="Save the HTSeq count matrices in sparse (CSR) format")
 	args = parser.parse_args()
 	DATASET = int(args.dataset)
 
@@ -35,7 +42,7 @@ def main():
 	program_path = os.path.dirname(os.path.realpath(__file__))
 	sys.path.insert(0, program_path + '/Preprocessing')
 	from preprocessing_main import create_dataset
-	create_dataset(dataset=DATASET, location=MAIN_LOCATION)
+	create_dataset(dataset=DATASET, location=MAIN_LOCATION, memmap=args.memmap, workers=args.workers, resume=args.resume, met_dtype=args.met_dtype, top_features=args.top_features, max_na_rate=args.max_na_rate, sparse_input=args.sparse)
 
 
 if __name__ == '__main__':
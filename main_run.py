@@ -21,7 +21,9 @@ LAYERS_MIR = []
 LAYERS_TOT = []
 DROPOUT = 0.2
 PCA = 2
+MMAP = 2
 OPTIMIZER = 1
+INPUT_PIPELINE = 'feed_dict'
 
 def main():
 	global DATASET
@@ -33,7 +35,9 @@ def main():
 	global LAYERS
 	global DROPOUT
 	global PCA
+	global MMAP
 	global OPTIMIZER
+	global INPUT_PIPELINE
 
 	print("Welcome to mDBN breast cancer status prediction!")
 	print("All training data by TCGA BRCA\n")
@@ -49,8 +53,10 @@ def main():
 	parser.add_argument("--pretrain_lr", type=int, help="Pretraining learning rate")
 	parser.add_argument("--train_lr", type=int, help="Training learning rate")
 	parser.add_argument("--dropout", type=int, help="Dropout rate")
-	parser.add_argument("--pca", type=int, help="PCA usage [1-2]")
+	parser.add_argument("--pca", type=int, help="PCA usage [1-5]")
+	parser.add_argument("--mmap", type=int, help="Memory-mapped input matrices [1-2]")
 	parser.add_argument("--optimizer", type=int, help="Type of optimizer to be used [1-3]")
+	parser.add_argument("--input_pipeline", type=int, help="Input pipeline for Tensorflow [1-3]")
 	args = parser.parse_args()
 	platform = int(args.platform)
 	prediction = int(args.type)
@@ -70,8 +76,14 @@ def main():
 		DROPOUT = int(args.dropout)
 	if args.pca:
 		PCA = int(args.pca)
+	if args.mmap:
+		MMAP = int(args.mmap)
 	if args.optimizer:
 		OPTIMIZER = int(args.optimizer)
+	if args.input_pipeline == 2:
+		INPUT_PIPELINE = 'tf.data'
+	elif args.input_pipeline == 3:
+		INPUT_PIPELINE = 'while_loop'
 
 
 	######################
@@ -167,7 +179,9 @@ def main():
 						 layers=LAYERS,
 						 dropout=DROPOUT,
 						 pca=PCA,
-						 optimizer=OPTIMIZER)
+						 mmap=MMAP,
+						 optimizer=OPTIMIZER,
+						 input_pipeline=INPUT_PIPELINE)
 
 			elif (DATASET >= 7) and (DATASET <= 15):		# 1.1.2 Tensorflow Classification mDBN
 				from mDBN_classification import test_mDBN
@@ -183,7 +197,9 @@ def main():
 						  layers_tot=LAYERS_TOT,
 						  dropout=DROPOUT,
 						  pca=PCA,
-						  optimizer=OPTIMIZER)
+						  mmap=MMAP,
+						  optimizer=OPTIMIZER,
+						  input_pipeline=INPUT_PIPELINE)
 
 		elif prediction == 2:								# 1.2. Tensorflow Regression
 			if (DATASET >= 1) and (DATASET <= 6):			# 1.2.1. Tensorflow Regression DBN
@@ -197,7 +213,9 @@ def main():
 						 layers=LAYERS,
 						 dropout=DROPOUT,
 						 pca=PCA,
-						 optimizer=OPTIMIZER)
+						 mmap=MMAP,
+						 optimizer=OPTIMIZER,
+						 input_pipeline=INPUT_PIPELINE)
 
 			elif (DATASET >= 7) and (DATASET <= 15):		# 1.2.2. Tensorflow Regression mDBN
 				from mDBN_regression import test_mDBN
@@ -213,7 +231,9 @@ def main():
 						  layers_tot=LAYERS_TOT,
 						  dropout=DROPOUT,
 						  pca=PCA,
-						  optimizer=OPTIMIZER)
+						  mmap=MMAP,
+						  optimizer=OPTIMIZER,
+						  input_pipeline=INPUT_PIPELINE)
 
 	elif platform == 2:										# 2. Theano
 		sys.path.insert(0, program_path + '/Theano')
@@ -229,6 +249,7 @@ def main():
 						 layers=LAYERS,
 						 dropout=DROPOUT,
 						 pca=PCA,
+						 mmap=MMAP,
 						 optimizer=OPTIMIZER)
 
 			elif (DATASET >= 7) and (DATASET <= 15):		# 2.1.2. Theano Classification mDBN
@@ -245,6 +266,7 @@ def main():
 						  layers_tot=LAYERS_TOT,
 						  dropout=DROPOUT,
 						  pca=PCA,
+						  mmap=MMAP,
 						  optimizer=OPTIMIZER)
 
 		elif prediction == 2:								# 2.2. Theano Regression
@@ -259,6 +281,7 @@ def main():
 						 layers=LAYERS,
 						 dropout=DROPOUT,
 						 pca=PCA,
+						 mmap=MMAP,
 						 optimizer=OPTIMIZER)
 
 			elif (DATASET >= 7) and (DATASET <= 15):		# 2.2.2. Theano Regression mDBN
@@ -275,6 +298,7 @@ def main():
 						  layers_tot=LAYERS_TOT,
 						  dropout=DROPOUT,
 						  pca=PCA,
+						  mmap=MMAP,
 						  optimizer=OPTIMIZER)
 
 	stop = timeit.default_timer()